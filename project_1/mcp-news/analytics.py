@@ -0,0 +1,113 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+# ---------------------------------------------------------
+# 추세 / 교차표 / 멘토별 키워드 집계
+# 결과는 draw_chart 가 바로 DataFrame 으로 만들 수 있는 컬럼형 JSON:
+#   {"chart": "line", "x": "bucket", "y": "count", "color": "mento",
+#    "columns": {"bucket": [...], "mento": [...], "count": [...]}}
+# ---------------------------------------------------------
+BUCKETS = ("day", "week", "month")
+GROUP_BY = ("", "mento", "emotion")
+
+
+def bucket_of(day, bucket):
+    """'YYYY-MM-DD' -> 일/주(월요일 시작)/월 버킷 라벨"""
+    day = str(day)[:10]
+    if bucket == "month":
+        return day[:7]
+    if bucket == "week":
+        d = date.fromisoformat(day)
+        return (d - timedelta(days=d.weekday())).isoformat()
+    return day
+
+
+def columnar(chart, rows, names, **encoding):
+    """[(a, b, c), ...] -> {"chart", 인코딩..., "columns": {name: [...]}}"""
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+    return {"chart": chart, **encoding, "columns": columns}
+
+
+def trend(cursor, start_date, end_date, bucket="week", group_by="", emotion="", mento="", keyword=""):
+    """
+    기간을 bucket 단위로 나눈 상담 건수 추세.
+    keyword 가 있으면 해당 키워드 언급 수, 없으면 (emotion/mento 로 거른) 상담 수.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket 은 {BUCKETS} 중 하나여야 합니다.")
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by 는 {GROUP_BY} 중 하나여야 합니다.")
+
+    if keyword:
+        # 키워드 추세는 일별 키워드 집계에서 (멘토/감정 구분 없음)
+        cursor.execute(
+            """
+            SELECT day, '', '', SUM(cnt) FROM daily_keyword_counts
+            WHERE day >= %s AND day <= %s AND keyword = %s
+            GROUP BY day
+            """,
+            (start_date, end_date, keyword),
+        )
+        group_by = ""
+    else:
+        sql = """
+            SELECT day, mento, emotion, SUM(cnt) FROM daily_emotion_counts
+            WHERE day >= %s AND day <= %s
+        """
+        params = [start_date, end_date]
+        if emotion:
+            sql += " AND emotion = %s"
+            params.append(emotion)
+        if mento:
+            sql += " AND mento = %s"
+            params.append(mento)
+        sql += " GROUP BY day, mento, emotion"
+        cursor.execute(sql, params)
+
+    # 일별 행(기간 일수 x 멘토 x 감정 정도)을 파이썬에서 버킷으로 묶음
+    totals = defaultdict(int)
+    for day, row_mento, row_emotion, cnt in cursor.fetchall():
+        series = {"mento": row_mento, "emotion": row_emotion}.get(group_by, "")
+        totals[(bucket_of(day, bucket), series)] += int(cnt)
+
+    rows = sorted((b, s, c) for (b, s), c in totals.items())
+    if group_by:
+        return columnar("line", rows, ["bucket", group_by, "count"], x="bucket", y="count", color=group_by)
+    return columnar("line", [(b, c) for b, _, c in rows], ["bucket", "count"], x="bucket", y="count")
+
+
+def emotion_mento_crosstab(cursor, start_date, end_date):
+    """감정 x 멘토 상담 건수 교차표 (긴 형식: 칸마다 한 행)"""
+    cursor.execute(
+        """
+        SELECT emotion, mento, SUM(cnt) as total FROM daily_emotion_counts
+        WHERE day >= %s AND day <= %s
+        GROUP BY emotion, mento
+        ORDER BY total DESC
+        """,
+        (start_date, end_date),
+    )
+    rows = [(emotion, mento, int(cnt)) for emotion, mento, cnt in cursor.fetchall()]
+    return columnar("heatmap", rows, ["emotion", "mento", "count"], x="mento", y="emotion", z="count")
+
+
+def top_keywords_by_mento(cursor, start_date, end_date, limit=5):
+    """멘토마다 키워드 Top-N (정규화 키워드 테이블 조인)"""
+    cursor.execute(
+        """
+        SELECT l.mento, k.keyword, COUNT(*) as cnt
+        FROM counseling_logs l
+        JOIN counseling_log_keywords k ON k.log_id = l.id
+        WHERE l.date >= %s AND l.date <= %s
+        GROUP BY l.mento, k.keyword
+        ORDER BY l.mento, cnt DESC
+        """,
+        (start_date, f"{end_date} 23:59:59"),
+    )
+    rows = []
+    taken = defaultdict(int)
+    for mento, keyword, cnt in cursor.fetchall():
+        if taken[mento] < limit:
+            taken[mento] += 1
+            rows.append((mento, keyword, int(cnt)))
+    return columnar("bar", rows, ["mento", "keyword", "count"], x="keyword", y="count", color="mento")
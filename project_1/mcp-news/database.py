@@ -0,0 +1,171 @@
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ---------------------------------------------------------
+# SQLite 어댑터 (로컬/테스트용 대체 DB)
+# MySQL 과 같은 %s 플레이스홀더로 쿼리를 쓸 수 있게 감쌉니다.
+# ---------------------------------------------------------
+class _SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        return self._cursor.execute(sql.replace("%s", "?"), params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._cursor.executemany(sql.replace("%s", "?"), seq_of_params)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class _SQLiteConnection:
+    def __init__(self, path):
+        if path == ":memory:":
+            # 풀의 커넥션들이 같은 인메모리 DB 를 보도록 공유 캐시 사용
+            path, uri = "file:counseling_db?mode=memory&cache=shared", True
+        else:
+            uri = False
+        self._path = path
+        self._uri = uri
+        self._conn = self._connect()
+
+    def _connect(self):
+        return sqlite3.connect(self._path, check_same_thread=False, timeout=30, uri=self._uri)
+
+    def cursor(self):
+        return _SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=True, attempts=1, delay=0):
+        """mysql.connector 의 ping 과 같게: 끊긴 커넥션이면 reconnect=True 일 때 다시 연결"""
+        try:
+            self._conn.execute("SELECT 1")
+            return
+        except sqlite3.Error:
+            if not reconnect:
+                raise
+        for attempt in range(1, attempts + 1):
+            try:
+                self._conn = self._connect()
+                self._conn.execute("SELECT 1")
+                return
+            except sqlite3.Error:
+                if attempt == attempts:
+                    raise
+                time.sleep(delay)
+
+    def close(self):
+        self._conn.close()
+
+
+# ---------------------------------------------------------
+# 커넥션 풀
+# ---------------------------------------------------------
+class Database:
+    """
+    커넥션 풀 + 비동기 실행 헬퍼.
+
+    - 도구 호출마다 새로 접속(TCP + 인증)하지 않고 풀의 커넥션을 재사용
+    - 꺼낼 때마다 ping 으로 상태를 확인하고, 끊겼으면 재접속
+    - run() 은 DB 작업을 스레드로 넘겨서 SSE 서버의 이벤트 루프를 막지 않음
+    """
+
+    def __init__(self, backend="mysql", pool_size=5, mysql_config=None, sqlite_path=None):
+        self.backend = backend
+        self.pool_size = pool_size
+        # 풀이 비어 있으면 예외 대신 반납될 때까지 기다리도록 세마포어로 제한
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+        if backend == "sqlite":
+            self.auto_pk = "INTEGER PRIMARY KEY AUTOINCREMENT"
+            self._sqlite_pool = queue.Queue()
+            for _ in range(pool_size):
+                self._sqlite_pool.put(_SQLiteConnection(sqlite_path or ":memory:"))
+        else:
+            self.auto_pk = "INT AUTO_INCREMENT PRIMARY KEY"
+            self._mysql_pool = self._create_mysql_pool(mysql_config or {})
+
+    @classmethod
+    def from_env(cls, mysql_config):
+        return cls(
+            backend=os.getenv("DB_BACKEND", "mysql"),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            mysql_config=mysql_config,
+            sqlite_path=os.getenv("SQLITE_PATH", "counseling.db"),
+        )
+
+    def _create_mysql_pool(self, config, retries=10, delay=5):
+        """DB 컨테이너가 늦게 뜨는 경우를 대비해 재시도하며 풀 생성"""
+        # DB_BACKEND=sqlite 일 때는 MySQL 드라이버 없이도 동작하도록 여기서 import
+        import mysql.connector
+        from mysql.connector import pooling
+
+        for attempt in range(1, retries + 1):
+            try:
+                return pooling.MySQLConnectionPool(
+                    pool_name="counseling_pool",
+                    pool_size=self.pool_size,
+                    pool_reset_session=True,
+                    **config,
+                )
+            except mysql.connector.Error as e:
+                print(f"⏳ DB 연결 대기 중... (시도 {attempt}/{retries}) - {e}")
+                time.sleep(delay)
+
+        raise Exception("❌ DB 연결 실패: 데이터베이스가 응답하지 않습니다.")
+
+    @contextmanager
+    def connection(self):
+        """풀에서 커넥션을 빌려오고, 끝나면 반납"""
+        self._slots.acquire()
+        conn = None
+        try:
+            if self.backend == "sqlite":
+                conn = self._sqlite_pool.get()
+            else:
+                conn = self._mysql_pool.get_connection()
+            # 헬스 체크 (끊긴 커넥션이면 재접속)
+            conn.ping(reconnect=True, attempts=3, delay=1)
+            yield conn
+        finally:
+            if conn is not None:
+                if self.backend == "sqlite":
+                    self._sqlite_pool.put(conn)
+                else:
+                    conn.close()  # 풀 커넥션은 close() 가 반납
+            self._slots.release()
+
+    def run_sync(self, fn, *args, **kwargs):
+        """fn(conn, ...) 을 풀 커넥션으로 실행"""
+        with self.connection() as conn:
+            return fn(conn, *args, **kwargs)
+
+    async def run(self, fn, *args, **kwargs):
+        """fn(conn, ...) 을 별도 스레드에서 실행 (이벤트 루프 비차단)"""
+        return await asyncio.to_thread(self.run_sync, fn, *args, **kwargs)
@@ -0,0 +1,350 @@
+import atexit
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 정해진 시간 안에 자리가 나지 않을 때"""
+
+
+def _transient_error_types():
+    """연결 끊김 / 타임아웃 / 요청 한도처럼 기다리면 풀리는 오류 (설치된 드라이버만)"""
+    types = [ConnectionError, TimeoutError, sqlite3.OperationalError]
+    try:
+        from mysql.connector import errors as mysql_errors
+
+        types += [mysql_errors.OperationalError, mysql_errors.InterfaceError, mysql_errors.PoolError]
+    except ImportError:
+        pass
+    try:
+        import openai
+
+        # APITimeoutError 는 APIConnectionError 의 하위 클래스
+        types += [openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError]
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+TRANSIENT_ERRORS = _transient_error_types()
+
+
+def is_transient_error(error):
+    """DB / LLM 장애처럼 데이터와 상관없이 실패한 경우 True (배치를 나누거나 dead_logs 로 보내지 않음)"""
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+# ---------------------------------------------------------
+# 상담 로그 write-behind 대기열
+# ---------------------------------------------------------
+class LogWriteQueue:
+    """
+    상담 로그를 로컬 SQLite 파일(스풀)에 먼저 적어두고 바로 반환한 뒤,
+    백그라운드 스레드가 모아서 한 번에 분석 + 저장합니다.
+
+    - batch_size 건이 쌓이거나 flush_interval 초가 지나면 flush
+    - flush 한 번 = LLM 분류 요청 1번 + 저장 트랜잭션 1번
+    - 스풀에 max_pending 건 이상 밀려 있으면 enqueue 가 자리가 날 때까지 대기 (백프레셔),
+      enqueue_timeout 안에 자리가 안 나면 QueueFullError
+    - 저장에 실패한 건은 스풀에 남아 다음 flush 때 다시 시도 (서버가 죽어도 재시작 시 이어서 처리)
+    - DB / LLM 연결 장애(is_transient)로 실패하면 배치는 그대로 두고 retry_delay 부터 두 배씩
+      (최대 max_retry_delay) 늘려 가며 기다렸다가 다시 시도. 시도 횟수도 올리지 않음
+    - 그 밖의 오류로 배치가 실패하면 반으로 줄여 바로 다시 시도 -> 문제 있는 한 건만 남을 때까지 좁혀 감.
+      한 건짜리 배치가 max_attempts 번 실패하면 dead_logs 테이블로 옮기고 다음 건 진행
+      (옮긴 건은 requeue_dead() 로 되돌릴 수 있음)
+    - 건마다 enqueue 때 만든 log_key 를 write_rows 에 같이 넘김.
+      저장은 됐는데 스풀 삭제(ack)가 실패해서 다시 보내도, 저장 쪽에서 이미 있는 키를 건너뛰면 중복 저장 없음
+    - 종료 시(atexit) 남은 건을 모두 flush
+
+    classify_batch(texts)       -> [{"keywords", "emotion", "summary"}, ...] (texts 와 같은 순서)
+    write_rows(rows, log_keys)  -> rows: [(date, mento, user_input, keywords, emotion), ...] 를 DB 에 저장
+                                   (log_keys 는 rows 와 같은 순서, 이미 저장한 키는 건너뛰어야 함)
+    """
+
+    def __init__(
+        self,
+        spool_path,
+        classify_batch,
+        write_rows,
+        batch_size=20,
+        flush_interval=5.0,
+        max_pending=1000,
+        enqueue_timeout=10.0,
+        retry_delay=5.0,
+        max_retry_delay=300.0,
+        max_attempts=5,
+        is_transient=is_transient_error,
+    ):
+        self.classify_batch = classify_batch
+        self.write_rows = write_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.is_transient = is_transient
+
+        self.flushed = 0
+        self.failed_flushes = 0
+        self.dead = 0
+        # 실패하면 반으로 줄어들고, 성공하면 batch_size 로 돌아옴
+        self._batch_limit = batch_size
+        self._retry_now = False
+        # 연속된 장애 실패 횟수 (대기 시간을 늘리는 데 사용, 성공하면 0)
+        self._outage_failures = 0
+
+        spool_path = Path(spool_path)
+        spool_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(spool_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                mento TEXT,
+                user_input TEXT,
+                log_key TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+            """
+        )
+        # 예전 스풀 파일에는 log_key / attempts / last_error 컬럼이 없음
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pending_logs)")}
+        for name, ddl in (
+            ("log_key", "log_key TEXT"),
+            ("attempts", "attempts INTEGER NOT NULL DEFAULT 0"),
+            ("last_error", "last_error TEXT"),
+        ):
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE pending_logs ADD COLUMN {ddl}")
+        self._conn.execute("UPDATE pending_logs SET log_key = lower(hex(randomblob(16))) WHERE log_key IS NULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dead_logs (
+                id INTEGER PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                mento TEXT,
+                user_input TEXT,
+                log_key TEXT,
+                attempts INTEGER,
+                last_error TEXT,
+                failed_at TEXT
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._cond = threading.Condition()
+        self._pending = self._conn.execute("SELECT COUNT(*) FROM pending_logs").fetchone()[0]
+        self.dead = self._conn.execute("SELECT COUNT(*) FROM dead_logs").fetchone()[0]
+        self._stopping = False
+        if self._pending:
+            print(f"📥 이전 실행에서 남은 로그 {self._pending}건을 이어서 처리합니다.")
+
+        self._worker = threading.Thread(target=self._run, name="log-write-behind", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    # ---------------------------------------------------------
+    # 적재 (요청 처리 경로)
+    # ---------------------------------------------------------
+    def enqueue(self, user_input, mento):
+        """스풀에 기록만 하고 바로 반환. 반환값: 현재 대기 건수"""
+        deadline = time.monotonic() + self.enqueue_timeout
+        with self._cond:
+            while self._pending >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise QueueFullError(f"대기열 초과 ({self._pending}건)")
+                self._cond.wait(remaining)
+
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._conn.execute(
+                "INSERT INTO pending_logs (created_at, mento, user_input, log_key) VALUES (?, ?, ?, ?)",
+                (now, mento, user_input, uuid.uuid4().hex),
+            )
+            self._conn.commit()
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._cond.notify_all()
+            return self._pending
+
+    # ---------------------------------------------------------
+    # flush (백그라운드 스레드)
+    # ---------------------------------------------------------
+    def _take_batch(self):
+        with self._cond:
+            return self._conn.execute(
+                "SELECT id, created_at, mento, user_input, log_key FROM pending_logs ORDER BY id LIMIT ?",
+                (self._batch_limit,),
+            ).fetchall()
+
+    def _ack(self, ids):
+        with self._cond:
+            self._conn.executemany("DELETE FROM pending_logs WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+            self._pending -= len(ids)
+            self._cond.notify_all()  # 백프레셔로 기다리는 enqueue 깨우기
+
+    def _record_failure(self, batch, error):
+        """
+        실패한 배치 처리. 여러 건이면 다음 배치 크기를 반으로 줄이고 True (바로 다시 시도),
+        한 건이면 시도 횟수를 올리고 max_attempts 에 닿으면 dead_logs 로 옮긴 뒤 False.
+        """
+        if len(batch) > 1:
+            self._batch_limit = max(1, len(batch) // 2)
+            print(f"✂️ 로그 {len(batch)}건 배치 실패, {self._batch_limit}건으로 나눠 다시 시도 - {error}")
+            return True
+
+        row_id = batch[0][0]
+        with self._cond:
+            self._conn.execute(
+                "UPDATE pending_logs SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (str(error)[:500], row_id),
+            )
+            attempts = self._conn.execute("SELECT attempts FROM pending_logs WHERE id = ?", (row_id,)).fetchone()[0]
+            if attempts >= self.max_attempts:
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._conn.execute(
+                    """
+                    INSERT INTO dead_logs (id, created_at, mento, user_input, log_key, attempts, last_error, failed_at)
+                    SELECT id, created_at, mento, user_input, log_key, attempts, last_error, ? FROM pending_logs WHERE id = ?
+                    """,
+                    (now, row_id),
+                )
+                self._conn.execute("DELETE FROM pending_logs WHERE id = ?", (row_id,))
+                self._pending -= 1
+                self.dead += 1
+                self._batch_limit = self.batch_size
+                self._cond.notify_all()
+            self._conn.commit()
+
+        if attempts >= self.max_attempts:
+            print(f"🪦 로그 #{row_id} {attempts}번 실패, dead_logs 로 옮기고 다음 건 진행 - {error}")
+        return False
+
+    def flush_once(self):
+        """한 배치를 분석 + 저장. 처리한 건수를 반환 (실패 시 시도 횟수를 기록하고 예외)"""
+        batch = self._take_batch()
+        if not batch:
+            return 0
+
+        try:
+            results = self.classify_batch([row[3] for row in batch])
+            rows = []
+            for (_, created_at, mento, user_input, _), result in zip(batch, results):
+                rows.append(
+                    (
+                        created_at,
+                        mento,
+                        result.get("summary") or user_input,
+                        result.get("keywords", "미정"),
+                        result.get("emotion", "보통"),
+                    )
+                )
+            self.write_rows(rows, [row[4] for row in batch])
+            self._ack([row[0] for row in batch])
+        except Exception as e:
+            if self.is_transient(e):
+                # 장애는 어떤 건의 문제도 아니므로 배치를 나누거나 시도 횟수를 올리지 않음
+                self._outage_failures += 1
+                self._retry_now = False
+            else:
+                self._retry_now = self._record_failure(batch, e)
+            raise
+
+        self._batch_limit = self.batch_size
+        self._outage_failures = 0
+        self.flushed += len(batch)
+        print(f"💾 상담 로그 {len(batch)}건 일괄 저장 완료 (누적 {self.flushed}건)")
+        return len(batch)
+
+    def _run(self):
+        retry = False
+        while True:
+            with self._cond:
+                if not retry and not self._stopping and self._pending < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+                if not self._pending:
+                    retry = False
+                    continue
+            retry = False
+            try:
+                while True:
+                    narrowing = self._batch_limit < self.batch_size
+                    if not self.flush_once():
+                        break
+                    # 밀려 있거나 나눈 배치를 처리 중이면 기다리지 않고 연속 flush
+                    if not narrowing and self._pending < self.batch_size:
+                        break
+            except Exception as e:
+                self.failed_flushes += 1
+                retry = True
+                if self._retry_now:
+                    continue  # 배치를 나눈 경우는 기다리지 않고 바로 작은 배치로
+                delay = self._retry_delay()
+                print(f"⚠️ 로그 flush 실패, {delay:g}초 후 재시도 - {e}")
+                with self._cond:
+                    self._cond.wait(delay)
+
+    def _retry_delay(self):
+        """장애가 이어지면 retry_delay, 2배, 4배, ... (최대 max_retry_delay)"""
+        if not self._outage_failures:
+            return self.retry_delay
+        return min(self.retry_delay * 2 ** (self._outage_failures - 1), self.max_retry_delay)
+
+    def requeue_dead(self):
+        """dead_logs 로 옮긴 건을 시도 횟수를 0 으로 되돌려 다시 대기열에 넣음. 반환: 옮긴 건수"""
+        with self._cond:
+            moved = self._conn.execute(
+                """
+                INSERT INTO pending_logs (created_at, mento, user_input, log_key, attempts)
+                SELECT created_at, mento, user_input, log_key, 0 FROM dead_logs ORDER BY id
+                """
+            ).rowcount
+            self._conn.execute("DELETE FROM dead_logs")
+            self._conn.commit()
+            self._pending += moved
+            self.dead = 0
+            self._cond.notify_all()
+        return moved
+
+    # ---------------------------------------------------------
+    # 종료
+    # ---------------------------------------------------------
+    def close(self):
+        """워커를 멈추고 남은 건을 모두 flush (atexit 에서도 호출됨)"""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        self._worker.join(timeout=30)
+
+        while True:
+            try:
+                if not self.flush_once():
+                    return
+            except Exception as e:
+                if self._retry_now:
+                    continue
+                print(f"⚠️ 종료 flush 실패 (스풀에 {self._pending}건 보존, 다음 실행 시 처리) - {e}")
+                return
+
+    def stats(self):
+        return {
+            "pending": self._pending,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "dead": self.dead,
+        }
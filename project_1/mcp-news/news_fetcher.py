@@ -0,0 +1,137 @@
+import asyncio
+import os
+import time
+
+import feedparser
+import httpx
+
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search"
+
+
+# ---------------------------------------------------------
+# 뉴스 RSS 비동기 수집기 (TTL 캐시 + 조건부 GET)
+# ---------------------------------------------------------
+class NewsFetcher:
+    """
+    - (keyword, limit) 결과를 ttl 초 동안 캐시 (같은 검색어는 업스트림 요청 없이 응답)
+    - TTL 이 지나면 ETag / Last-Modified 로 조건부 GET -> 304 면 저장해 둔 본문 재사용
+    - 요청마다 timeout, 실패 시 이전 결과가 있으면 그걸 반환
+    - 같은 키워드를 동시에 요청하면 업스트림 요청은 한 번만
+    """
+
+    def __init__(self, base_url=None, ttl=300, timeout=5.0, max_entries=512):
+        self.base_url = base_url or os.getenv("NEWS_RSS_URL", GOOGLE_NEWS_RSS)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.upstream_requests = 0
+        self.not_modified = 0
+
+        self._results = {}     # (keyword, limit) -> (만료 시각, 결과 문자열)
+        self._feeds = {}       # keyword -> (etag, last_modified, 본문 bytes)
+        self._inflight = {}    # keyword -> 진행 중인 Task
+        self._client = None
+
+    def _get_client(self):
+        # 서버의 이벤트 루프 안에서 처음 쓸 때 생성 (커넥션 재사용)
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------------------------------------------------------
+    # 업스트림 요청
+    # ---------------------------------------------------------
+    async def _fetch_feed(self, keyword):
+        """RSS 본문(bytes) 반환. 304 면 저장해 둔 본문"""
+        etag, last_modified, body = self._feeds.get(keyword, (None, None, None))
+        headers = {}
+        if body is not None:
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        self.upstream_requests += 1
+        response = await self._get_client().get(
+            self.base_url,
+            params={"q": keyword, "hl": "ko", "gl": "KR", "ceid": "KR:ko"},
+            headers=headers,
+        )
+        if response.status_code == 304 and body is not None:
+            self.not_modified += 1
+            return body
+
+        response.raise_for_status()
+        self._feeds[keyword] = (
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            response.content,
+        )
+        if len(self._feeds) > self.max_entries:
+            self._feeds.pop(next(iter(self._feeds)))
+        return response.content
+
+    async def _fetch_feed_once(self, keyword):
+        # limit 만 다른 동시 요청도 같은 업스트림 요청을 기다림
+        task = self._inflight.get(keyword)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_feed(keyword))
+            self._inflight[keyword] = task
+            task.add_done_callback(lambda _: self._inflight.pop(keyword, None))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _format(body, limit):
+        feed = feedparser.parse(body)
+        if not feed.entries:
+            return "뉴스를 찾을 수 없습니다."
+
+        results = []
+        for i, entry in enumerate(feed.entries[:limit]):
+            results.append(f"[{i+1}] {entry.title} ({entry.get('published', '')})")
+        return "\n".join(results)
+
+    # ---------------------------------------------------------
+    # 조회
+    # ---------------------------------------------------------
+    async def get(self, keyword, limit=3):
+        key = (keyword, limit)
+        cached = self._results.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+
+        try:
+            body = await self._fetch_feed_once(keyword)
+        except (httpx.HTTPError, asyncio.TimeoutError) as e:
+            if cached:
+                # 업스트림 장애 시에는 만료된 결과라도 반환
+                return cached[1]
+            return f"Error: 뉴스 서버 응답 실패 ({type(e).__name__})"
+
+        text = await asyncio.to_thread(self._format, body, limit)
+        self._results[key] = (time.monotonic() + self.ttl, text)
+        if len(self._results) > self.max_entries:
+            self._results.pop(next(iter(self._results)))
+        return text
+
+    async def get_many(self, keywords, limit=3):
+        """여러 키워드를 동시에 조회. 반환: {keyword: 결과 문자열}"""
+        keywords = list(dict.fromkeys(keywords))
+        texts = await asyncio.gather(*(self.get(k, limit) for k in keywords))
+        return dict(zip(keywords, texts))
+
+    def stats(self):
+        return {
+            "cache_hits": self.hits,
+            "upstream_requests": self.upstream_requests,
+            "not_modified": self.not_modified,
+            "cached_results": len(self._results),
+        }
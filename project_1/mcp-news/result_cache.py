@@ -0,0 +1,63 @@
+import json
+import threading
+from collections import OrderedDict
+
+
+# ---------------------------------------------------------
+# 분석 도구 결과 캐시
+# ---------------------------------------------------------
+class ResultCache:
+    """
+    (도구 이름, 인자) -> 결과 JSON 문자열 LRU 캐시.
+
+    - 새 로그가 저장되면 invalidate() 로 세대(generation)를 올리고 비움
+    - 계산 도중에 invalidate 가 일어났으면 그 결과는 저장하지 않음 (오래된 집계 방지)
+    - 에러 응답은 캐시하지 않음
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(tool, args):
+        return tool, json.dumps(args, sort_keys=True, ensure_ascii=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    async def get_or_compute(self, tool, args, compute):
+        """compute: 결과 JSON 문자열을 돌려주는 async 함수"""
+        key = self._key(tool, args)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            generation = self.generation
+
+        value = await compute()
+
+        if not value.startswith('{"error"'):
+            with self._lock:
+                if generation == self.generation:
+                    self._entries[key] = value
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "generation": self.generation,
+        }
@@ -0,0 +1,138 @@
+from collections import Counter
+
+# ---------------------------------------------------------
+# 일별 집계(rollup) 테이블
+# counseling_logs 에 INSERT 할 때 같은 트랜잭션에서 함께 갱신하고,
+# get_period_analytics 는 원본 로그 대신 이 테이블의 일별 행만 읽습니다.
+# ---------------------------------------------------------
+ROLLUP_TABLES = ("daily_emotion_counts", "daily_keyword_counts")
+
+CREATE_ROLLUP_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS daily_emotion_counts (
+        day DATE NOT NULL,
+        mento VARCHAR(50) NOT NULL,
+        emotion VARCHAR(50) NOT NULL,
+        cnt INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, mento, emotion)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS daily_keyword_counts (
+        day DATE NOT NULL,
+        keyword VARCHAR(100) NOT NULL,
+        cnt INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, keyword)
+    )
+    """,
+]
+
+# 같은 키가 이미 있으면 cnt 를 더하는 upsert (DB 종류별 문법)
+UPSERT_SQL = {
+    "mysql": {
+        "emotion": """
+            INSERT INTO daily_emotion_counts (day, mento, emotion, cnt) VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE cnt = cnt + VALUES(cnt)
+        """,
+        "keyword": """
+            INSERT INTO daily_keyword_counts (day, keyword, cnt) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE cnt = cnt + VALUES(cnt)
+        """,
+    },
+    "sqlite": {
+        "emotion": """
+            INSERT INTO daily_emotion_counts (day, mento, emotion, cnt) VALUES (%s, %s, %s, %s)
+            ON CONFLICT (day, mento, emotion) DO UPDATE SET cnt = cnt + excluded.cnt
+        """,
+        "keyword": """
+            INSERT INTO daily_keyword_counts (day, keyword, cnt) VALUES (%s, %s, %s)
+            ON CONFLICT (day, keyword) DO UPDATE SET cnt = cnt + excluded.cnt
+        """,
+    },
+}
+
+
+def create_rollup_tables(cursor):
+    for sql in CREATE_ROLLUP_TABLES:
+        cursor.execute(sql)
+
+
+def split_keywords(keywords):
+    """'취업, 불안, 가족' -> ['취업', '불안', '가족'] (빈 값/중복 제외, 컬럼 길이에 맞춰 자름)"""
+    if not keywords:
+        return []
+    return list(dict.fromkeys(w.strip()[:100] for w in str(keywords).split(",") if w.strip()))
+
+
+def _day(date_value):
+    # 'YYYY-MM-DD HH:MM:SS' 문자열이든 datetime 이든 앞 10자리가 날짜
+    return str(date_value)[:10]
+
+
+def apply_rollups(cursor, rows, dialect):
+    """
+    rows: [(date, mento, user_input, keywords, emotion), ...] (counseling_logs 에 넣은 것과 동일)
+    배치 안에서 먼저 합친 뒤 키마다 upsert 한 번씩만 실행. commit 은 호출 측에서.
+    """
+    emotion_counts = Counter()
+    keyword_counts = Counter()
+    for date_value, mento, _, keywords, emotion in rows:
+        day = _day(date_value)
+        emotion_counts[(day, mento or "", emotion or "")] += 1
+        for word in split_keywords(keywords):
+            keyword_counts[(day, word)] += 1
+
+    sql = UPSERT_SQL[dialect]
+    if emotion_counts:
+        cursor.executemany(sql["emotion"], [(*key, cnt) for key, cnt in emotion_counts.items()])
+    if keyword_counts:
+        cursor.executemany(sql["keyword"], [(*key, cnt) for key, cnt in keyword_counts.items()])
+
+
+def backfill_rollups(conn, dialect, page_size=5000):
+    """
+    집계 테이블을 비우고 counseling_logs 전체로 다시 계산 (한 트랜잭션).
+    반환: 집계한 로그 건수
+    """
+    cursor = conn.cursor()
+    try:
+        for table in ROLLUP_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+
+        last_id = 0
+        total = 0
+        while True:
+            cursor.execute(
+                """
+                SELECT id, date, mento, user_input, keywords, emotion
+                FROM counseling_logs WHERE id > %s ORDER BY id LIMIT %s
+                """,
+                (last_id, page_size),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            apply_rollups(cursor, [row[1:] for row in rows], dialect)
+            last_id = rows[-1][0]
+            total += len(rows)
+
+        conn.commit()
+        return total
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def rollups_need_backfill(conn):
+    """로그는 있는데 집계 테이블이 비어 있으면 (집계 도입 전 데이터) True"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM daily_emotion_counts LIMIT 1")
+        if cursor.fetchone():
+            return False
+        cursor.execute("SELECT 1 FROM counseling_logs LIMIT 1")
+        return cursor.fetchone() is not None
+    finally:
+        cursor.close()
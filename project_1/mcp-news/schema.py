@@ -0,0 +1,192 @@
+import uuid
+
+from rollup import split_keywords
+
+# ---------------------------------------------------------
+# 정규화 키워드 테이블 + 인덱스
+# counseling_logs.keywords(쉼표 문자열)는 화면 표시용으로 그대로 두고,
+# 키워드 분석은 counseling_log_keywords(log_id, keyword) 를 SQL 로 집계합니다.
+# ---------------------------------------------------------
+CREATE_KEYWORD_TABLE = """
+    CREATE TABLE IF NOT EXISTS counseling_log_keywords (
+        log_id INT NOT NULL,
+        keyword VARCHAR(100) NOT NULL,
+        PRIMARY KEY (log_id, keyword)
+    )
+"""
+
+# counseling_logs.log_key: write-behind 대기열(log_queue)이 건마다 만든 키
+# - 같은 키로 다시 들어온 로그는 건너뛰어서 재전송돼도 중복 저장되지 않음
+# - 여러 건을 executemany 로 넣은 뒤 키로 log_id 를 한 번에 찾음
+LOG_KEY_COLUMN = ("counseling_logs", "log_key", "CHAR(32)")
+LOG_KEY_INDEX = ("counseling_logs", "uq_logs_log_key", "log_key")
+
+# (테이블, 인덱스 이름, 컬럼)
+INDEXES = [
+    ("counseling_logs", "idx_logs_date", "date"),
+    ("counseling_logs", "idx_logs_mento_date", "mento, date"),
+    ("counseling_logs", "idx_logs_emotion_date", "emotion, date"),
+    ("counseling_log_keywords", "idx_log_keywords_keyword", "keyword, log_id"),
+]
+
+INSERT_IGNORE = {
+    "mysql": "INSERT IGNORE INTO",
+    "sqlite": "INSERT OR IGNORE INTO",
+}
+
+
+def ensure_column(cursor, table, name, ddl, dialect):
+    """컬럼이 없으면 추가 (이 컬럼이 생기기 전에 만든 테이블용)"""
+    if dialect == "sqlite":
+        cursor.execute(f"PRAGMA table_info({table})")
+        exists = any(row[1] == name for row in cursor.fetchall())
+    else:
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+            LIMIT 1
+            """,
+            (table, name),
+        )
+        exists = cursor.fetchone() is not None
+    if not exists:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+def ensure_index(cursor, table, name, columns, dialect, unique=False):
+    """인덱스가 없으면 생성 (MySQL 은 CREATE INDEX IF NOT EXISTS 를 지원하지 않아 직접 확인)"""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    if dialect == "sqlite":
+        cursor.execute(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})")
+        return
+
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+        """,
+        (table, name),
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(f"CREATE {kind} {name} ON {table} ({columns})")
+
+
+def create_keyword_schema(cursor, dialect):
+    cursor.execute(CREATE_KEYWORD_TABLE)
+    ensure_column(cursor, *LOG_KEY_COLUMN, dialect)
+    for table, name, columns in INDEXES:
+        ensure_index(cursor, table, name, columns, dialect)
+    # 키가 없는(NULL) 예전 로그는 여러 건이어도 됨
+    ensure_index(cursor, *LOG_KEY_INDEX, dialect, unique=True)
+
+
+def written_log_keys(cursor, log_keys):
+    """log_keys 중 이미 저장된 키 집합"""
+    if not log_keys:
+        return set()
+    placeholders = ", ".join(["%s"] * len(log_keys))
+    cursor.execute(f"SELECT log_key FROM counseling_logs WHERE log_key IN ({placeholders})", list(log_keys))
+    return {row[0] for row in cursor.fetchall()}
+
+
+def insert_logs_with_keywords(cursor, rows, dialect, log_keys=None):
+    """
+    rows: [(date, mento, user_input, keywords, emotion), ...]
+    로그 행을 executemany 로 넣고, log_key 로 log_id 를 한 번에 조회한 뒤 키워드 행도 executemany.
+    log_keys 를 안 주면 (rows 와 같은 순서) 여기서 만듦.
+    commit 은 호출 측에서 (한 트랜잭션).
+    """
+    if not rows:
+        return
+    log_keys = list(log_keys) if log_keys else [uuid.uuid4().hex for _ in rows]
+
+    cursor.executemany(
+        """
+        INSERT INTO counseling_logs (date, mento, user_input, keywords, emotion, log_key)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """,
+        [tuple(row) + (key,) for row, key in zip(rows, log_keys)],
+    )
+
+    placeholders = ", ".join(["%s"] * len(log_keys))
+    cursor.execute(f"SELECT log_key, id FROM counseling_logs WHERE log_key IN ({placeholders})", log_keys)
+    log_ids = dict(cursor.fetchall())
+
+    keyword_rows = [
+        (log_ids[key], word) for row, key in zip(rows, log_keys) for word in split_keywords(row[3])
+    ]
+    if keyword_rows:
+        cursor.executemany(
+            f"{INSERT_IGNORE[dialect]} counseling_log_keywords (log_id, keyword) VALUES (%s, %s)",
+            keyword_rows,
+        )
+
+
+def migrate_keywords(conn, dialect, page_size=5000):
+    """
+    기존 counseling_logs.keywords 컬럼을 counseling_log_keywords 로 옮김.
+    이미 옮긴 행은 무시되므로 여러 번 실행해도 안전. 반환: 읽은 로그 건수
+    """
+    cursor = conn.cursor()
+    try:
+        last_id = 0
+        total = 0
+        while True:
+            cursor.execute(
+                "SELECT id, keywords FROM counseling_logs WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, page_size),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            keyword_rows = [
+                (log_id, word) for log_id, keywords in rows for word in split_keywords(keywords)
+            ]
+            if keyword_rows:
+                cursor.executemany(
+                    f"{INSERT_IGNORE[dialect]} counseling_log_keywords (log_id, keyword) VALUES (%s, %s)",
+                    keyword_rows,
+                )
+            conn.commit()  # 페이지 단위로 커밋 (중간에 멈춰도 다시 실행하면 이어서)
+            last_id = rows[-1][0]
+            total += len(rows)
+        return total
+    finally:
+        cursor.close()
+
+
+def keywords_need_migration(conn):
+    """로그는 있는데 키워드 테이블이 비어 있으면 True"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM counseling_log_keywords LIMIT 1")
+        if cursor.fetchone():
+            return False
+        cursor.execute("SELECT 1 FROM counseling_logs WHERE keywords IS NOT NULL AND keywords <> '' LIMIT 1")
+        return cursor.fetchone() is not None
+    finally:
+        cursor.close()
+
+
+def top_keywords(cursor, start_date, end_date, limit=10, mento=None):
+    """
+    기간(+멘토) 안의 키워드 Top-N 을 SQL 로 집계.
+    반환: [(keyword, count), ...]
+    """
+    sql = """
+        SELECT k.keyword, COUNT(*) as cnt
+        FROM counseling_logs l
+        JOIN counseling_log_keywords k ON k.log_id = l.id
+        WHERE l.date >= %s AND l.date <= %s
+    """
+    params = [start_date, f"{end_date} 23:59:59"]
+    if mento:
+        sql += " AND l.mento = %s"
+        params.append(mento)
+    sql += " GROUP BY k.keyword ORDER BY cnt DESC LIMIT %s"
+    params.append(limit)
+
+    cursor.execute(sql, params)
+    return cursor.fetchall()
@@ -1,13 +1,24 @@
-from datetime import datetime, time
+import asyncio
 import json
 import os
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-import feedparser
-import urllib.parse
-import mysql.connector
 from openai import OpenAI
-from collections import Counter
+import sys
+from database import Database
+from analytics import emotion_mento_crosstab, top_keywords_by_mento, trend
+from log_queue import LogWriteQueue, QueueFullError
+from news_fetcher import NewsFetcher
+from result_cache import ResultCache
+from rollup import apply_rollups, backfill_rollups, create_rollup_tables, rollups_need_backfill
+from schema import (
+    create_keyword_schema,
+    insert_logs_with_keywords,
+    keywords_need_migration,
+    migrate_keywords,
+    top_keywords,
+    written_log_keys,
+)
 
 # 'News-Agent'라는 이름의 서버 생성
 mcp = FastMCP("News-Agent", host="0.0.0.0", port=8000)
@@ -37,144 +48,197 @@ DB_CONFIG = {
 }
 
 
-def get_connection():
-    """MySQL 데이터베이스 연결을 생성하는 헬퍼 함수"""
-    retries = 10
-    while retries > 0:
-        try:
-            conn = mysql.connector.connect(**DB_CONFIG)
-            return conn
-        except SystemError as e:
-            print(f"⏳ DB 연결 대기 중... (남은 시도: {retries}) - {e}")
-            retries -= 1
-            time.sleep(5)  # 5초 대기
+# 커넥션 풀 (DB_BACKEND=sqlite 로 로컬 SQLite 대체 가능)
+db = Database.from_env(DB_CONFIG)
 
-    raise Exception("❌ DB 연결 실패: 데이터베이스가 응답하지 않습니다.")
+# 분석 도구 결과 캐시 (로그가 새로 저장되면 비움)
+result_cache = ResultCache(max_entries=int(os.getenv("RESULT_CACHE_SIZE", "256")))
 
 
 def init_db():
     """테이블이 없으면 생성 (최초 1회 실행용)"""
-    try:
-        # DB 연결 (DB가 없으면 생성하는 로직은 복잡하므로, 미리 DB는 만들어두는 것을 권장)
-        conn = get_connection()
-        cursor = conn.cursor()
 
+    def create_tables(conn):
+        cursor = conn.cursor()
         # 테이블 생성 쿼리
-        create_table_query = """
+        create_table_query = f"""
         CREATE TABLE IF NOT EXISTS counseling_logs (
-            id INT AUTO_INCREMENT PRIMARY KEY,
+            id {db.auto_pk},
             date DATETIME,
             mento VARCHAR(50),
             user_input TEXT,
             keywords VARCHAR(255),
-            emotion VARCHAR(50)
+            emotion VARCHAR(50),
+            log_key CHAR(32)
         )
         """
         cursor.execute(create_table_query)
+        # 정규화 키워드 테이블 + 조회용 인덱스 + log_key 컬럼
+        create_keyword_schema(cursor, db.backend)
+        # 기간 분석용 일별 집계 테이블
+        create_rollup_tables(cursor)
         conn.commit()
-        print("✅ MySQL 테이블 확인/생성 완료")
-    except mysql.connector.Error as err:
+        cursor.close()
+
+    try:
+        db.run_sync(create_tables)
+        print("✅ 테이블 확인/생성 완료")
+        # 집계 테이블 도입 전에 쌓인 로그가 있으면 한 번 채워줌
+        if db.run_sync(rollups_need_backfill):
+            backfill()
+        # keywords 쉼표 컬럼만 있던 기존 로그도 키워드 테이블로 옮겨줌
+        if db.run_sync(keywords_need_migration):
+            migrate()
+    except Exception as err:
         print(f"❌ DB 초기화 에러: {err}")
-    finally:
-        if "conn" in locals() and conn.is_connected():
-            cursor.close()
-            conn.close()
+
+
+def backfill():
+    """counseling_logs 전체로 일별 집계 테이블을 다시 계산 (python server.py --backfill)"""
+    total = db.run_sync(backfill_rollups, db.backend)
+    result_cache.invalidate()
+    print(f"✅ 일별 집계 백필 완료 (로그 {total}건)")
+
+
+def migrate():
+    """counseling_logs.keywords 를 counseling_log_keywords 로 옮김 (python server.py --migrate-keywords)"""
+    total = db.run_sync(migrate_keywords, db.backend)
+    result_cache.invalidate()
+    print(f"✅ 키워드 테이블 마이그레이션 완료 (로그 {total}건)")
 
 
 # ---------------------------------------------------------
-# [2] 상담 로그 저장 도구 (MySQL 버전)
+# [2] 상담 로그 저장 도구 (write-behind 대기열)
 # ---------------------------------------------------------
-@mcp.tool()
-def analyze_and_save_log(user_input: str, mento: str) -> str:
+def classify_logs(user_inputs):
     """
-    [서버 측 로직]
-    대화 전체 기록(full_dialogue)을 받아서,
-    서버가 직접 키워드와 감정을 추출(LLM)한 뒤 DB에 저장합니다.
-
-    Args:
-        full_dialogue: "User: 안녕\nMento: 반가워요..." 형태의 전체 대화 문자열
-        mento_name: 멘토 이름
+    여러 사용자 질문을 LLM 요청 1번으로 분석합니다.
+    반환: user_inputs 와 같은 순서의 [{"keywords", "emotion", "summary"}, ...]
+    """
+    numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(user_inputs))
+    prompt = f"""
+    아래 번호가 붙은 사용자 질문들을 각각 분석해서 JSON으로 반환해줘.
+
+    [사용자 질문 목록]
+    {numbered}
+
+    [요구사항]
+    각 질문마다 다음 항목을 만들어서
+    {{"results": [{{"index": 번호, "keywords": ..., "emotion": ..., "summary": ...}}, ...]}} 형태로 반환
+    1. keywords: 핵심 주제 3개 (쉼표 구분)
+    2. emotion: 내담자의 감정 1단어
+    3. summary: 1줄 요약
     """
-    try:
-        # 1. MCP 서버가 직접 LLM에게 분석 요청 (GPT-4o-mini 사용 추천)
-        prompt = f"""
-        아래 사용자 질문을 분석해서 JSON으로 반환해줘.
-        
-        [사용자 질문]
-        {user_input}
-        
-        [요구사항]
-        1. keywords: 핵심 주제 3개 (쉼표 구분)
-        2. emotion: 내담자의 감정 1단어
-        3. summary: 1줄 요약
-        """
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "너는 전문 상담 분석가야."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "너는 전문 상담 분석가야."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0,
+        response_format={"type": "json_object"},
+    )
 
-        # JSON 파싱
-        content = response.choices[0].message.content
-        cleaned_json = content.replace("```json", "").replace("```", "").strip()
-        data = json.loads(cleaned_json)
+    data = json.loads(response.choices[0].message.content)
+    by_index = {}
+    for item in data.get("results", []):
+        try:
+            by_index[int(item.get("index"))] = item
+        except (TypeError, ValueError):
+            continue
+        # keywords 를 리스트로 돌려주는 경우도 있어서 쉼표 문자열로 통일
+        if isinstance(item.get("keywords"), list):
+            item["keywords"] = ", ".join(str(w) for w in item["keywords"])
+    # 응답에서 빠진 질문은 기본값으로 저장 (요약 없으면 원문)
+    return [by_index.get(i, {}) for i in range(len(user_inputs))]
 
-        keywords = data.get("keywords", "미정")
-        emotion = data.get("emotion", "보통")
-        summary = data.get("summary", "")
 
-        # 2. DB 저장
-        conn = get_connection()
-        cursor = conn.cursor()
+def write_logs(rows, log_keys):
+    """
+    분석된 로그들을 한 트랜잭션으로 저장 (로그 + 키워드 테이블 + 일별 집계).
+    이미 저장된 log_key 는 건너뜀 (대기열이 같은 배치를 다시 보내도 중복 저장 없음)
+    """
 
-        sql = """
-            INSERT INTO counseling_logs (date, mento, user_input, keywords, emotion)
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        # user_input 컬럼에는 '요약본(summary)'을 저장하는 게 더 효율적일 수 있습니다.
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cursor.execute(sql, (now, mento, summary, keywords, emotion))
+    def insert_logs(conn):
+        cursor = conn.cursor()
+        written = written_log_keys(cursor, log_keys)
+        new_rows = [row for row, key in zip(rows, log_keys) if key not in written]
+        new_keys = [key for key in log_keys if key not in written]
+        if written:
+            print(f"↩️ 이미 저장된 로그 {len(written)}건은 건너뜀")
+        # user_input 컬럼에는 '요약본(summary)'을 저장합니다.
+        insert_logs_with_keywords(cursor, new_rows, db.backend, log_keys=new_keys)
+        # 일별 집계도 같은 트랜잭션에서 갱신
+        apply_rollups(cursor, new_rows, db.backend)
         conn.commit()
+        cursor.close()
+        return len(new_rows)
+
+    if db.run_sync(insert_logs):
+        result_cache.invalidate()
+
+
+log_queue = LogWriteQueue(
+    spool_path=os.getenv("LOG_QUEUE_PATH", "log_queue.db"),
+    classify_batch=classify_logs,
+    write_rows=write_logs,
+    batch_size=int(os.getenv("LOG_BATCH_SIZE", "20")),
+    flush_interval=float(os.getenv("LOG_FLUSH_INTERVAL", "5")),
+    max_pending=int(os.getenv("LOG_MAX_PENDING", "1000")),
+)
+
+
+@mcp.tool()
+async def analyze_and_save_log(user_input: str, mento: str) -> str:
+    """
+    [서버 측 로직]
+    사용자 질문을 대기열에 넣고 바로 반환합니다.
+    키워드/감정 분석(LLM)과 DB 저장은 백그라운드에서 여러 건씩 묶어서 처리합니다.
 
-        return f"✅ 서버 분석 및 저장 완료! (감정: {emotion}, 키워드: {keywords})"
+    Args:
+        user_input: 사용자 질문
+        mento: 멘토 이름
+    """
+    try:
+        pending = await asyncio.to_thread(log_queue.enqueue, user_input, mento)
+        return f"✅ 분석 대기열 등록 완료! (대기 {pending}건)"
 
+    except QueueFullError as e:
+        return f"❌ 서버 혼잡: {str(e)}"
     except Exception as e:
         return f"❌ 서버 오류: {str(e)}"
-    finally:
-        if "conn" in locals() and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 
-@mcp.tool()
-def get_latest_news(keyword: str = "사회", limit: int = 3) -> str:
-    """구글 뉴스에서 키워드 검색 결과를 가져옵니다."""
-    encoded_keyword = urllib.parse.quote(keyword)
-    rss_url = (
-        f"https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko"
-    )
+# 뉴스 RSS 수집기 (NEWS_TTL 초 동안 같은 검색 결과 재사용)
+news_fetcher = NewsFetcher(
+    ttl=int(os.getenv("NEWS_TTL", "300")),
+    timeout=float(os.getenv("NEWS_TIMEOUT", "5")),
+)
 
-    feed = feedparser.parse(rss_url)
-    if not feed.entries:
-        return "뉴스를 찾을 수 없습니다."
 
-    results = []
-    for i, entry in enumerate(feed.entries[:limit]):
-        results.append(f"[{i+1}] {entry.title} ({entry.published})")
+@mcp.tool()
+async def get_latest_news(keyword: str = "사회", limit: int = 3) -> str:
+    """구글 뉴스에서 키워드 검색 결과를 가져옵니다."""
+    return await news_fetcher.get(keyword, limit)
 
-    return "\n".join(results)
 
+@mcp.tool()
+async def get_latest_news_batch(keywords: list[str], limit: int = 3) -> str:
+    """
+    여러 키워드의 구글 뉴스 검색 결과를 동시에 가져옵니다.
 
-import json
-from collections import Counter
+    Returns:
+        JSON String (예: '{"인공지능": "[1] ...", "취업": "[1] ..."}')
+    """
+    results = await news_fetcher.get_many(keywords, limit)
+    return json.dumps(results, ensure_ascii=False)
 
 
 @mcp.tool()
-def get_period_analytics(start_date: str, end_date: str, analysis_type: str) -> str:
+async def get_period_analytics(
+    start_date: str, end_date: str, analysis_type: str, mento: str = ""
+) -> str:
     """
     특정 기간 동안의 상담 데이터를 분석하여 JSON 형식으로 반환합니다.
     시각화(차트, 워드클라우드)를 위해 사용됩니다.
@@ -183,82 +247,167 @@ def get_period_analytics(start_date: str, end_date: str, analysis_type: str) ->
         start_date: 시작 날짜 (YYYY-MM-DD)
         end_date: 종료 날짜 (YYYY-MM-DD)
         analysis_type: 'emotion_rank', 'keyword_rank', 'mento_rank' 중 하나
+        mento: (선택) keyword_rank 를 특정 멘토의 상담으로 한정
 
     Returns:
         JSON String (예: '[{"label": "불안", "value": 10}, ...]')
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    # 원본 로그 대신 일별 집계 테이블을 읽음 (기간 일수만큼의 행만 스캔)
+    date_condition = "day >= %s AND day <= %s"
 
-    date_condition = "date >= %s AND date <= %s"
-    full_end_date = f"{end_date} 23:59:59"
+    def query(conn):
+        cursor = conn.cursor()
+        result_data = []  # 데이터를 담을 리스트
+        try:
+            # 1. 감정 상태 순위
+            if analysis_type == "emotion_rank":
+                sql = f"""
+                    SELECT emotion, SUM(cnt) as total 
+                    FROM daily_emotion_counts 
+                    WHERE {date_condition}
+                    GROUP BY emotion 
+                    ORDER BY total DESC
+                """
+                cursor.execute(sql, (start_date, end_date))
+                rows = cursor.fetchall()
+
+                # JSON 구조: [{"emotion": "불안", "count": 10}, ...]
+                for row in rows:
+                    result_data.append({"emotion": row[0], "count": int(row[1])})
+
+            # 2. 멘토 호출 횟수 순위
+            elif analysis_type == "mento_rank":
+                sql = f"""
+                    SELECT mento, SUM(cnt) as total 
+                    FROM daily_emotion_counts 
+                    WHERE {date_condition}
+                    GROUP BY mento 
+                    ORDER BY total DESC
+                """
+                cursor.execute(sql, (start_date, end_date))
+                rows = cursor.fetchall()
+
+                # JSON 구조: [{"mento": "니체", "count": 5}, ...]
+                for row in rows:
+                    result_data.append({"mento": row[0], "count": int(row[1])})
+
+            # 3. 고민 키워드 순위
+            elif analysis_type == "keyword_rank" and mento:
+                # 멘토별 키워드는 정규화 키워드 테이블을 인덱스로 조인해서 집계
+                for keyword, cnt in top_keywords(cursor, start_date, end_date, 10, mento):
+                    result_data.append({"keyword": keyword, "count": int(cnt)})
+
+            elif analysis_type == "keyword_rank":
+                # 워드클라우드용 데이터는 좀 더 많이 가져옵니다 (Top 10)
+                sql = f"""
+                    SELECT keyword, SUM(cnt) as total 
+                    FROM daily_keyword_counts 
+                    WHERE {date_condition}
+                    GROUP BY keyword 
+                    ORDER BY total DESC
+                    LIMIT 10
+                """
+                cursor.execute(sql, (start_date, end_date))
+                rows = cursor.fetchall()
+
+                # JSON 구조: [{"keyword": "취업", "count": 15}, ...]
+                for row in rows:
+                    result_data.append({"keyword": row[0], "count": int(row[1])})
+
+            else:
+                return json.dumps({"error": "잘못된 분석 타입입니다."}, ensure_ascii=False)
+
+            # Python 객체(List/Dict)를 JSON 문자열로 변환 (한글 깨짐 방지)
+            return json.dumps(result_data, ensure_ascii=False)
+
+        except Exception as e:
+            return json.dumps({"error": f"분석 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+        finally:
+            cursor.close()
 
-    result_data = []  # 데이터를 담을 리스트
+    args = {"start_date": start_date, "end_date": end_date, "analysis_type": analysis_type, "mento": mento}
+    return await result_cache.get_or_compute("get_period_analytics", args, lambda: db.run(query))
 
-    try:
-        # 1. 감정 상태 순위
-        if analysis_type == "emotion_rank":
-            sql = f"""
-                SELECT emotion, COUNT(*) as cnt 
-                FROM counseling_logs 
-                WHERE {date_condition}
-                GROUP BY emotion 
-                ORDER BY cnt DESC
-            """
-            cursor.execute(sql, (start_date, full_end_date))
-            rows = cursor.fetchall()
-
-            # JSON 구조: [{"emotion": "불안", "count": 10}, ...]
-            for row in rows:
-                result_data.append({"emotion": row[0], "count": row[1]})
-
-        # 2. 멘토 호출 횟수 순위
-        elif analysis_type == "mento_rank":
-            sql = f"""
-                SELECT mento, COUNT(*) as cnt 
-                FROM counseling_logs 
-                WHERE {date_condition}
-                GROUP BY mento 
-                ORDER BY cnt DESC
-            """
-            cursor.execute(sql, (start_date, full_end_date))
-            rows = cursor.fetchall()
-
-            # JSON 구조: [{"mento": "니체", "count": 5}, ...]
-            for row in rows:
-                result_data.append({"mento": row[0], "count": row[1]})
-
-        # 3. 고민 키워드 순위
-        elif analysis_type == "keyword_rank":
-            sql = f"SELECT keywords FROM counseling_logs WHERE {date_condition}"
-            cursor.execute(sql, (start_date, full_end_date))
-            rows = cursor.fetchall()
-
-            all_words = []
-            for row in rows:
-                if row[0]:
-                    words = [w.strip() for w in row[0].split(",")]
-                    all_words.extend(words)
-
-            # 워드클라우드용 데이터는 좀 더 많이 가져옵니다 (Top 10)
-            top_keywords = Counter(all_words).most_common(10)
-
-            # JSON 구조: [{"keyword": "취업", "count": 15}, ...]
-            for word, cnt in top_keywords:
-                result_data.append({"keyword": word, "count": cnt})
-
-        else:
-            return json.dumps({"error": "잘못된 분석 타입입니다."}, ensure_ascii=False)
-
-        # Python 객체(List/Dict)를 JSON 문자열로 변환 (한글 깨짐 방지)
-        return json.dumps(result_data, ensure_ascii=False)
 
-    except Exception as e:
-        return json.dumps({"error": f"분석 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+# ---------------------------------------------------------
+# [3] 추세 / 교차표 분석 도구 (컬럼형 JSON, 결과 캐시)
+# ---------------------------------------------------------
+async def run_analytics(tool_name, fn, **args):
+    """fn(cursor, **args) 결과를 JSON 으로 만들고 (도구, 인자) 기준으로 캐시"""
 
-    finally:
-        cursor.close()
-        conn.close()
+    def query(conn):
+        cursor = conn.cursor()
+        try:
+            return json.dumps(fn(cursor, **args), ensure_ascii=False)
+        except Exception as e:
+            return json.dumps({"error": f"분석 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+        finally:
+            cursor.close()
+
+    return await result_cache.get_or_compute(tool_name, args, lambda: db.run(query))
+
+
+@mcp.tool()
+async def get_trend(
+    start_date: str,
+    end_date: str,
+    bucket: str = "week",
+    group_by: str = "",
+    emotion: str = "",
+    mento: str = "",
+    keyword: str = "",
+) -> str:
+    """
+    기간 동안의 상담 건수 추세를 일/주/월 단위로 반환합니다. (선 그래프용)
+
+    Args:
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        end_date: 종료 날짜 (YYYY-MM-DD)
+        bucket: 'day', 'week', 'month' 중 하나
+        group_by: '', 'mento', 'emotion' 중 하나 (계열 구분)
+        emotion: (선택) 특정 감정만
+        mento: (선택) 특정 멘토만
+        keyword: (선택) 특정 키워드 언급 추세 (지정 시 group_by 무시)
+
+    Returns:
+        JSON String (예: '{"chart": "line", "columns": {"bucket": [...], "count": [...]}}')
+    """
+    return await run_analytics(
+        "get_trend", trend,
+        start_date=start_date, end_date=end_date, bucket=bucket,
+        group_by=group_by, emotion=emotion, mento=mento, keyword=keyword,
+    )
+
+
+@mcp.tool()
+async def get_emotion_mento_crosstab(start_date: str, end_date: str) -> str:
+    """
+    기간 동안의 감정 x 멘토 상담 건수 교차표를 반환합니다. (히트맵용)
+
+    Args:
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        end_date: 종료 날짜 (YYYY-MM-DD)
+    """
+    return await run_analytics(
+        "get_emotion_mento_crosstab", emotion_mento_crosstab,
+        start_date=start_date, end_date=end_date,
+    )
+
+
+@mcp.tool()
+async def get_top_keywords_by_mento(start_date: str, end_date: str, limit: int = 5) -> str:
+    """
+    기간 동안 멘토별로 가장 많이 나온 고민 키워드 Top-N 을 반환합니다. (막대 그래프용)
+
+    Args:
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        end_date: 종료 날짜 (YYYY-MM-DD)
+        limit: 멘토마다 가져올 키워드 수
+    """
+    return await run_analytics(
+        "get_top_keywords_by_mento", top_keywords_by_mento,
+        start_date=start_date, end_date=end_date, limit=limit,
+    )
 
 
 if __name__ == "__main__":
@@ -269,4 +418,13 @@ if __name__ == "__main__":
         print("✅ DB 초기화 완료", flush=True)  # flush=True는 즉시 출력을 의미
     except Exception as e:
         print(f"⚠️ DB 에러: {e}", flush=True)
+
+    # python server.py --backfill : 집계 테이블만 다시 계산하고 종료
+    if "--backfill" in sys.argv:
+        backfill()
+        sys.exit(0)
+    # python server.py --migrate-keywords : 키워드 테이블만 채우고 종료
+    if "--migrate-keywords" in sys.argv:
+        migrate()
+        sys.exit(0)
     mcp.run(transport="sse")
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import uuid
+from collections import Counter
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+# ---------------------------------------------------------
+# 추세/교차표 분석 도구와 결과 캐시 확인 (MySQL 대신 SQLite, LLM 호출 없음)
+# server.py 를 그대로 import 하므로 mcp / openai / python-dotenv 는 설치되어 있어야 함
+# 실행: python test/analytics_check.py
+# ---------------------------------------------------------
+tmp = tempfile.TemporaryDirectory()
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = str(Path(tmp.name) / "counseling.db")
+os.environ["LOG_QUEUE_PATH"] = str(Path(tmp.name) / "log_queue.db")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import server  # noqa: E402
+from analytics import bucket_of  # noqa: E402
+
+# 주(월요일 시작) / 월 / 연도 경계에 걸친 로그
+ROWS = [
+    ("2024-12-29 10:00:00", "유진", "요약", "가족, 돈", "불안"),  # 일요일 -> 12-23 주
+    ("2024-12-30 09:00:00", "유진", "요약", "가족", "불안"),  # 월요일 -> 12-30 주 (연도를 넘어가는 주)
+    ("2025-01-01 00:00:00", "운성", "요약", "진로", "기쁨"),  # 12-30 주, 2025-01 월
+    ("2025-01-31 23:59:59", "운성", "요약", "진로, 취업", "불안"),  # 01-27 주, 2025-01 월
+    ("2025-02-01 00:00:00", "법륜", "요약", "취업", "슬픔"),  # 01-27 주, 2025-02 월
+    ("2025-02-02 23:59:59", "법륜", "요약", "취업, 연애", "불안"),  # 일요일 -> 01-27 주
+    ("2025-02-03 00:00:00", "니체", "요약", "연애", "기쁨"),  # 월요일 -> 02-03 주
+]
+
+
+def call(tool, **args):
+    return json.loads(asyncio.run(tool(**args)))
+
+
+def write(rows):
+    server.write_logs(rows, [uuid.uuid4().hex for _ in rows])
+
+
+def assert_columnar(result):
+    lengths = {name: len(values) for name, values in result["columns"].items()}
+    assert len(set(lengths.values())) == 1, lengths
+    for field in ("x", "y", "z", "color"):
+        if field in result:
+            assert result[field] in result["columns"], (field, result)
+    return next(iter(lengths.values()))
+
+
+if __name__ == "__main__":
+    server.init_db()
+
+    # 1) 버킷 경계
+    assert bucket_of("2025-02-02", "week") == "2025-01-27"  # 일요일은 앞 주
+    assert bucket_of("2025-02-03 00:00:00", "week") == "2025-02-03"  # 월요일부터 새 주
+    assert bucket_of("2025-01-01", "week") == "2024-12-30"  # 연도를 넘어가는 주
+    assert bucket_of("2025-01-31 23:59:59", "month") == "2025-01"
+    assert bucket_of("2025-02-01", "month") == "2025-02"
+    assert bucket_of("2025-02-01", "day") == "2025-02-01"
+    print("✅ bucket_of: 주(월요일 시작)/월/연도 경계")
+
+    write(ROWS)
+    for bucket in ("day", "week", "month"):
+        result = call(server.get_trend, start_date="2024-12-01", end_date="2025-02-28", bucket=bucket)
+        expected = Counter(bucket_of(row[0], bucket) for row in ROWS)
+        got = dict(zip(result["columns"]["bucket"], result["columns"]["count"]))
+        assert got == expected, (bucket, got, expected)
+        assert result["columns"]["bucket"] == sorted(expected)
+    print("✅ get_trend: 일/주/월 버킷별 건수가 원본 로그와 일치")
+
+    # 2) 컬럼형 JSON: 모든 컬럼 길이가 같고 인코딩 필드가 컬럼을 가리킴
+    results = {
+        "trend(group_by=mento)": call(
+            server.get_trend, start_date="2024-12-01", end_date="2025-02-28", bucket="week", group_by="mento"
+        ),
+        "trend(keyword=취업)": call(
+            server.get_trend, start_date="2024-12-01", end_date="2025-02-28", bucket="week", keyword="취업"
+        ),
+        "crosstab": call(server.get_emotion_mento_crosstab, start_date="2024-12-01", end_date="2025-02-28"),
+        "top_keywords_by_mento": call(
+            server.get_top_keywords_by_mento, start_date="2024-12-01", end_date="2025-02-28", limit=1
+        ),
+    }
+    sizes = {name: assert_columnar(result) for name, result in results.items()}
+    assert results["trend(keyword=취업)"]["columns"] == {"bucket": ["2025-01-27"], "count": [3]}
+    assert sizes["crosstab"] == len({(row[4], row[1]) for row in ROWS})
+    assert sizes["top_keywords_by_mento"] == len({row[1] for row in ROWS})  # 멘토마다 1개
+    print(f"✅ 컬럼형 JSON: 컬럼 길이 일치 {sizes}")
+
+    # 3) 캐시: 같은 인자는 hit, write_logs 직후에는 miss 로 새 값
+    args = {"start_date": "2025-02-01", "end_date": "2025-02-28", "bucket": "month"}
+    first = call(server.get_trend, **args)
+    stats = server.result_cache.stats()
+    assert call(server.get_trend, **args) == first
+    assert server.result_cache.stats()["hits"] == stats["hits"] + 1
+
+    write([("2025-02-10 12:00:00", "유진", "요약", "건강", "불안")])
+    after = call(server.get_trend, **args)
+    assert server.result_cache.stats()["misses"] == stats["misses"] + 1
+    assert after["columns"]["count"] == [first["columns"]["count"][0] + 1], (first, after)
+    print(f"✅ 결과 캐시: 반복 호출 hit, 로그 저장 직후 miss ({first['columns']['count']} -> {after['columns']['count']})")
+
+    server.log_queue.close()
+    tmp.cleanup()
+    print("🎉 모든 확인 통과")
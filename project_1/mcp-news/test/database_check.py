@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from database import Database  # noqa: E402
+
+# ---------------------------------------------------------
+# 커넥션 풀 확인 (MySQL 없이 DB_BACKEND=sqlite 로 실행)
+# 실행: python test/database_check.py
+# ---------------------------------------------------------
+
+
+def make_db(path, pool_size):
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["SQLITE_PATH"] = str(path)
+    return Database.from_env({})
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(Path(tmp) / "counseling.db", pool_size=2)
+        assert db.backend == "sqlite" and db.auto_pk.startswith("INTEGER")
+
+        # 1) MySQL 식 %s 플레이스홀더가 SQLite ? 로 바뀌어 실행되는지
+        def setup(conn):
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE TABLE logs (id {db.auto_pk}, mento TEXT, emotion TEXT)")
+            cursor.executemany(
+                "INSERT INTO logs (mento, emotion) VALUES (%s, %s)",
+                [("유진", "불안"), ("운성", "기쁨"), ("유진", "슬픔")],
+            )
+            conn.commit()
+            cursor.execute("SELECT COUNT(*) FROM logs WHERE mento = %s", ("유진",))
+            return cursor.fetchone()[0]
+
+        assert db.run_sync(setup) == 2
+        print("✅ %s -> ? 변환: executemany / execute 모두 동작")
+
+        # 2) 풀이 비면 예외 대신 반납될 때까지 대기
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with db.connection():
+                held.set()
+                release.wait()
+
+        holders = [threading.Thread(target=hold) for _ in range(2)]
+        for t in holders:
+            t.start()
+        held.wait()
+        time.sleep(0.05)  # 두 번째 스레드도 커넥션을 잡을 시간
+
+        waited = []
+
+        def borrow():
+            started_at = time.monotonic()
+            with db.connection() as conn:
+                conn.cursor().execute("SELECT 1")
+            waited.append(time.monotonic() - started_at)
+
+        borrower = threading.Thread(target=borrow)
+        borrower.start()
+        time.sleep(0.3)
+        assert not waited, "풀이 비었는데 커넥션을 받음"
+        release.set()
+        for t in holders + [borrower]:
+            t.join(timeout=5)
+        assert waited and waited[0] >= 0.3, waited
+        print(f"✅ 풀 고갈 시 대기: 반납 후 {waited[0]:.2f}초 만에 커넥션 획득")
+
+        # 3) 끊긴 커넥션은 꺼낼 때 ping 으로 재접속
+        single = make_db(Path(tmp) / "counseling.db", pool_size=1)
+        with single.connection() as conn:
+            conn._conn.close()  # 서버 쪽에서 끊긴 상황 흉내
+        with single.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM logs WHERE emotion = %s", ("기쁨",))
+            assert cursor.fetchone()[0] == 1
+        print("✅ 끊긴 커넥션: 다음 대여 때 ping 으로 재접속")
+
+        # 4) run() 은 이벤트 루프를 막지 않음
+        def slow_query(conn, seconds):
+            time.sleep(seconds)  # 느린 쿼리 흉내
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM logs")
+            return threading.current_thread() is threading.main_thread(), cursor.fetchone()[0]
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            on_main, count = await db.run(slow_query, 0.3)
+            task.cancel()
+            return on_main, count, ticks
+
+        on_main, count, ticks = asyncio.run(main())
+        assert count == 3 and not on_main
+        assert ticks >= 10, ticks
+        print(f"✅ run(): 작업 스레드에서 실행, 그동안 이벤트 루프 {ticks}번 진행")
+
+    print("🎉 모든 확인 통과")
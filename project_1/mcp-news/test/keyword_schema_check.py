@@ -0,0 +1,118 @@
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from database import Database  # noqa: E402
+from schema import INDEXES, create_keyword_schema, keywords_need_migration, migrate_keywords, top_keywords  # noqa: E402
+
+# ---------------------------------------------------------
+# 정규화 키워드 테이블 마이그레이션 / Top-N 집계 확인 (MySQL 대신 SQLite)
+# 실행: python test/keyword_schema_check.py
+# ---------------------------------------------------------
+random.seed(1)
+MENTOS = ["유진", "운성", "법륜", "니체"]
+KEYWORDS = ["취업", "가족", "연애", "건강", "진로", "돈", "친구", "신앙", "외로움", "공부", "이직", "결혼"]
+
+
+def legacy_rows(count):
+    """키워드 테이블 도입 전처럼 keywords 쉼표 컬럼만 있는 로그"""
+    rows = []
+    for _ in range(count):
+        date = datetime(2025, 3, 1) + timedelta(days=random.randint(0, 30), seconds=random.randint(0, 86399))
+        # 가중치를 줘서 순위 차이가 나게
+        words = random.sample(KEYWORDS, random.randint(1, 3), counts=[12 - i for i in range(len(KEYWORDS))])
+        words = list(dict.fromkeys(words))
+        rows.append((date.strftime("%Y-%m-%d %H:%M:%S"), random.choice(MENTOS), "요약", ", ".join(words), "보통"))
+    return rows
+
+
+def old_top_keywords(rows, start_date, end_date, limit=10, mento=None):
+    """예전 get_period_analytics(keyword_rank) 방식: 기간 로그를 모두 읽어서 Counter"""
+    all_words = []
+    for date, row_mento, _, keywords, _ in rows:
+        if not (start_date <= date <= f"{end_date} 23:59:59") or (mento and row_mento != mento):
+            continue
+        if keywords:
+            all_words.extend(w.strip() for w in keywords.split(","))
+    return Counter(all_words).most_common(limit)
+
+
+def setup_legacy(conn, rows):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE counseling_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, date DATETIME, mento VARCHAR(50),
+            user_input TEXT, keywords VARCHAR(255), emotion VARCHAR(50)
+        )
+        """
+    )
+    cursor.executemany(
+        "INSERT INTO counseling_logs (date, mento, user_input, keywords, emotion) VALUES (%s, %s, %s, %s, %s)",
+        rows,
+    )
+    # 서버 시작 시 init_db 처럼 새 테이블/인덱스만 추가 (기존 로그는 그대로)
+    create_keyword_schema(cursor, "sqlite")
+    conn.commit()
+
+
+def keyword_rows(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT log_id, keyword FROM counseling_log_keywords ORDER BY log_id, keyword")
+    return cursor.fetchall()
+
+
+def same_ranking(new, old):
+    """개수 순서가 같고, 동점 구간 밖에서는 키워드까지 같아야 함 (동점끼리 순서는 DB 마음대로)"""
+    if [cnt for _, cnt in new] != [cnt for _, cnt in old]:
+        return False
+    cutoff = old[-1][1] if old else 0
+    return {(w, c) for w, c in new if c > cutoff} == {(w, c) for w, c in old if c > cutoff}
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(backend="sqlite", pool_size=1, sqlite_path=str(Path(tmp) / "counseling.db"))
+        rows = legacy_rows(500)
+        db.run_sync(setup_legacy, rows)
+
+        def index_names(conn):
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            return {row[0] for row in cursor.fetchall()}
+
+        assert {name for _, name, _ in INDEXES} <= db.run_sync(index_names)
+        print(f"✅ 인덱스 {len(INDEXES)}개 생성")
+
+        # 1) 마이그레이션: 두 번 돌려도 같은 결과 (페이지 크기를 작게 해서 여러 페이지로)
+        assert db.run_sync(keywords_need_migration)
+        assert db.run_sync(migrate_keywords, "sqlite", 64) == len(rows)
+        first = db.run_sync(keyword_rows)
+        assert len(first) == sum(len(r[3].split(",")) for r in rows)
+        assert not db.run_sync(keywords_need_migration)
+
+        assert db.run_sync(migrate_keywords, "sqlite", 64) == len(rows)
+        assert db.run_sync(keyword_rows) == first
+        print(f"✅ 마이그레이션: 로그 {len(rows)}건 -> 키워드 {len(first)}행, 두 번 실행해도 그대로")
+
+        # 2) top_keywords == 예전 Counter 방식 (기간 / 멘토 필터 / limit 별로)
+        cases = [
+            ("2025-03-01", "2025-03-31", 10, None),
+            ("2025-03-05", "2025-03-12", 5, None),
+            ("2025-03-01", "2025-03-31", 10, "니체"),
+            ("2025-03-20", "2025-03-20", 3, "유진"),
+            ("2025-04-01", "2025-04-30", 10, None),  # 로그 없는 기간
+        ]
+        for start, end, limit, mento in cases:
+            new = db.run_sync(lambda conn: top_keywords(conn.cursor(), start, end, limit, mento))
+            old = old_top_keywords(rows, start, end, limit, mento)
+            assert same_ranking([tuple(r) for r in new], old), (start, end, mento, new, old)
+        print(f"✅ top_keywords: {len(cases)}개 조건에서 예전 Counter 집계와 일치")
+
+    print("🎉 모든 확인 통과")
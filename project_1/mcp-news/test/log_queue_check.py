@@ -0,0 +1,241 @@
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from database import Database  # noqa: E402
+from log_queue import LogWriteQueue, QueueFullError, is_transient_error  # noqa: E402
+from schema import create_keyword_schema, insert_logs_with_keywords, written_log_keys  # noqa: E402
+
+# ---------------------------------------------------------
+# 상담 로그 write-behind 대기열 확인 (LLM 대신 가짜 분류기, MySQL 대신 SQLite)
+# 실행: python test/log_queue_check.py
+# ---------------------------------------------------------
+
+
+class FakeClassifier:
+    """'독' 이 들어간 질문이 섞이면 배치 전체를 실패시키는 분류기"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        if any("독" in text for text in texts):
+            raise ValueError("분류 불가 입력")
+        return [{"keywords": "불안, 취업", "emotion": "불안", "summary": f"요약: {text}"} for text in texts]
+
+
+class Store:
+    """server.write_logs 와 같은 방식으로 SQLite 에 저장 (이미 저장된 log_key 는 건너뜀)"""
+
+    def __init__(self, path):
+        self.db = Database(backend="sqlite", pool_size=1, sqlite_path=str(path))
+        self.down = False
+        self.calls = 0
+
+        def setup(conn):
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS counseling_logs (
+                    id {self.db.auto_pk}, date DATETIME, mento VARCHAR(50),
+                    user_input TEXT, keywords VARCHAR(255), emotion VARCHAR(50)
+                )
+                """
+            )
+            create_keyword_schema(cursor, "sqlite")
+            conn.commit()
+
+        self.db.run_sync(setup)
+
+    def __call__(self, rows, log_keys):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("DB 연결 끊김")
+
+        def insert(conn):
+            cursor = conn.cursor()
+            written = written_log_keys(cursor, log_keys)
+            new = [(row, key) for row, key in zip(rows, log_keys) if key not in written]
+            insert_logs_with_keywords(cursor, [row for row, _ in new], "sqlite", log_keys=[key for _, key in new])
+            conn.commit()
+
+        self.db.run_sync(insert)
+
+    def inputs(self):
+        def select(conn):
+            cursor = conn.cursor()
+            cursor.execute("SELECT user_input FROM counseling_logs ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+
+        return self.db.run_sync(select)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def make_queue(workdir, store, classifier=None, **options):
+    options = {"batch_size": 5, "flush_interval": 60, "retry_delay": 0.05, **options}
+    return LogWriteQueue(workdir / "spool.db", classifier or FakeClassifier(), store, **options)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+
+        # 1) batch_size 만큼 쌓이면 바로 flush (LLM 1번 + 저장 1번)
+        store = Store(workdir / "logs1.db")
+        classifier = FakeClassifier()
+        q = make_queue(workdir / "q1", store, classifier)
+        for i in range(5):
+            q.enqueue(f"질문 {i}", "유진")
+        assert wait_until(lambda: len(store.inputs()) == 5)
+        assert len(classifier.batches) == 1 and store.calls == 1
+        q.close()
+        print("✅ 크기 기준 flush: 5건 -> 분류 1번, 저장 1번")
+
+        # 2) batch_size 에 못 미쳐도 flush_interval 이 지나면 flush
+        store = Store(workdir / "logs2.db")
+        q = make_queue(workdir / "q2", store, flush_interval=0.3)
+        started_at = time.monotonic()
+        q.enqueue("질문 a", "운성")
+        q.enqueue("질문 b", "운성")
+        assert wait_until(lambda: len(store.inputs()) == 2)
+        elapsed = time.monotonic() - started_at
+        assert elapsed >= 0.25, elapsed
+        q.close()
+        print(f"✅ 시간 기준 flush: 2건이 {elapsed:.2f}초 뒤 저장")
+
+        # 3) max_pending 을 넘으면 enqueue_timeout 동안 기다리다 QueueFullError
+        store = Store(workdir / "logs3.db")
+        q = make_queue(workdir / "q3", store, batch_size=100, max_pending=3, enqueue_timeout=0.2)
+        for i in range(3):
+            q.enqueue(f"질문 {i}", "유진")
+        started_at = time.monotonic()
+        try:
+            q.enqueue("넘친 질문", "유진")
+            raise AssertionError("QueueFullError 가 나야 함")
+        except QueueFullError:
+            waited = time.monotonic() - started_at
+        assert waited >= 0.2, waited
+
+        # 자리가 나면 기다리던 enqueue 가 이어서 들어감
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(q.enqueue("기다린 질문", "유진")))
+        q.enqueue_timeout = 5
+        waiter.start()
+        time.sleep(0.1)
+        assert not result
+        q.flush_once()
+        waiter.join(timeout=5)
+        assert result == [1], result
+        print(f"✅ 백프레셔: {waited:.2f}초 대기 후 QueueFullError, 자리가 나면 대기 중이던 enqueue 진행")
+
+        # 4) close() 는 남은 건을 모두 저장
+        q.close()
+        assert len(store.inputs()) == 4 and q.stats()["pending"] == 0
+        print("✅ 종료 시 drain: 남은 1건까지 저장")
+
+        # 5) DB 가 죽은 채로 종료 -> 스풀 파일에 남았다가 재시작 시 이어서 저장
+        store = Store(workdir / "logs5.db")
+        store.down = True
+        q = make_queue(workdir / "q5", store, batch_size=100)
+        for i in range(4):
+            q.enqueue(f"재시작 질문 {i}", "법륜")
+        q.close()
+        assert q.stats()["pending"] == 4 and not store.inputs()
+
+        store.down = False
+        q = make_queue(workdir / "q5", store, batch_size=100)
+        assert q.stats()["pending"] == 4
+        q.close()
+        assert store.inputs() == [f"요약: 재시작 질문 {i}" for i in range(4)], store.inputs()
+        print("✅ 재시작 복구: 스풀에 남은 4건을 다음 실행에서 저장")
+
+        # 6) 문제 있는 한 건이 배치 전체를 막지 않음 (반씩 나눠 좁힌 뒤 dead_logs 로)
+        store = Store(workdir / "logs6.db")
+        classifier = FakeClassifier()
+        q = make_queue(workdir / "q6", store, classifier, batch_size=8, max_attempts=2)
+        texts = [f"질문 {i}" for i in range(3)] + ["독 질문"] + [f"질문 {i}" for i in range(3, 7)]
+        for text in texts:
+            q.enqueue(text, "유진")
+        assert wait_until(lambda: q.stats()["pending"] == 0)
+        assert sorted(store.inputs()) == sorted(f"요약: {t}" for t in texts if "독" not in t)
+        assert q.stats()["dead"] == 1
+        dead = q._conn.execute("SELECT user_input, attempts FROM dead_logs").fetchall()
+        assert dead == [("독 질문", 2)], dead
+        print(f"✅ 독성 배치: 분류 {len(classifier.batches)}번 만에 1건만 dead_logs 로, 나머지 7건 저장")
+
+        assert q.requeue_dead() == 1
+        assert q.stats()["pending"] == 1 and q.stats()["dead"] == 0
+        q.close()
+        print("✅ requeue_dead: dead_logs 를 다시 대기열로")
+
+        # 7) 저장은 됐는데 ack 가 실패해도 같은 log_key 로 다시 보내므로 중복 저장 없음
+        store = Store(workdir / "logs7.db")
+        q = make_queue(workdir / "q7", store, batch_size=100)
+        for i in range(3):
+            q.enqueue(f"중복 확인 {i}", "운성")
+        real_ack = q._ack
+        failures = []
+
+        def flaky_ack(ids):
+            if not failures:
+                failures.append(ids)
+                raise OSError("디스크 오류")
+            real_ack(ids)
+
+        q._ack = flaky_ack
+        q.close()
+        assert failures and store.calls >= 2
+        assert store.inputs() == [f"요약: 중복 확인 {i}" for i in range(3)], store.inputs()
+        assert q.stats()["pending"] == 0
+        print(f"✅ ack 실패 후 재전송: 저장 호출 {store.calls}번, 로그는 3건 그대로")
+
+        # 8) DB 장애(연결 오류)는 배치를 나누거나 dead_logs 로 보내지 않고, 대기 시간을 늘려 가며 재시도
+        store = Store(workdir / "logs8.db")
+        store.down = True
+        classifier = FakeClassifier()
+        q = make_queue(workdir / "q8", store, classifier, batch_size=4, max_attempts=2, max_retry_delay=0.2)
+        for i in range(4):
+            q.enqueue(f"장애 중 질문 {i}", "니체")
+        assert wait_until(lambda: store.calls >= 4)
+        delay = q._retry_delay()
+        assert delay == 0.2, delay  # 0.05 -> 0.1 -> 0.2 (최대)
+        store.down = False
+        assert wait_until(lambda: q.stats()["pending"] == 0)
+        assert {len(batch) for batch in classifier.batches} == {4}, classifier.batches
+        assert q.stats()["dead"] == 0 and len(store.inputs()) == 4
+        assert q._retry_delay() == q.retry_delay
+        q.close()
+        print(f"✅ DB 장애: 배치를 나누지 않고 {store.calls}번 만에 4건 저장, dead_logs 0건")
+
+        # 9) 장애 / 데이터 오류 구분
+        assert is_transient_error(ConnectionError("연결 거부")) and is_transient_error(TimeoutError())
+        assert not is_transient_error(ValueError("분류 불가 입력")) and not is_transient_error(KeyError("summary"))
+        try:
+            import httpx
+            import openai
+
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            assert is_transient_error(openai.APIConnectionError(request=request))
+            assert is_transient_error(openai.APITimeoutError(request=request))
+            assert not is_transient_error(
+                openai.BadRequestError("bad", response=httpx.Response(400, request=request), body=None)
+            )
+        except ImportError:
+            pass
+        print("✅ 오류 구분: 연결/타임아웃은 장애, 값 오류는 데이터 문제")
+
+    print("🎉 모든 확인 통과")
@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from news_fetcher import NewsFetcher  # noqa: E402
+
+# ---------------------------------------------------------
+# 로컬 RSS 픽스처 서버로 NewsFetcher 캐시/조건부 GET/동시 조회 확인
+# (외부 네트워크 없이 실행: python test/news_fetch_check.py)
+# ---------------------------------------------------------
+ETAG = '"fixture-v1"'
+requests_seen = []
+
+
+def make_rss(keyword):
+    items = "".join(
+        f"<item><title>{keyword} 뉴스 {i}</title>"
+        f"<pubDate>Mon, 0{i} Jan 2025 09:00:00 GMT</pubDate></item>"
+        for i in range(1, 6)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{items}</channel></rss>'
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        keyword = parse_qs(urlparse(self.path).query)["q"][0]
+        requests_seen.append((keyword, self.headers.get("If-None-Match")))
+        time.sleep(0.2)  # 업스트림 지연 흉내
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = make_rss(keyword).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main(base_url):
+    fetcher = NewsFetcher(base_url=base_url, ttl=0.5, timeout=2)
+
+    # 1. 첫 요청 -> 업스트림 200
+    first = await fetcher.get("인공지능", 2)
+    print(first)
+    assert first.startswith("[1] 인공지능 뉴스 1") and "[3]" not in first
+
+    # 2. TTL 안의 같은 요청 -> 캐시
+    start = time.perf_counter()
+    assert await fetcher.get("인공지능", 2) == first
+    print(f"⚡ 캐시 응답 {1000 * (time.perf_counter() - start):.2f} ms")
+    assert len(requests_seen) == 1
+
+    # 3. TTL 만료 후 -> 조건부 GET(304) 으로 같은 결과
+    await asyncio.sleep(0.6)
+    assert await fetcher.get("인공지능", 2) == first
+    assert requests_seen[-1] == ("인공지능", ETAG) and fetcher.not_modified == 1
+
+    # 4. 여러 키워드 동시 조회 (+ 중복 키워드는 한 번만)
+    start = time.perf_counter()
+    results = await fetcher.get_many(["취업", "가족", "건강", "취업"], 3)
+    elapsed = time.perf_counter() - start
+    print(f"📰 {len(results)}개 키워드 동시 조회 {elapsed:.2f}초 (순차라면 약 {0.2 * len(results):.1f}초)")
+    assert set(results) == {"취업", "가족", "건강"} and elapsed < 0.5
+
+    print(f"📊 {fetcher.stats()}")
+    await fetcher.aclose()
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(main(f"http://127.0.0.1:{server.server_port}/rss/search"))
+        print("✅ 모든 확인 통과")
+    finally:
+        server.shutdown()
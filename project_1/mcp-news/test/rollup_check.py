@@ -0,0 +1,147 @@
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from database import Database  # noqa: E402
+from rollup import apply_rollups, backfill_rollups, create_rollup_tables, rollups_need_backfill, split_keywords  # noqa: E402
+from schema import create_keyword_schema, insert_logs_with_keywords  # noqa: E402
+
+# ---------------------------------------------------------
+# 일별 집계 테이블이 원본 로그 GROUP BY 와 같은지 확인 (MySQL 대신 SQLite)
+# 실행: python test/rollup_check.py
+# ---------------------------------------------------------
+random.seed(0)
+MENTOS = ["유진", "운성", "법륜", "니체"]
+EMOTIONS = ["불안", "슬픔", "기쁨", "분노", "보통"]
+KEYWORDS = ["취업", "가족", "연애", "건강", "진로", "돈", "친구", "신앙", "외로움", "공부"]
+START = datetime(2025, 1, 27, 0, 0, 0)  # 주/월 경계를 걸치도록 1월 말부터
+
+
+def make_rows(count):
+    rows = []
+    for _ in range(count):
+        date = START + timedelta(days=random.randint(0, 13), seconds=random.randint(0, 86399))
+        rows.append(
+            (
+                date.strftime("%Y-%m-%d %H:%M:%S"),
+                random.choice(MENTOS),
+                "요약",
+                ", ".join(random.sample(KEYWORDS, random.randint(1, 3))),
+                random.choice(EMOTIONS),
+            )
+        )
+    return rows
+
+
+def create_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE counseling_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, date DATETIME, mento VARCHAR(50),
+            user_input TEXT, keywords VARCHAR(255), emotion VARCHAR(50)
+        )
+        """
+    )
+    create_keyword_schema(cursor, "sqlite")
+    create_rollup_tables(cursor)
+    conn.commit()
+
+
+def write_logs(conn, rows):
+    # server.write_logs 와 같은 순서: 로그 + 키워드 테이블 + 집계를 한 트랜잭션으로
+    cursor = conn.cursor()
+    insert_logs_with_keywords(cursor, rows, "sqlite")
+    apply_rollups(cursor, rows, "sqlite")
+    conn.commit()
+
+
+def fetch(conn, sql):
+    cursor = conn.cursor()
+    cursor.execute(sql)
+    return sorted(tuple(row) for row in cursor.fetchall())
+
+
+def emotion_rollup(conn):
+    return fetch(conn, "SELECT day, mento, emotion, cnt FROM daily_emotion_counts")
+
+
+def keyword_rollup(conn):
+    return fetch(conn, "SELECT day, keyword, cnt FROM daily_keyword_counts")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(backend="sqlite", pool_size=1, sqlite_path=str(Path(tmp) / "counseling.db"))
+        db.run_sync(create_tables)
+
+        # 1) 여러 배치로 저장 (같은 날/멘토/감정이 배치 안팎에서 겹치도록)
+        rows = make_rows(600)
+        for i in range(0, len(rows), 37):
+            db.run_sync(write_logs, rows[i:i + 37])
+
+        # 2) 일×멘토×감정 집계 == counseling_logs GROUP BY
+        expected_emotion = db.run_sync(
+            fetch,
+            """
+            SELECT DATE(date), mento, emotion, COUNT(*) FROM counseling_logs
+            GROUP BY DATE(date), mento, emotion
+            """,
+        )
+        assert db.run_sync(emotion_rollup) == expected_emotion
+        assert sum(row[3] for row in expected_emotion) == len(rows)
+        print(f"✅ 일×멘토×감정 집계: {len(expected_emotion)}행, GROUP BY 결과와 일치")
+
+        # 3) 일×키워드 집계 == 키워드 테이블 GROUP BY == 파이썬으로 쉼표를 나눠 센 값
+        expected_keyword = db.run_sync(
+            fetch,
+            """
+            SELECT DATE(l.date), k.keyword, COUNT(*) FROM counseling_logs l
+            JOIN counseling_log_keywords k ON k.log_id = l.id
+            GROUP BY DATE(l.date), k.keyword
+            """,
+        )
+        counted = Counter((date[:10], word) for date, _, _, keywords, _ in rows for word in split_keywords(keywords))
+        assert db.run_sync(keyword_rollup) == expected_keyword
+        assert expected_keyword == sorted((day, word, cnt) for (day, word), cnt in counted.items())
+        print(f"✅ 일×키워드 집계: {len(expected_keyword)}행, GROUP BY / 직접 센 값과 일치")
+
+        # 배치로 넣은 로그마다 키워드 행이 제 log_id 에 붙었는지 (log_key 로 id 를 찾은 결과)
+        per_log = db.run_sync(
+            fetch,
+            """
+            SELECT l.id, l.keywords, k.keyword FROM counseling_logs l
+            JOIN counseling_log_keywords k ON k.log_id = l.id
+            """,
+        )
+        assert all(word in split_keywords(keywords) for _, keywords, word in per_log)
+        assert len(per_log) == sum(len(split_keywords(row[3])) for row in rows)
+        print(f"✅ 배치 저장: 키워드 {len(per_log)}행이 모두 자기 로그 id 에 연결")
+
+        # 4) 백필: 비운 뒤 counseling_logs 전체로 다시 계산해도 같은 결과
+        before = db.run_sync(emotion_rollup), db.run_sync(keyword_rollup)
+
+        def clear_rollups(conn):
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM daily_emotion_counts")
+            cursor.execute("DELETE FROM daily_keyword_counts")
+            conn.commit()
+
+        db.run_sync(clear_rollups)
+        assert db.run_sync(rollups_need_backfill)
+        assert db.run_sync(backfill_rollups, "sqlite", 100) == len(rows)
+        assert (db.run_sync(emotion_rollup), db.run_sync(keyword_rollup)) == before
+        assert not db.run_sync(rollups_need_backfill)
+
+        # 여러 번 돌려도 두 배로 쌓이지 않음
+        db.run_sync(backfill_rollups, "sqlite")
+        assert (db.run_sync(emotion_rollup), db.run_sync(keyword_rollup)) == before
+        print("✅ 백필: 재계산 결과 동일, 반복 실행해도 중복 집계 없음")
+
+    print("🎉 모든 확인 통과")
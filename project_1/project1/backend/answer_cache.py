@@ -0,0 +1,235 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# ==========================================
+# 대화 기록 해시
+# ==========================================
+def hash_history(history: List[dict]) -> str:
+    """최근 대화 기록(role, content)을 하나의 해시 문자열로 요약"""
+    payload = json.dumps(
+        [(msg.get("role"), msg.get("content")) for msg in history],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ==========================================
+# 의미 기반 답변 캐시
+# ==========================================
+class SemanticAnswerCache:
+    """
+    (멘토, 질문 임베딩, 최근 대화 해시) 를 키로 하는 영속 답변 캐시.
+
+    - 같은 멘토 + 같은 대화 맥락 안에서 질문 임베딩의 코사인 유사도가
+      similarity_threshold 이상이면 저장된 답변을 그대로 돌려줍니다.
+    - ttl_seconds 가 지난 항목은 조회 시 만료 처리됩니다.
+    - max_entries 를 넘으면 가장 오래 사용되지 않은 항목(LRU)부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: int = 60 * 60 * 24,
+        max_entries: int = 2000,
+    ):
+        self.db_path = Path(db_path)
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # entry_id -> dict (LRU 순서 유지: 뒤쪽일수록 최근 사용)
+        self._entries: "OrderedDict[int, dict]" = OrderedDict()
+        # (target, history_hash) -> (entry_ids, 정규화된 임베딩 행렬)
+        self._buckets: Dict[Tuple[str, str], Tuple[List[int], np.ndarray]] = {}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answer_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                history_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                answer TEXT NOT NULL,
+                payload TEXT,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._load()
+
+    # ---------------------------------------------------------
+    # 내부 유틸
+    # ---------------------------------------------------------
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _load(self):
+        """디스크에 저장된 캐시를 메모리로 올림 (만료 항목은 정리)"""
+        now = time.time()
+        self._conn.execute(
+            "DELETE FROM answer_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT id, target, history_hash, embedding, answer, payload, created_at "
+            "FROM answer_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for entry_id, target, history_hash, blob, answer, payload, created_at in rows:
+            self._entries[entry_id] = {
+                "target": target,
+                "history_hash": history_hash,
+                "embedding": np.frombuffer(blob, dtype=np.float32),
+                "answer": answer,
+                "payload": json.loads(payload) if payload else None,
+                "created_at": created_at,
+            }
+        self._evict_overflow()
+
+    def _bucket(self, target: str, history_hash: str):
+        key = (target, history_hash)
+        if key not in self._buckets:
+            ids = [
+                entry_id
+                for entry_id, entry in self._entries.items()
+                if entry["target"] == target and entry["history_hash"] == history_hash
+            ]
+            matrix = (
+                np.vstack([self._entries[i]["embedding"] for i in ids])
+                if ids
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            self._buckets[key] = (ids, matrix)
+        return self._buckets[key]
+
+    def _remove(self, entry_ids: List[int]):
+        if not entry_ids:
+            return
+        for entry_id in entry_ids:
+            entry = self._entries.pop(entry_id, None)
+            if entry:
+                self._buckets.pop((entry["target"], entry["history_hash"]), None)
+        self._conn.executemany(
+            "DELETE FROM answer_cache WHERE id = ?", [(i,) for i in entry_ids]
+        )
+        self._conn.commit()
+
+    def _evict_overflow(self):
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            # OrderedDict 앞쪽이 가장 오래 사용되지 않은 항목
+            self._remove(list(self._entries.keys())[:overflow])
+
+    # ---------------------------------------------------------
+    # 공개 API
+    # ---------------------------------------------------------
+    def lookup(
+        self, target: str, embedding, history_hash: str
+    ) -> Optional[Tuple[str, Optional[dict]]]:
+        """유사한 질문이 있으면 (answer, payload), 없으면 None"""
+        query = self._normalize(embedding)
+        now = time.time()
+
+        with self._lock:
+            ids, matrix = self._bucket(target, history_hash)
+            if not ids:
+                self.misses += 1
+                return None
+
+            scores = matrix @ query
+            for idx in np.argsort(-scores):
+                if scores[idx] < self.similarity_threshold:
+                    break
+                entry_id = ids[idx]
+                entry = self._entries[entry_id]
+                if now - entry["created_at"] > self.ttl_seconds:
+                    continue
+
+                self._entries.move_to_end(entry_id)
+                self._conn.execute(
+                    "UPDATE answer_cache SET last_access = ? WHERE id = ?",
+                    (now, entry_id),
+                )
+                self._conn.commit()
+                self.hits += 1
+                return entry["answer"], entry["payload"]
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        target: str,
+        embedding,
+        history_hash: str,
+        answer: str,
+        payload: Optional[dict] = None,
+    ):
+        """새 답변 저장 (용량 초과 시 LRU 제거)"""
+        vec = self._normalize(embedding)
+        now = time.time()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO answer_cache "
+                "(target, history_hash, embedding, answer, payload, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    target,
+                    history_hash,
+                    vec.tobytes(),
+                    answer,
+                    json.dumps(payload, ensure_ascii=False) if payload else None,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+
+            self._entries[cursor.lastrowid] = {
+                "target": target,
+                "history_hash": history_hash,
+                "embedding": vec,
+                "answer": answer,
+                "payload": payload,
+                "created_at": now,
+            }
+            self._buckets.pop((target, history_hash), None)
+            self._evict_overflow()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._conn.execute("DELETE FROM answer_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
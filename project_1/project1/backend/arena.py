@@ -0,0 +1,118 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple
+
+from backend.streaming import StreamingAnswer
+from utils.tokens import count_tokens
+
+
+# ==========================================
+# 토론 문맥 (증분 + 토큰 예산)
+# ==========================================
+class DialogueContext:
+    """
+    "화자: 내용" 줄을 발언마다 한 줄씩 덧붙이고,
+    전체 토큰 수가 max_tokens 를 넘으면 가장 오래된 발언부터 버립니다.
+    매 턴 전체 기록을 다시 이어 붙이거나 다시 세지 않습니다.
+    """
+
+    def __init__(self, max_tokens: int = 1500):
+        self.max_tokens = max_tokens
+        self._lines = deque()  # (줄, 토큰 수)
+        self._total = 0
+
+    def append(self, speaker: str, content: str):
+        line = f"{speaker}: {content}"
+        tokens = count_tokens(line)
+        self._lines.append((line, tokens))
+        self._total += tokens
+
+        # 가장 최근 발언 하나는 예산을 넘어도 남김
+        while self._total > self.max_tokens and len(self._lines) > 1:
+            _, dropped = self._lines.popleft()
+            self._total -= dropped
+
+    def render(self) -> str:
+        return "\n".join(line for line, _ in self._lines) + "\n" if self._lines else ""
+
+    @property
+    def token_count(self) -> int:
+        return self._total
+
+
+# ==========================================
+# 토론 진행 엔진
+# ==========================================
+class ArenaEngine:
+    """
+    두 멘토의 토론을 진행합니다.
+
+    - 엔진을 만들자마자 양쪽 멘토의 주제 검색 + 재순위화(임베딩, 질의 재작성 LLM 포함)를 동시에 시작.
+      두 번째 화자의 주제 검색은 첫 발언이 생성되는 동안 끝남
+    - 이후 발언은 주제 문서에 상대의 직전 발언으로 찾은 BM25 문서를 더해서 사용.
+      BM25 는 메모리 색인 조회라 임베딩/LLM 호출이 없으므로 상대 발언이 끝난 뒤 바로 다음 생성을 시작
+    - 대화 문맥은 DialogueContext 로 증분 관리
+    - turns() 가 끝나거나 중간에 멈추면 close() 로 스레드 풀 정리
+
+    사용 예:
+        engine = ArenaEngine(left_service, right_service, topic)
+        for side, answer in engine.turns(rounds):
+            text = st.write_stream(answer)
+    """
+
+    def __init__(self, left_service, right_service, topic: str, max_context_tokens: int = 1500):
+        self.services = {"left": left_service, "right": right_service}
+        self.topic = topic
+        self.context = DialogueContext(max_context_tokens)
+
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        # 같은 멘토끼리 붙으면 검색도 한 번만
+        prefetched = {}
+        self._topic_docs = {}
+        for side, service in self.services.items():
+            if service.target not in prefetched:
+                prefetched[service.target] = self._pool.submit(service.prepare_arena_docs, topic)
+            self._topic_docs[side] = prefetched[service.target]
+
+    def _docs_for(self, side: str, last_message: str, rebuttal: bool) -> List:
+        """주제 문서 + (반박 턴이면) 상대 발언으로 찾은 BM25 문서, 중복 없이"""
+        docs = self._topic_docs[side].result()
+        if not rebuttal:
+            return docs
+
+        merged = {}
+        for doc in docs + self.services[side].rebuttal_docs(last_message):
+            merged.setdefault(doc.page_content, doc)
+        return list(merged.values())
+
+    def _speak(self, side: str, last_message: str, rebuttal: bool = True) -> StreamingAnswer:
+        service = self.services[side]
+        return service.stream_talk_arena(
+            topic_or_last_message=last_message,
+            full_dialogue_context=self.context.render(),
+            refined_docs=self._docs_for(side, last_message, rebuttal),
+        )
+
+    def turns(self, rounds: int) -> Iterator[Tuple[str, StreamingAnswer]]:
+        """
+        좌측 선공 1번 + (우측, 좌측) x rounds 를 순서대로 yield.
+        호출 측이 답변 스트림을 다 소비하면 그 텍스트가 문맥에 추가되고 다음 발언이 시작됩니다.
+        """
+        order: List[str] = ["left"] + ["right", "left"] * rounds
+        last_message = self.topic
+
+        try:
+            for i, side in enumerate(order):
+                answer = self._speak(side, last_message, rebuttal=i > 0)
+                yield side, answer
+
+                # 화면에서 끝까지 안 읽었더라도 나머지를 받아서 문맥에 반영
+                text = answer.collect()
+                self.context.append(self.services[side].author_name, text)
+                last_message = text
+        finally:
+            self.close()
+
+    def close(self):
+        """아직 시작 안 한 주제 검색은 취소하고 스레드 풀 종료"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,6 @@
 import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Optional
@@ -9,9 +11,16 @@ from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from dotenv import load_dotenv
 
 # 사용자 정의 모듈 (가정)
-from backend.mcp_service import mcp_save_log
+from backend.answer_cache import SemanticAnswerCache, hash_history
+from backend.mcp_service import save_log_in_background
+from backend.memory import HISTORY_TOKEN_BUDGET, ConversationMemory, pack_recent
+from backend.reranker import build_reranker
+from backend.streaming import StreamingAnswer, stream_completion
 from enums.target import TARGET_CONFIG, AnswerTarget, SermonState
-from utils.util import parse_list
+from utils.bible_refs import BibleReferenceIndex, bible_refs_path, mentions_reference, reference_keys
+from utils.bm25 import load_bm25_index, reciprocal_rank_fusion
+from utils.embedding_cache import CachedEmbeddings
+from utils.query_rewrite_cache import QueryRewriteCache
 
 # --- 환경 설정 ---
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -20,14 +29,40 @@ load_dotenv(CONFIG_PATH)
 
 # --- 전역 설정 (싱글톤처럼 사용) ---
 # 임베딩 모델은 메모리에 한 번만 로드하는 것이 좋습니다.
-EMBEDDINGS = OpenAIEmbeddings(model="text-embedding-3-small")
+# 같은 문장(반복 질문, 번역문 등)은 디스크 캐시에서 바로 꺼내 씁니다.
+EMBEDDINGS = CachedEmbeddings(
+    OpenAIEmbeddings(model="text-embedding-3-small"),
+    model_name="text-embedding-3-small",
+    db_path=BASE_DIR / "cache" / "embeddings.db",
+)
 DB_PATH = "chroma_vector_db"
+RERANKER_MODE = os.getenv("RERANKER", "embedding")
+
+# 반복/유사 질문은 LLM 호출 없이 바로 답하도록 의미 기반 캐시를 둡니다.
+ANSWER_CACHE = SemanticAnswerCache(
+    BASE_DIR / "cache" / "answer_cache.db",
+    similarity_threshold=0.95,
+    ttl_seconds=60 * 60 * 24,
+    max_entries=2000,
+)
+
+# 검색용 질의 재작성 / 번역(temperature=0) 결과 캐시
+REWRITE_CACHE = QueryRewriteCache(BASE_DIR / "cache" / "query_rewrites.db")
+
+# 성경 장절 색인 ("창1:1" 같은 정확한 인용은 벡터 검색 없이 사전 조회, db/process_bible.py 에서 생성)
+BIBLE_REFS = BibleReferenceIndex.load(bible_refs_path(DB_PATH))
 
 
 # ==========================================
 # [부모 클래스] 기본 채팅 서비스
 # ==========================================
 class BaseChatService(ABC):
+    # 여러 멘토 공통 검색(retrieve_for_all)에서 쓰는 값
+    search_language = "ko"  # 컬렉션 문서의 언어 (같은 언어끼리 임베딩 1번 공유)
+    search_k = 3
+    collection_name: Optional[str] = None  # BM25 인덱스 파일 이름 (db/ingest.py 에서 생성)
+    rerank_threshold = 0.3  # 재순위화 최고 점수가 이보다 낮으면 관련 문서 없음으로 봄 (컬렉션마다 분포가 다름)
+
     def __init__(self, target: AnswerTarget):
         self.target = target
         self.config = TARGET_CONFIG[target]
@@ -40,6 +75,19 @@ class BaseChatService(ABC):
         # VectorStore 설정 (자식에서 구체화)
         self.vectorstore = self._load_vectorstore()
         self.meta_key = self._get_meta_key()
+        # 적재 때 함께 만든 BM25 인덱스 (없으면 벡터 검색만)
+        self.sparse_index = (
+            load_bm25_index(DB_PATH, self.collection_name) if self.collection_name else None
+        )
+
+        # 재순위화기 (기본: 로컬 임베딩 유사도, RERANKER=llm 이면 기존 LLM 방식)
+        self.reranker = build_reranker(
+            RERANKER_MODE,
+            llm=self.simple_llm,
+            embeddings=EMBEDDINGS,
+            vectorstore=self.vectorstore,
+            score_threshold=self.rerank_threshold,
+        )
 
     @abstractmethod
     def _load_vectorstore(self) -> Chroma:
@@ -63,45 +111,56 @@ class BaseChatService(ABC):
 
         print("_retrieve_documents")
         # 기본은 필터 없이 전체 검색
-        docs_all = self.vectorstore.similarity_search(user_input, k=3)
+        docs_all = self._hybrid_search(user_input, k=3)
         return [], docs_all
 
-    def _refine_documents(self, user_input: str, docs_candidates: List) -> List:
-        """LLM을 이용해 문서 재순위화 (공통 로직)"""
-
-        print("_refine_documents")
-
-        if not docs_candidates:
+    def _sparse_search(self, query: str, k: int) -> List:
+        if self.sparse_index is None:
             return []
+        return [doc for doc, _ in self.sparse_index.search(query, k)]
 
-        # 중복 제거
-        unique_docs = {doc.page_content: doc for doc in docs_candidates}.values()
-
-        context_text = "\n\n".join(
-            [f"[{i+1}] {d.page_content[:500]}..." for i, d in enumerate(unique_docs)]
-        )
+    def _hybrid_search(self, query: str, k: int, query_vector=None) -> List:
+        """
+        BM25 + 벡터 검색을 RRF(Reciprocal Rank Fusion)로 합친 결과.
+        장절 표기(창1:1 등)가 있는 질의는 BM25 결과에 그 장절(범위 포함)이 실제로 들어 있을 때만
+        BM25 결과로 답하고 임베딩을 부르지 않음. 못 찾았으면 벡터 검색과 합침.
+        query_vector 를 주면 그 벡터로 벡터 검색 (retrieve_for_all 의 공유 임베딩)
+        """
+        sparse_docs = self._sparse_search(query, k)
+        references = reference_keys(query)
+        if references and any(mentions_reference(doc, references) for doc in sparse_docs):
+            print(f"🔤 장절 질의, BM25 결과만 사용: {query}")
+            return sparse_docs
+
+        if query_vector is None:
+            dense_docs = self.vectorstore.similarity_search(query, k=k)
+        else:
+            dense_docs = self.vectorstore.similarity_search_by_vector(query_vector, k=k)
+        if not sparse_docs:
+            return dense_docs
+        return reciprocal_rank_fusion([dense_docs, sparse_docs])[:k]
 
-        prompt = f"""
-        당신은 데이터 전문가입니다. 질문에 답하는 데 정말로 도움이 되는 문서 번호만 골라주세요.
-        질문: {user_input}
-        후보 문서:
-        {context_text}
-        응답 형식: 번호만 쉼표로 구분 (예: 1, 3). 없으면 'None'.
+    async def _aretrieve_documents(self, user_input: str) -> Tuple[List, List]:
         """
+        비동기 검색. 기본은 동기 검색을 스레드로 넘기기만 하고,
+        독립적인 검색이 여러 개인 자식 클래스는 오버라이딩하여 동시에 실행.
+        """
+        return await asyncio.to_thread(self._retrieve_documents, user_input)
 
-        try:
-            selected_indices = self.simple_llm.invoke(prompt).content.strip()
-            if "None" in selected_indices or not selected_indices:
-                return list(unique_docs)[:2]
+    def _search_query(self, text: str) -> str:
+        """컬렉션 언어에 맞춘 검색 문장 (번역이 필요한 자식 클래스에서 오버라이딩)"""
+        return text
 
-            indices = [int(i.strip()) - 1 for i in selected_indices.split(",")]
-            refined = [
-                list(unique_docs)[idx] for idx in indices if 0 <= idx < len(unique_docs)
-            ]
-            return refined if refined else list(unique_docs)[:2]
-        except Exception as e:
-            print(f"Refine Error: {e}")
-            return list(unique_docs)[:2]
+    def _retrieve_by_vector(self, text: str, query_vector) -> Tuple[List, List]:
+        """미리 계산한 질의 벡터로 검색 (여러 멘토가 같은 텍스트를 검색할 때 임베딩 공유)"""
+        return [], self._hybrid_search(self._search_query(text), self.search_k, query_vector)
+
+    def _refine_documents(self, user_input: str, docs_candidates: List) -> List:
+        """문서 재순위화 (공통 로직, 실제 채점은 self.reranker 에 위임)"""
+
+        print("_refine_documents")
+        # 검색과 같은 언어의 문장으로 채점 (니체는 번역문, 검색 때 이미 번역해서 캐시에 있음)
+        return self.reranker.rerank(self._search_query(user_input), docs_candidates)
 
     def _format_source(self, docs) -> str:
         """출처 포맷팅 (자식에서 커스텀 가능)"""
@@ -110,21 +169,70 @@ class BaseChatService(ABC):
         return f"📖 {self.author_name} 인용: {', '.join(unique_sources)}"
 
 
+    def get_memory(self, session_key: str) -> ConversationMemory:
+        """페이지 세션 키(예: messages_김유진)별 대화 메모리 (st.session_state 에 보관)"""
+        memory_key = f"{session_key}_memory"
+        if memory_key not in st.session_state:
+            st.session_state[memory_key] = ConversationMemory(llm=self.simple_llm)
+        return st.session_state[memory_key]
+
     def get_response(
-        self, user_input: str, chat_history: list
+        self, user_input: str, chat_history: list, session_key: Optional[str] = None
+    ) -> Tuple[str, Tuple[SermonState, str]]:
+        """동기 호출용 진입점 (내부는 비동기 파이프라인 실행)"""
+        memory = self.get_memory(session_key) if session_key else None
+        return asyncio.run(self.aget_response(user_input, chat_history, memory))
+
+    def stream_response(
+        self, user_input: str, chat_history: list, session_key: Optional[str] = None
+    ) -> StreamingAnswer:
+        """
+        스트리밍 진입점. 검색/정제까지 마친 뒤 모델 토큰을 그대로 흘려보내는
+        StreamingAnswer 를 반환 (출처 정보는 스트림이 끝난 뒤 source_info 로 확인).
+        session_key 를 주면 해당 세션의 대화 메모리(최근 대화 + 누적 요약)를 사용.
+        """
+        memory = self.get_memory(session_key) if session_key else None
+        return asyncio.run(self._aprepare_response(user_input, chat_history, memory))
+
+    async def aget_response(
+        self, user_input: str, chat_history: list, memory: Optional[ConversationMemory] = None
     ) -> Tuple[str, Tuple[SermonState, str]]:
+        answer = await self._aprepare_response(user_input, chat_history, memory)
+        text = await asyncio.to_thread(answer.collect)
+        return text, answer.source_info
+
+    async def _aprepare_response(
+        self, user_input: str, chat_history: list, memory: Optional[ConversationMemory] = None
+    ) -> StreamingAnswer:
+        """
+        비동기 실행 모드.
+        - MCP 로그 저장은 백그라운드로 던져두고(fire-and-forget) 기다리지 않습니다.
+        - 서로 독립적인 검색 단계는 _aretrieve_documents 에서 동시에 실행됩니다.
+        """
         print(f"[{self.author_name}] get_response 시작")
 
-        print(f"[{self.author_name}] 사용자 고민 저장")
-        result_message = asyncio.run(mcp_save_log(user_input, self.author_name))
-        print(result_message)
+        print(f"[{self.author_name}] 사용자 고민 저장 (백그라운드)")
+        save_log_in_background(user_input, self.author_name)
+
+        # 0. 의미 캐시 조회 (같은 멘토 + 같은 대화 맥락의 유사 질문)
+        query_embedding = await asyncio.to_thread(EMBEDDINGS.embed_query, user_input)
+        history_hash = hash_history(self._recent_history(user_input, chat_history))
+        cached = ANSWER_CACHE.lookup(self.author_name, query_embedding, history_hash)
+        if cached:
+            answer, payload = cached
+            print(f"[{self.author_name}] 캐시 적중 {ANSWER_CACHE.stats()}")
+            return StreamingAnswer.from_text(
+                answer, (SermonState[payload["state"]], payload["source"])
+            )
 
         # 1. 문서 검색 (자식 클래스 로직에 따라 다름)
-        docs_llm, docs_all = self._retrieve_documents(user_input)
-        
+        docs_llm, docs_all = await self._aretrieve_documents(user_input)
+
         # 2. 문서 정제 (Reranking)
         all_candidates = docs_llm + docs_all
-        refined_docs = self._refine_documents(user_input, all_candidates)
+        refined_docs = await asyncio.to_thread(
+            self._refine_documents, user_input, all_candidates
+        )
 
         # 3. 프롬프트 구성
         if refined_docs:
@@ -144,38 +252,82 @@ class BaseChatService(ABC):
                 "관련 문헌을 찾지 못했습니다. 당신의 평소 통찰력에 의존해 답변하세요."
             )
 
-        # 4. LLM 호출
-        formatted_history = [
-            {"role": msg["role"], "content": msg["content"]}
-            for msg in chat_history[-6:]
-        ]
+        # 4. LLM 호출 (이전 대화는 토큰 예산 안에서만, 오래된 대화는 메모리 요약으로)
+        prior_history = self._prior_history(user_input, chat_history)
+        if memory is not None:
+            formatted_history = memory.build_messages(prior_history)
+        else:
+            formatted_history = pack_recent(prior_history, HISTORY_TOKEN_BUDGET)
 
         system_message = {
             "role": "system",
             "content": f"{self.config['system_prompt']}\n\n[RAG 지침]\n{rag_prompt}",
         }
 
-        response = self.main_llm.chat.completions.create(
+        tokens = stream_completion(
+            self.main_llm,
             model="gpt-4o",
             messages=[system_message]
             + formatted_history
             + [{"role": "user", "content": user_input}],
             temperature=0.7,
         )
-        
 
-        return response.choices[0].message.content, source_info
+        def save_to_cache(answer: str):
+            ANSWER_CACHE.put(
+                self.author_name,
+                query_embedding,
+                history_hash,
+                answer,
+                {"state": source_info[0].name, "source": source_info[1]},
+            )
+            # 다음 턴 전에 예산 밖으로 밀려날 대화를 미리 요약해 둠
+            if memory is not None:
+                memory.refresh(
+                    prior_history
+                    + [{"role": "user", "content": user_input}, {"role": "assistant", "content": answer}]
+                )
+
+        return StreamingAnswer(tokens, source_info, on_complete=save_to_cache)
+
+    def _prior_history(self, user_input: str, chat_history: list) -> list:
+        """현재 질문 이전의 대화 (페이지가 미리 붙여둔 현재 질문은 제외)"""
+        history = list(chat_history)
+        if history and history[-1].get("role") == "user" and history[-1].get("content") == user_input:
+            history = history[:-1]
+        return history
+
+    def _recent_history(self, user_input: str, chat_history: list) -> list:
+        """캐시 키용 최근 대화"""
+        return self._prior_history(user_input, chat_history)[-6:]
     
     def talk_arena(self, topic_or_last_message: str, full_dialogue_context: str) -> str:
         """
         아레나 토론 전용 함수
         """
+        return self.stream_talk_arena(topic_or_last_message, full_dialogue_context).collect()
+
+    def prepare_arena_docs(self, topic: str) -> List:
+        """토론 주제로 검색 + 재순위화 (ArenaEngine 이 토론 시작 시 미리 실행해 두고 재사용)"""
+        docs_llm, docs_all = self._retrieve_documents(topic)
+        return self._refine_documents(topic, docs_llm + docs_all)
+
+    def rebuttal_docs(self, message: str, k: int = 2) -> List:
+        """
+        상대 발언으로 찾은 보강 문서 (ArenaEngine 반박 턴용).
+        BM25 색인 조회만 하므로 임베딩/LLM 호출이 없음 (색인이 없거나 겹치는 단어가 없으면 빈 목록)
+        """
+        return self._sparse_search(message, k)
+
+    def stream_talk_arena(
+        self, topic_or_last_message: str, full_dialogue_context: str, refined_docs=None
+    ) -> StreamingAnswer:
+        """아레나 토론 스트리밍 버전 (refined_docs 를 주면 검색/정제 생략)"""
         # ---------------------------------------------------------
         # 1. 문서 검색 (Retrieval) & 2. 정제 (Refine) - 기존과 동일
         # ---------------------------------------------------------
-        docs_llm, docs_all = self._retrieve_documents(topic_or_last_message)
-        all_candidates = docs_llm + docs_all
-        refined_docs = self._refine_documents(topic_or_last_message, all_candidates)
+        if refined_docs is None:
+            refined_docs = self.prepare_arena_docs(topic_or_last_message)
     
         # ---------------------------------------------------------
         # 3. 프롬프트 구성 (아레나 전용)
@@ -186,6 +338,7 @@ class BaseChatService(ABC):
     
         if refined_docs:
             context_text = "\n\n".join([doc.page_content for doc in refined_docs])
+            source_info = (SermonState.FOUND, self._format_source(refined_docs))
             rag_instruction = (
                 f"당신은 치열한 사상 검증 토론(Arena) 중입니다.\n"
                 f"아래 지식 베이스를 근거로 상대방을 반박하거나 주장을 펼치세요.\n"
@@ -193,6 +346,7 @@ class BaseChatService(ABC):
                 f"지침: {self.author_name}의 관점을 날카롭게 드러내되, {length_constraint}"
             )
         else:
+            source_info = (SermonState.NOT_FOUND, "")
             rag_instruction = (
                 f"관련 문헌이 없습니다. 당신({self.author_name})의 평소 철학으로 논리에 맞서세요.\n"
                 f"지침: {length_constraint}"
@@ -229,7 +383,8 @@ class BaseChatService(ABC):
             "content": user_prompt
         }
     
-        response = self.main_llm.chat.completions.create(
+        tokens = stream_completion(
+            self.main_llm,
             model="gpt-4o",
             messages=[system_message, user_message_payload],
             temperature=0.8,
@@ -237,10 +392,15 @@ class BaseChatService(ABC):
             # max_tokens=300, # 필요하다면 강제 절삭 (문장이 잘릴 수 있어 프롬프트 제어를 추천)
         )
     
-        return response.choices[0].message.content
+        return StreamingAnswer(tokens, source_info)
     
-    def review_news(self, news_text, keyword) :
-        docs_llm, docs_all = self._retrieve_documents(news_text)        
+    def review_news(self, news_text, keyword, retrieved=None) :
+        answer = self.stream_review_news(news_text, keyword, retrieved)
+        return answer.collect(), answer.source_info
+
+    def stream_review_news(self, news_text, keyword, retrieved=None) -> StreamingAnswer:
+        # retrieved: retrieve_for_all 로 미리 검색해 둔 (docs_llm, docs_all)
+        docs_llm, docs_all = retrieved or self._retrieve_documents(news_text)
         all_candidates = docs_llm + docs_all
         refined_docs = self._refine_documents(news_text, all_candidates)
 
@@ -274,17 +434,22 @@ class BaseChatService(ABC):
             "content": f"{self.config['system_prompt']}\n\n[RAG 지침]\n{rag_prompt}",
         }
 
-        response = self.main_llm.chat.completions.create(
+        tokens = stream_completion(
+            self.main_llm,
             model="gpt-4o",
             messages=[system_message]
             + [{"role": "user", "content": f"해당 키워드에 대한 뉴스를 검색했습니다. {keyword} 당신의 역할과 기반지식대로 리뷰해주세요"}],
             temperature=0.7,
         )
 
-        return response.choices[0].message.content, source_info
+        return StreamingAnswer(tokens, source_info)
     
-    def analysis_data(self, data) :
-        docs_llm, docs_all = self._retrieve_documents(data)        
+    def analysis_data(self, data, retrieved=None) :
+        answer = self.stream_analysis_data(data, retrieved)
+        return answer.collect(), answer.source_info
+
+    def stream_analysis_data(self, data, retrieved=None) -> StreamingAnswer:
+        docs_llm, docs_all = retrieved or self._retrieve_documents(data)
         all_candidates = docs_llm + docs_all
         refined_docs = self._refine_documents(data, all_candidates)
     
@@ -316,14 +481,15 @@ class BaseChatService(ABC):
             "content": f"{self.config['system_prompt']}\n\n[RAG 지침]\n{rag_prompt}",
         }
         
-        response = self.main_llm.chat.completions.create(
+        tokens = stream_completion(
+            self.main_llm,
             model="gpt-4o",
             messages=[system_message]
             + [{"role": "user", "content": f"당신은 우리 웹사이트에 대한 자료를 받았습니다. {data} 당신의 역할과 기반지식대로 리뷰해주세요. 살짝 더 친절하게 위로하는 말로 말해주세요. 100자 이내로 작성해주세요",}],
             temperature=0.7,
         )
 
-        return response.choices[0].message.content, source_info
+        return StreamingAnswer(tokens, source_info)
     
 
 # ==========================================
@@ -344,8 +510,11 @@ class PastorService(BaseChatService):
     def _get_meta_key(self) -> str:
         return "title"  # 설교 제목 키
 
-    def _query_to_vector_search(self, question: str) -> list[str]:
-        """목회자 특화 기능: 질문에서 성경 구절 추출"""
+    def _query_to_vector_search(self, question: str) -> str:
+        """목회자 특화 기능: 질문을 검색용 한 문장으로 재작성 (결과는 REWRITE_CACHE 에 저장)"""
+        return REWRITE_CACHE.rewrite("pastor_search_v1", question, self._rewrite_query)
+
+    def _rewrite_query(self, question: str) -> str:
         prompt = f"""
         너는 성경 말씀을 벡터 데이터베이스에서 검색하기 위한
         "의미 기반 검색 문장"을 만드는 역할이다.
@@ -368,20 +537,65 @@ class PastorService(BaseChatService):
         result = self.simple_llm.invoke(prompt).content
         return result
 
+    def _lookup_verses(self, text: str) -> List:
+        """질문에 정확한 장절이 있으면 그 본문 (사전 조회, 질의 재작성/벡터 검색 없음)"""
+        verse_docs = BIBLE_REFS.lookup(text)
+        if verse_docs:
+            print(f"📇 장절 직접 조회: {', '.join(doc.metadata['reference'] for doc in verse_docs)}")
+        return verse_docs
+
     def _retrieve_documents(self, user_input: str) -> Tuple[List, List]:
-        # 1. 성경 구절 추출
-        query_to_vector_search = self._query_to_vector_search(user_input)
+        verse_docs = self._lookup_verses(user_input)
+        if verse_docs:
+            return verse_docs, self._hybrid_search(user_input, k=3)
+
+        # 질의 재작성(LLM, 캐시)과 원문 검색은 서로 독립적이므로 동시에 실행
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            rewrite_future = pool.submit(self._query_to_vector_search, user_input)
+            docs_all = self._hybrid_search(user_input, k=3)
+            query_to_vector_search = rewrite_future.result()
 
-        # print(f"query_to_vector_search {query_to_vector_search}")
+        # 재작성한 검색 문장이 있으면 그 문장으로 한 번 더 검색
         docs_llm = []
-        # 만약 참조한 성경이 검색이 된다면
         if query_to_vector_search:
-            # print(f"🔍 성경 필터 적용: {query_to_vector_search}")
-            docs_llm = self.vectorstore.similarity_search(user_input, k=3)
+            docs_llm = self._hybrid_search(query_to_vector_search, k=3)
 
-        docs_all = self.vectorstore.similarity_search(user_input, k=3)
-        # print(docs_llm)
-        
+        return docs_llm, docs_all
+
+    async def _aretrieve_documents(self, user_input: str) -> Tuple[List, List]:
+        verse_docs = self._lookup_verses(user_input)
+        if verse_docs:
+            return verse_docs, await asyncio.to_thread(self._hybrid_search, user_input, 3)
+
+        # 질의 재작성과 원문 검색을 동시에, 재작성이 끝나면 바로 재작성 문장으로 검색
+        async def search_rewritten():
+            query = await asyncio.to_thread(self._query_to_vector_search, user_input)
+            if not query:
+                return []
+            return await asyncio.to_thread(self._hybrid_search, query, 3)
+
+        docs_llm, docs_all = await asyncio.gather(
+            search_rewritten(),
+            asyncio.to_thread(self._hybrid_search, user_input, 3),
+        )
+        return docs_llm, docs_all
+
+    def _retrieve_by_vector(self, text: str, query_vector) -> Tuple[List, List]:
+        # 원문 검색은 공유 벡터로 (장절 인용이면 사전 조회)
+        verse_docs = self._lookup_verses(text)
+        if verse_docs:
+            return verse_docs, self._hybrid_search(text, 3, query_vector)
+
+        # 질의 재작성(LLM, 캐시)은 원문 검색과 동시에.
+        # 두 목회자가 같이 검색해도 재작성/재작성 문장 임베딩은 캐시에서 진행 중인 것을 공유해서 1번
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            rewrite_future = pool.submit(self._query_to_vector_search, text)
+            docs_all = self._hybrid_search(text, 3, query_vector)
+            query_to_vector_search = rewrite_future.result()
+
+        docs_llm = []
+        if query_to_vector_search:
+            docs_llm = self._hybrid_search(query_to_vector_search, k=3)
         return docs_llm, docs_all
 
     def _format_source(self, docs) -> str:
@@ -395,18 +609,26 @@ class PastorService(BaseChatService):
 # [자식 클래스 2] 니체 서비스 (철학적 접근)
 # ==========================================
 class NietzscheService(BaseChatService):
+    search_language = "en"
+    search_k = 4
+    collection_name = "nietzsche_works"
+    rerank_threshold = 0.2  # 고민 상담 질문과 아포리즘 원문은 같은 언어여도 유사도가 낮게 나옴
+
     def _load_vectorstore(self) -> Chroma:
         return Chroma(
             persist_directory=DB_PATH,
             embedding_function=EMBEDDINGS,
-            collection_name="nietzsche_works",
+            collection_name=self.collection_name,
         )
 
     def _get_meta_key(self) -> str:
         return "chapter_title"  # 니체 저서 인용 키
 
     def _translate_to_english(self, question: str) -> str:
-        """목회자 특화 기능: 질문에서 성경 구절 추출"""
+        """질문을 영어로 번역 (결과는 REWRITE_CACHE 에 저장)"""
+        return REWRITE_CACHE.rewrite("nietzsche_en_v1", question, self._translate)
+
+    def _translate(self, question: str) -> str:
         prompt = f"""
         영문으로 번역하고 번역한 문장만 출력해줘
         질문: {question}
@@ -419,9 +641,11 @@ class NietzscheService(BaseChatService):
         # (필요하다면 여기서 철학 용어 필터링 등을 추가 가능)
         user_input = self._translate_to_english(user_input)
         print(user_input)
-        return [], self.vectorstore.similarity_search(
-            user_input, k=4
-        )  # k를 조금 늘림
+        return [], self._hybrid_search(user_input, k=4)  # k를 조금 늘림
+
+    def _search_query(self, text: str) -> str:
+        # 영문 저서 컬렉션이므로 번역문으로 검색
+        return self._translate_to_english(text)
 
     def _format_source(self, docs) -> str:
         sources = [doc.metadata.get(self.meta_key, "출처 미상") for doc in docs]
@@ -432,11 +656,14 @@ class NietzscheService(BaseChatService):
 # [자식 클래스 3] 법륜 서비스 (불교적 접근)
 # ==========================================
 class BubryuneService(BaseChatService):
+    search_k = 4
+    collection_name = "bubryune_works"
+
     def _load_vectorstore(self) -> Chroma:
         return Chroma(
             persist_directory=DB_PATH,
             embedding_function=EMBEDDINGS,
-            collection_name="bubryune_works",
+            collection_name=self.collection_name,
         )
 
     def _get_meta_key(self) -> str:
@@ -446,9 +673,7 @@ class BubryuneService(BaseChatService):
         # 법륜스님은 단순 검색만 수행
         # (필요하다면 여기서 철학 용어 필터링 등을 추가 가능)
         print(user_input)
-        return [], self.vectorstore.similarity_search(
-            user_input, k=4
-        )  # k를 조금 늘림
+        return [], self._hybrid_search(user_input, k=4)  # k를 조금 늘림
 
     def _format_source(self, docs) -> str:
         sources = [doc.metadata.get(self.meta_key, "출처 미상") for doc in docs]
@@ -476,6 +701,80 @@ def get_chat_service(target: AnswerTarget) -> BaseChatService:
         return PastorService(AnswerTarget.PASTOR_A, collection_name="yujin_works")
 
 
+# ==========================================
+# [동시 실행] 여러 멘토에게 한 번에 요청
+# ==========================================
+def retrieve_for_all(text, services, max_workers=4):
+    """
+    같은 텍스트로 여러 멘토 컬렉션을 검색.
+    검색 언어별로 질의를 한 번만 만들고(니체는 번역 1번) 임베딩도 한 번만 한 뒤,
+    그 벡터로 각 컬렉션을 동시에 검색합니다.
+    반환: {target: (docs_llm, docs_all)}
+    """
+    by_language = {}
+    for service in services:
+        by_language.setdefault(service.search_language, []).append(service)
+
+    def search_language_group(group):
+        query = group[0]._search_query(text)
+        query_vector = EMBEDDINGS.embed_query(query)
+        return [(service, pool.submit(service._retrieve_by_vector, text, query_vector)) for service in group]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # 언어 그룹별 (번역 ->) 임베딩은 서로 기다리지 않도록 각각 스레드에서.
+        # 그룹 작업은 검색을 제출만 하고 기다리지 않으므로 같은 풀을 써도 막히지 않음
+        group_futures = [
+            pool.submit(search_language_group, group) for group in by_language.values()
+        ]
+        retrieved = {}
+        for group_future in group_futures:
+            for service, future in group_future.result():
+                retrieved[service.target] = future.result()
+    return retrieved
+
+
+def _ask_all(method_name, text, targets, max_workers, *args):
+    # st.cache_resource 는 메인(스크립트) 스레드에서 미리 꺼내둠
+    targets = list(targets or AnswerTarget)
+    services = {target: get_chat_service(target) for target in targets}
+
+    try:
+        retrieved = retrieve_for_all(text, services.values(), max_workers)
+    except Exception as e:
+        # 공통 검색이 실패하면 멘토별 개별 검색으로 진행
+        print(f"⚠️ 공통 검색 실패, 멘토별 검색으로 진행: {e}")
+        retrieved = {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as pool:
+        futures = {
+            pool.submit(
+                getattr(services[target], method_name), text, *args, retrieved=retrieved.get(target)
+            ): target
+            for target in targets
+        }
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                yield target, future.result()
+            except Exception as e:
+                yield target, e
+
+
+def review_news_with_all(news_text, keyword, targets=None, max_workers=4):
+    """
+    여러 멘토의 review_news 를 스레드 풀에서 동시에 실행하고,
+    끝나는 순서대로 (target, (text, source_info)) 를 yield 합니다.
+    실패한 멘토는 (target, Exception) 으로 전달됩니다.
+    검색은 retrieve_for_all 로 한 번에 하고, 전체 소요 시간 ≈ 가장 느린 멘토 1명
+    """
+    yield from _ask_all("review_news", news_text, targets, max_workers, keyword)
+
+
+def analysis_data_with_all(data, targets=None, max_workers=4):
+    """review_news_with_all 과 같은 방식으로 analysis_data 를 동시에 실행"""
+    yield from _ask_all("analysis_data", data, targets, max_workers)
+
+
 # ==========================================
 # [메인 실행부] 기존 함수 대체
 # ==========================================
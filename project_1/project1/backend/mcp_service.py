@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import Future
 from mcp.client.sse import sse_client
 from mcp.client.session import ClientSession
 import os
@@ -5,24 +8,147 @@ import os
 
 MCP_SERVER_URL = os.getenv("MCP_NEWS_URL", "http://localhost:8000/sse")
 print(f"🔗 접속 시도 중인 MCP 서버 주소: {MCP_SERVER_URL}") # 로그로 확인 가능
+
+
+# ---------------------------------------------------------
+# 상주형 MCP 클라이언트
+# ---------------------------------------------------------
+class MCPClientManager:
+    """
+    백그라운드 이벤트 루프 스레드에서 SSE 연결 + 초기화된 ClientSession 을
+    계속 유지하고, 모든 도구 호출이 그 세션을 재사용하도록 합니다.
+
+    - 호출마다 SSE 핸드셰이크/initialize/이벤트 루프 생성을 하지 않음
+    - 세션이 끊기면 다음 호출에서 자동 재연결 (1회 재시도)
+    - 호출마다 timeout 적용
+    """
+
+    def __init__(self, url, call_timeout=30.0, connect_timeout=10.0):
+        self.url = url
+        self.call_timeout = call_timeout
+        self.connect_timeout = connect_timeout
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-client-loop", daemon=True
+        )
+        self._thread.start()
+
+        self._session = None
+        self._stop = None
+        self._conn_task = None
+        self._lock = asyncio.Lock()
+
+    # ---------------------------------------------------------
+    # 연결 관리 (백그라운드 루프 안에서만 실행)
+    # ---------------------------------------------------------
+    async def _connect(self):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        stop = asyncio.Event()
+
+        async def hold_connection():
+            # sse_client/ClientSession 컨텍스트는 같은 태스크에서 열고 닫아야 하므로
+            # 연결 하나당 태스크 하나가 stop 신호가 올 때까지 붙잡고 있음
+            try:
+                async with sse_client(self.url) as streams:
+                    async with ClientSession(streams[0], streams[1]) as session:
+                        await session.initialize()
+                        ready.set_result(session)
+                        await stop.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    print(f"⚠️ MCP 세션 종료: {e}")
+
+        task = loop.create_task(hold_connection())
+        try:
+            session = await asyncio.wait_for(ready, self.connect_timeout)
+        except BaseException:
+            stop.set()
+            task.cancel()
+            raise
+
+        self._session, self._stop, self._conn_task = session, stop, task
+        print(f"🔌 MCP 세션 연결 완료: {self.url}")
+
+    async def _get_session(self):
+        async with self._lock:
+            if self._session is None or self._conn_task.done():
+                await self._connect()
+            return self._session
+
+    async def _reset(self):
+        async with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+            self._session = None
+
+    async def acall_tool(self, tool_name, arguments, timeout=None):
+        """도구 호출 후 결과 텍스트 반환 (백그라운드 루프에서 실행)"""
+        timeout = timeout or self.call_timeout
+        for attempt in range(2):
+            session = await self._get_session()
+            try:
+                result = await asyncio.wait_for(
+                    session.call_tool(tool_name, arguments=arguments), timeout
+                )
+                return result.content[0].text
+            except asyncio.TimeoutError:
+                raise
+            except Exception:
+                # 끊긴 세션일 수 있으므로 버리고 한 번만 재연결해서 다시 시도
+                await self._reset()
+                if attempt == 1:
+                    raise
+
+    # ---------------------------------------------------------
+    # 외부(Streamlit 스레드 등)에서 쓰는 API
+    # ---------------------------------------------------------
+    def submit(self, tool_name, arguments, timeout=None) -> Future:
+        """결과를 기다리지 않는 호출 (concurrent.futures.Future 반환)"""
+        return asyncio.run_coroutine_threadsafe(
+            self.acall_tool(tool_name, arguments, timeout), self._loop
+        )
+
+    def call_tool(self, tool_name, arguments, timeout=None) -> str:
+        """동기 호출 (이벤트 루프를 새로 만들지 않음)"""
+        timeout = timeout or self.call_timeout
+        # 연결 시간까지 고려해서 바깥쪽은 조금 더 기다림
+        return self.submit(tool_name, arguments, timeout).result(
+            timeout + self.connect_timeout
+        )
+
+    async def call_tool_async(self, tool_name, arguments, timeout=None) -> str:
+        """다른 이벤트 루프에서 await 할 수 있는 호출"""
+        return await asyncio.wrap_future(self.submit(tool_name, arguments, timeout))
+
+
+MCP_CLIENT = MCPClientManager(MCP_SERVER_URL)
+
+
 # ---------------------------------------------------------
 # 서버에서 뉴스 가져오기 (도구 사용)
 # ---------------------------------------------------------
+def fetch_news(search_keyword):
+    """MCP 서버의 get_latest_news 도구를 실행함 (동기)"""
+    try:
+        return MCP_CLIENT.call_tool(
+            "get_latest_news",
+            {"keyword": search_keyword, "limit": 2},
+        )
+    except Exception as e:
+        return f"Error: MCP 서버 연결 실패 ({str(e)})"
+
+
 async def get_news_from_mcp(search_keyword):
     """MCP 서버에 접속해서 get_latest_news 도구를 실행함"""
     try:
-        async with sse_client(MCP_SERVER_URL) as streams:
-            async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-                
-                # 도구 실행 요청
-                result = await session.call_tool(
-                    "get_latest_news",
-                    arguments={"keyword": search_keyword, "limit": 2}
-                )
-                # 결과 텍스트 반환
-                return result.content[0].text
-            
+        return await MCP_CLIENT.call_tool_async(
+            "get_latest_news",
+            {"keyword": search_keyword, "limit": 2},
+        )
     except Exception as e:
         return f"Error: MCP 서버 연결 실패 ({str(e)})"
 
@@ -31,32 +157,19 @@ async def get_news_from_mcp(search_keyword):
 # ---------------------------------------------------------
 async def mcp_save_log(user_input: str, mento_name: str): 
     """
-    MCP 서버에 접속해서 전체 대화 내용을 전달하고, 
+    MCP 서버에 전체 대화 내용을 전달하고, 
     서버가 분석 및 저장을 수행하도록 요청함
     """
     print(f"📡 MCP 서버로 데이터 전송 시작... (멘토: {mento_name})")
     
     try:
-        # 1. 서버 연결 (SSE 방식)
-        async with sse_client(MCP_SERVER_URL) as streams:
-            async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-
-                # 2. 도구 실행 요청 (서버의 analyze_and_save_log 함수 호출)
-                # 주의: arguments의 키값은 서버 함수(analyze_and_save_log)의 인자 이름과 똑같아야 함!
-                result = await session.call_tool(
-                    "analyze_and_save_log",
-                    arguments={
-                        "user_input": user_input, 
-                        "mento": mento_name
-                    }
-                )
-                
-                # 3. 결과 반환 (서버에서 보낸 "✅ 저장 완료" 메시지 받기)
-                # result는 CallToolResult 객체이며, 실제 텍스트는 content 리스트 안에 있음
-                output_text = result.content[0].text
-                print(f"📬 서버 응답: {output_text}")
-                return output_text
+        # 주의: arguments의 키값은 서버 함수(analyze_and_save_log)의 인자 이름과 똑같아야 함!
+        output_text = await MCP_CLIENT.call_tool_async(
+            "analyze_and_save_log",
+            {"user_input": user_input, "mento": mento_name},
+        )
+        print(f"📬 서버 응답: {output_text}")
+        return output_text
 
     except Exception as e:
         error_msg = f"Error: MCP 서버 연결 또는 도구 실행 실패 ({str(e)})"
@@ -67,20 +180,41 @@ async def mcp_save_log(user_input: str, mento_name: str):
 # ---------------------------------------------------------
 # 서버에서 DB에 조회
 # ---------------------------------------------------------
+def query_db(tool_name, arguments):
+    """MCP 서버의 조회 도구를 실행하고 결과를 가져옴 (동기)"""
+    try:
+        return MCP_CLIENT.call_tool(tool_name, arguments)
+    except Exception as e:
+        return f"통신 에러: {e}"
+
+
 async def mcp_query_db(tool_name, arguments):
     """실제 MCP 서버에 접속해서 도구를 실행하고 결과를 가져옴"""
-    
     try:
-        async with sse_client(MCP_SERVER_URL) as streams:
-            async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-                
-                # 도구 호출
-                result = await session.call_tool(
-                    tool_name, 
-                    arguments=arguments)
-                
-                # 결과 텍스트 추출 (리스트의 첫 번째 요소)
-                return result.content[0].text
+        return await MCP_CLIENT.call_tool_async(tool_name, arguments)
     except Exception as e:
-        return f"통신 에러: {e}"
\ No newline at end of file
+        return f"통신 에러: {e}"
+
+
+# ---------------------------------------------------------
+# 로그 저장 (fire-and-forget)
+# ---------------------------------------------------------
+def save_log_in_background(user_input: str, mento_name: str) -> Future:
+    """
+    상주 세션으로 analyze_and_save_log 를 던져두고 바로 반환함.
+    호출 측 이벤트 루프(asyncio.run)가 먼저 닫혀도 저장은 끝까지 진행됨.
+    """
+    print(f"📡 MCP 서버로 데이터 전송 시작... (멘토: {mento_name})")
+    future = MCP_CLIENT.submit(
+        "analyze_and_save_log",
+        {"user_input": user_input, "mento": mento_name},
+    )
+
+    def report(done: Future):
+        try:
+            print(f"📬 서버 응답: {done.result()}")
+        except Exception as e:
+            print(f"Error: MCP 서버 연결 또는 도구 실행 실패 ({str(e)})")
+
+    future.add_done_callback(report)
+    return future
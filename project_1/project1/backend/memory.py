@@ -0,0 +1,130 @@
+import os
+import threading
+from typing import List, Optional
+
+from utils.tokens import count_tokens
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("MEMORY_HISTORY_TOKENS", "1500"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("MEMORY_SUMMARY_TOKENS", "300"))
+
+
+# ==========================================
+# 최근 대화 묶기 (토큰 예산)
+# ==========================================
+def pack_recent(history: List[dict], token_budget: int) -> List[dict]:
+    """
+    최신 메시지부터 거꾸로 token_budget 안에 들어가는 만큼만 남김 (순서 유지).
+    가장 최근 메시지 하나는 예산을 넘어도 포함.
+    """
+    packed = []
+    used = 0
+    for msg in reversed(history):
+        tokens = count_tokens(msg["content"])
+        if packed and used + tokens > token_budget:
+            break
+        packed.append({"role": msg["role"], "content": msg["content"]})
+        used += tokens
+    packed.reverse()
+    return packed
+
+
+# ==========================================
+# 대화 메모리 (최근 대화 + 누적 요약)
+# ==========================================
+class ConversationMemory:
+    """
+    세션(페이지)마다 하나씩 두는 대화 메모리.
+
+    - 최근 대화는 history_tokens 예산 안에서 원문 그대로
+    - 예산 밖으로 밀려난 오래된 대화는 요약(summary)에 누적
+      (새로 밀려난 메시지만 기존 요약에 덧붙여 갱신, 매번 처음부터 요약하지 않음)
+    - 요약 갱신(LLM)은 백그라운드에서 실행되어 답변 생성을 기다리게 하지 않음
+    """
+
+    def __init__(
+        self,
+        llm=None,
+        history_tokens: int = HISTORY_TOKEN_BUDGET,
+        summary_tokens: int = SUMMARY_TOKEN_BUDGET,
+    ):
+        self.llm = llm
+        self.history_tokens = history_tokens
+        self.summary_tokens = summary_tokens
+
+        self.summary = ""
+        self.summarized_upto = 0  # 요약에 반영된 메시지 수 (history 앞에서부터)
+        self._epoch = 0  # 대화 초기화 횟수 (초기화 전에 시작된 요약 결과는 버림)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    # ---------------------------------------------------------
+    # 프롬프트용 메시지
+    # ---------------------------------------------------------
+    def build_messages(self, history: List[dict]) -> List[dict]:
+        """[요약 system 메시지] + 예산 안의 최근 대화"""
+        with self._lock:
+            if len(history) < self.summarized_upto:
+                # 대화 지우기 등으로 기록이 줄었으면 요약도 초기화
+                self.summary = ""
+                self.summarized_upto = 0
+                self._epoch += 1
+            summary = self.summary
+
+        recent = pack_recent(history, self.history_tokens)
+        self.refresh(history)
+
+        if not summary:
+            return recent
+        return [{"role": "system", "content": f"[이전 대화 요약]\n{summary}"}] + recent
+
+    # ---------------------------------------------------------
+    # 요약 갱신
+    # ---------------------------------------------------------
+    def refresh(self, history: List[dict]):
+        """최근 대화 예산 밖으로 밀려난 메시지가 있으면 백그라운드에서 요약에 반영"""
+        if self.llm is None:
+            return
+        history = [{"role": m["role"], "content": m["content"]} for m in history]
+        window_start = len(history) - len(pack_recent(history, self.history_tokens))
+
+        with self._lock:
+            if window_start <= self.summarized_upto:
+                return
+            if self._worker is not None and self._worker.is_alive():
+                return  # 진행 중인 갱신이 끝나면 다음 호출에서 이어서 반영
+            new_messages = history[self.summarized_upto:window_start]
+            self._worker = threading.Thread(
+                target=self._summarize,
+                args=(self.summary, new_messages, window_start, self._epoch),
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _summarize(self, previous: str, new_messages: List[dict], upto: int, epoch: int):
+        dialogue = "\n".join(
+            f"{'내담자' if m['role'] == 'user' else '상담자'}: {m['content']}" for m in new_messages
+        )
+        prompt = f"""
+        상담 대화의 누적 요약을 갱신하세요.
+        내담자의 상황, 고민, 감정 변화, 상담자가 이미 해준 조언을 중심으로
+        {self.summary_tokens} 토큰 이내의 한국어 문단으로 작성하고 요약문만 출력하세요.
+
+        [기존 요약]
+        {previous or "(없음)"}
+
+        [새로 추가된 대화]
+        {dialogue}
+        """
+        try:
+            summary = self.llm.invoke(prompt).content.strip()
+        except Exception as e:
+            print(f"⚠️ 대화 요약 실패 (다음 턴에 재시도): {e}")
+            return
+
+        with self._lock:
+            # 그 사이 대화가 초기화됐으면 버림
+            if epoch != self._epoch:
+                return
+            self.summary = summary
+            self.summarized_upto = upto
+        print(f"🧠 대화 요약 갱신 (메시지 {upto}개 반영, {count_tokens(summary)} 토큰)")
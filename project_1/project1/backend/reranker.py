@@ -0,0 +1,191 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+
+def dedupe_documents(docs: List) -> List:
+    """page_content 기준 중복 제거 (처음 나온 순서 유지)"""
+    return list({doc.page_content: doc for doc in docs}.values())
+
+
+# ==========================================
+# [인터페이스] 재순위화기
+# ==========================================
+class BaseReranker(ABC):
+    """검색 후보 문서 중 답변에 쓸 문서만 골라내는 재순위화기"""
+
+    # 아무 것도 고르지 못했을 때 돌려줄 상위 문서 수 (기존 "앞의 두 개" 규칙)
+    fallback_k = 2
+
+    @abstractmethod
+    def rerank(self, query: str, docs: List, query_embedding=None) -> List:
+        """후보 문서(docs)를 받아 선택된 문서 리스트를 반환"""
+        pass
+
+
+# ==========================================
+# [구현 1] LLM 재순위화 (기존 방식)
+# ==========================================
+class LLMReranker(BaseReranker):
+    def __init__(self, llm):
+        self.llm = llm
+
+    def rerank(self, query: str, docs: List, query_embedding=None) -> List:
+        if not docs:
+            return []
+
+        # 중복 제거
+        unique_docs = dedupe_documents(docs)
+
+        context_text = "\n\n".join(
+            [f"[{i+1}] {d.page_content[:500]}..." for i, d in enumerate(unique_docs)]
+        )
+
+        prompt = f"""
+        당신은 데이터 전문가입니다. 질문에 답하는 데 정말로 도움이 되는 문서 번호만 골라주세요.
+        질문: {query}
+        후보 문서:
+        {context_text}
+        응답 형식: 번호만 쉼표로 구분 (예: 1, 3). 없으면 'None'.
+        """
+
+        try:
+            selected_indices = self.llm.invoke(prompt).content.strip()
+            if "None" in selected_indices or not selected_indices:
+                return unique_docs[: self.fallback_k]
+
+            indices = [int(i.strip()) - 1 for i in selected_indices.split(",")]
+            refined = [
+                unique_docs[idx] for idx in indices if 0 <= idx < len(unique_docs)
+            ]
+            return refined if refined else unique_docs[: self.fallback_k]
+        except Exception as e:
+            print(f"Refine Error: {e}")
+            return unique_docs[: self.fallback_k]
+
+
+# ==========================================
+# [구현 2] 임베딩 유사도 + MMR 재순위화 (로컬)
+# ==========================================
+class EmbeddingReranker(BaseReranker):
+    """
+    질문 임베딩과 청크 임베딩의 코사인 유사도로 후보를 다시 채점하고,
+    MMR(Maximal Marginal Relevance)로 서로 겹치지 않는 문서를 top_k 개 고릅니다.
+
+    청크 임베딩은 VectorDB 에 저장된 값을 그대로 재사용하므로
+    (문서 id 가 있는 경우) 추가 네트워크 호출이 없습니다.
+    id 가 없는 문서(장절 직접 조회한 성경 구절 등)는 embeddings.embed_documents 로 임베딩하므로
+    CachedEmbeddings 를 넘겨서 같은 구절은 한 번만 API 를 호출하게 합니다.
+
+    후보 선택 기준
+    - score_threshold: 최고 점수가 이보다 낮으면 관련 문서가 없다고 보고 앞의 fallback_k 개 (서비스별로 다르게)
+    - relative_margin: 최고 점수에서 이만큼 안쪽인 문서만 후보 (None 이면 score_threshold 만 적용)
+      -> 컬렉션/언어마다 점수 분포가 달라도 같은 기준으로 고름
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        vectorstore=None,
+        top_k: int = 2,
+        score_threshold: float = 0.3,
+        relative_margin: Optional[float] = 0.1,
+        mmr_lambda: float = 0.7,
+    ):
+        self.embeddings = embeddings
+        self.vectorstore = vectorstore
+        self.top_k = top_k
+        self.score_threshold = score_threshold
+        self.relative_margin = relative_margin
+        self.mmr_lambda = mmr_lambda
+
+    def _stored_embeddings(self, docs: List) -> dict:
+        """VectorDB 에 저장된 청크 임베딩 조회 (id -> vector)"""
+        ids = [getattr(doc, "id", None) for doc in docs]
+        ids = [doc_id for doc_id in ids if doc_id]
+        if not ids or self.vectorstore is None:
+            return {}
+
+        try:
+            rows = self.vectorstore.get(ids=ids, include=["embeddings"])
+        except Exception as e:
+            print(f"Rerank 임베딩 조회 실패: {e}")
+            return {}
+
+        embeddings = rows.get("embeddings")
+        if embeddings is None:
+            return {}
+        return dict(zip(rows["ids"], embeddings))
+
+    def _document_matrix(self, docs: List) -> np.ndarray:
+        """후보 문서 임베딩 행렬 (행 단위 정규화). 저장된 값이 없는 문서만 새로 임베딩"""
+        stored = self._stored_embeddings(docs)
+        vectors = [stored.get(getattr(doc, "id", None)) for doc in docs]
+
+        missing = [i for i, vec in enumerate(vectors) if vec is None]
+        if missing:
+            embedded = self.embeddings.embed_documents(
+                [docs[i].page_content for i in missing]
+            )
+            for i, vec in zip(missing, embedded):
+                vectors[i] = vec
+
+        matrix = np.array(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _query_vector(self, query: str, query_embedding=None) -> np.ndarray:
+        if query_embedding is None:
+            query_embedding = self.embeddings.embed_query(query)
+        vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def score(self, query: str, docs: List, query_embedding=None) -> np.ndarray:
+        """후보별 질문-문서 코사인 유사도"""
+        return self._document_matrix(docs) @ self._query_vector(query, query_embedding)
+
+    def rerank(self, query: str, docs: List, query_embedding=None) -> List:
+        if not docs:
+            return []
+
+        unique_docs = dedupe_documents(docs)
+        doc_matrix = self._document_matrix(unique_docs)
+        relevance = doc_matrix @ self._query_vector(query, query_embedding)
+
+        best_score = float(relevance.max())
+        if best_score < self.score_threshold:
+            return unique_docs[: self.fallback_k]
+
+        cutoff = self.score_threshold
+        if self.relative_margin is not None:
+            cutoff = max(cutoff, best_score - self.relative_margin)
+        candidates = [i for i in range(len(unique_docs)) if relevance[i] >= cutoff]
+
+        # MMR: 관련도는 높고 이미 고른 문서와는 덜 겹치는 순서로 선택
+        selected: List[int] = []
+        while candidates and len(selected) < self.top_k:
+            if selected:
+                redundancy = (doc_matrix[candidates] @ doc_matrix[selected].T).max(axis=1)
+            else:
+                redundancy = np.zeros(len(candidates), dtype=np.float32)
+            mmr = self.mmr_lambda * relevance[candidates] - (1 - self.mmr_lambda) * redundancy
+            best = candidates[int(np.argmax(mmr))]
+            selected.append(best)
+            candidates.remove(best)
+
+        return [unique_docs[i] for i in selected]
+
+
+# ==========================================
+# [팩토리] 재순위화기 생성
+# ==========================================
+def build_reranker(
+    mode: str, llm=None, embeddings=None, vectorstore=None, score_threshold: float = 0.3
+) -> BaseReranker:
+    """mode: 'embedding' (기본, 로컬) 또는 'llm' (기존 gpt-4o-mini 선택)"""
+    if mode == "llm":
+        return LLMReranker(llm)
+    return EmbeddingReranker(embeddings, vectorstore=vectorstore, score_threshold=score_threshold)
@@ -0,0 +1,77 @@
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from enums.target import SermonState
+
+
+# ==========================================
+# OpenAI 토큰 스트림
+# ==========================================
+def stream_completion(client, **request) -> Iterator[str]:
+    """chat.completions 를 stream=True 로 호출하여 토큰(delta) 단위로 yield"""
+    response = client.chat.completions.create(stream=True, **request)
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+# ==========================================
+# 스트리밍 답변 객체
+# ==========================================
+class StreamingAnswer:
+    """
+    st.write_stream 에 바로 넘길 수 있는 토큰 스트림.
+
+    사용 예:
+        answer = service.stream_response(prompt, history)
+        response_text = st.write_stream(answer)
+        state, source_text = answer.source_info
+
+    출처 정보(source_info)와 전체 텍스트(text)는 스트림이 끝난 뒤에 확정됩니다.
+    """
+
+    def __init__(
+        self,
+        tokens: Iterable[str],
+        source_info: Optional[Tuple[SermonState, str]] = None,
+        on_complete: Optional[Callable[[str], None]] = None,
+    ):
+        self._tokens = tokens
+        self._source_info = source_info or (SermonState.NOT_FOUND, "")
+        self._on_complete = on_complete
+        self._parts = []
+        self.done = False
+
+    @classmethod
+    def from_text(cls, text: str, source_info=None) -> "StreamingAnswer":
+        """이미 완성된 답변(캐시 등)을 스트림 형태로 감쌈"""
+        return cls([text], source_info)
+
+    def __iter__(self) -> Iterator[str]:
+        if self.done:
+            yield self.text
+            return
+
+        for token in self._tokens:
+            self._parts.append(token)
+            yield token
+
+        self.done = True
+        if self._on_complete:
+            self._on_complete(self.text)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def source_info(self) -> Tuple[SermonState, str]:
+        return self._source_info
+
+    def collect(self) -> str:
+        """스트림을 끝까지 소비하고 전체 텍스트 반환 (비스트리밍 호출용)"""
+        for _ in self:
+            pass
+        return self.text
@@ -19,10 +19,103 @@ tools_schema = [
                         "type": "string",
                         "enum": ["emotion_rank", "keyword_rank", "mento_rank"],
                         "description": "분석할 종류 (감정 순위, 키워드 순위, 멘토 빈도 중 택 1)"
+                    },
+                    "mento": {
+                        "type": "string",
+                        "description": "(선택) 특정 멘토의 상담만 보고 싶을 때 멘토 이름. keyword_rank 에서만 사용."
                     }
                 },
                 "required": ["start_date", "end_date", "analysis_type"]
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_trend",
+            "description": "기간 동안의 상담 건수 추세를 일/주/월 단위로 분석함 (감정·멘토·키워드별 추세, 선 그래프)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_date": {
+                        "type": "string",
+                        "description": "조회 시작 날짜 (YYYY-MM-DD 형식). 사용자의 말에서 유추."
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "조회 종료 날짜 (YYYY-MM-DD 형식). 오늘 날짜 기준 유추."
+                    },
+                    "bucket": {
+                        "type": "string",
+                        "enum": ["day", "week", "month"],
+                        "description": "집계 단위 (일별, 주별, 월별)"
+                    },
+                    "group_by": {
+                        "type": "string",
+                        "enum": ["", "mento", "emotion"],
+                        "description": "계열 구분 기준 (멘토별/감정별로 선을 나눌 때)"
+                    },
+                    "emotion": {
+                        "type": "string",
+                        "description": "(선택) 특정 감정의 추세만 볼 때 감정 이름 (예: 불안)"
+                    },
+                    "mento": {
+                        "type": "string",
+                        "description": "(선택) 특정 멘토의 추세만 볼 때 멘토 이름"
+                    },
+                    "keyword": {
+                        "type": "string",
+                        "description": "(선택) 특정 고민 키워드의 언급 추세를 볼 때 키워드"
+                    }
+                },
+                "required": ["start_date", "end_date", "bucket"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_emotion_mento_crosstab",
+            "description": "기간 동안 어떤 감정의 내담자가 어떤 멘토를 찾았는지 감정 x 멘토 교차표로 분석함 (히트맵)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_date": {
+                        "type": "string",
+                        "description": "조회 시작 날짜 (YYYY-MM-DD 형식). 사용자의 말에서 유추."
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "조회 종료 날짜 (YYYY-MM-DD 형식). 오늘 날짜 기준 유추."
+                    }
+                },
+                "required": ["start_date", "end_date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_top_keywords_by_mento",
+            "description": "기간 동안 멘토별로 가장 많이 나온 고민 키워드 Top-N 을 분석함 (막대 그래프)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_date": {
+                        "type": "string",
+                        "description": "조회 시작 날짜 (YYYY-MM-DD 형식). 사용자의 말에서 유추."
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "조회 종료 날짜 (YYYY-MM-DD 형식). 오늘 날짜 기준 유추."
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "멘토마다 가져올 키워드 수 (기본 5)"
+                    }
+                },
+                "required": ["start_date", "end_date"]
+            }
+        }
+    },
 ]
\ No newline at end of file
@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# 영상별 진행 단계 (뒤로 갈수록 진행된 상태)
+STAGES = ["listed", "fetched", "summarized", "indexed"]
+
+
+# ==========================================
+# 토큰 버킷 (고정 sleep 대신 호출 속도 제한)
+# ==========================================
+class TokenBucket:
+    """
+    초당 rate 번, 최대 capacity 번까지 몰아서 허용하는 속도 제한기 (스레드 안전).
+    여러 작업 스레드가 같은 버킷을 공유하면 전체 호출 속도가 rate 를 넘지 않습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+# ==========================================
+# 진행 기록 (manifest)
+# ==========================================
+class Manifest:
+    """
+    영상별 단계/파일명/실패 기록을 JSON 파일 하나에 저장.
+    갱신할 때마다 임시 파일에 쓰고 교체하므로 중간에 죽어도 마지막 상태에서 이어서 실행합니다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.videos = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.videos = json.load(f)
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.videos, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.path)
+
+    def add(self, video_id: str, file_name: str) -> bool:
+        """새 영상이면 추가하고 True"""
+        with self._lock:
+            if video_id in self.videos:
+                return False
+            self.videos[video_id] = {"file": file_name, "stage": "listed", "attempts": 0, "error": None}
+            self._save()
+            return True
+
+    def update(self, video_id: str, **fields):
+        with self._lock:
+            self.videos[video_id].update(fields, updated_at=time.time())
+            self._save()
+
+    def at_stage(self, stage: str) -> List[str]:
+        return [video_id for video_id, entry in self.videos.items() if entry["stage"] == stage]
+
+    def counts(self) -> dict:
+        counts = {stage: 0 for stage in STAGES}
+        for entry in self.videos.values():
+            counts[entry["stage"]] += 1
+        return counts
+
+
+# ==========================================
+# 단계별 파이프라인 (목록 -> 자막 -> 요약 -> 색인)
+# ==========================================
+class BubryunePipeline:
+    """
+    즉문즉설 재생목록을 자막 수집 -> 요약 -> 벡터 DB 색인까지 단계별로 처리합니다.
+
+    - 단계마다 manifest 에 기록하고, 이미 끝난 단계(파일이 있는 경우 포함)는 건너뜀
+      -> 재생목록 전체를 다시 돌려도 새 영상만 처리
+    - 단계별 동시 실행 수(workers)와 토큰 버킷 속도 제한(rate)을 따로 둠
+    - 실패한 영상은 다음 실행에서 max_attempts 번까지 다시 시도
+    - 외부 호출(list_videos / fetch_transcript / summarize / index)은 주입받으므로
+      테스트에서는 로컬 대역으로 바꿔 끼울 수 있음
+    """
+
+    def __init__(
+        self,
+        manifest_path,
+        transcript_dir,
+        summary_dir,
+        list_videos: Callable[[], List[str]],
+        fetch_transcript: Callable[[str], str],
+        summarize: Callable[[str], str],
+        index: Optional[Callable[[], None]] = None,
+        fetch_rate: float = 0.5,
+        summarize_rate: float = 0.5,
+        fetch_workers: int = 2,
+        summarize_workers: int = 4,
+        max_attempts: int = 3,
+    ):
+        self.manifest = Manifest(manifest_path)
+        self.transcript_dir = Path(transcript_dir)
+        self.summary_dir = Path(summary_dir)
+        self.list_videos = list_videos
+        self.fetch_transcript = fetch_transcript
+        self.summarize = summarize
+        self.index = index
+        self.fetch_bucket = TokenBucket(fetch_rate)
+        self.summarize_bucket = TokenBucket(summarize_rate)
+        self.fetch_workers = fetch_workers
+        self.summarize_workers = summarize_workers
+        self.max_attempts = max_attempts
+
+    # ---------------------------------------------------------
+    # 공통
+    # ---------------------------------------------------------
+    @staticmethod
+    def _write(path: Path, text: str):
+        # 다 쓴 파일만 보이도록 (반쯤 쓴 파일을 '완료'로 착각하지 않게)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _run_stage(self, name, video_ids, workers, work) -> int:
+        """video_ids 를 workers 개 스레드로 처리, 성공 수 반환 (실패는 manifest 에 기록)"""
+        video_ids = [
+            video_id for video_id in video_ids
+            if self.manifest.videos[video_id]["attempts"] < self.max_attempts
+        ]
+        if not video_ids:
+            print(f"⏭️ [{name}] 새로 할 작업 없음")
+            return 0
+
+        print(f"▶ [{name}] {len(video_ids)}개 처리 (동시 {workers}개)")
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(work, video_id): video_id for video_id in video_ids}
+            for future in as_completed(futures):
+                video_id = futures[future]
+                try:
+                    future.result()
+                    done += 1
+                    print(f"  ✅ [{name}] {video_id}")
+                except Exception as e:
+                    attempts = self.manifest.videos[video_id]["attempts"] + 1
+                    self.manifest.update(video_id, attempts=attempts, error=f"{name}: {e}")
+                    print(f"  ❌ [{name}] {video_id} ({attempts}/{self.max_attempts}) - {e}")
+        return done
+
+    # ---------------------------------------------------------
+    # 단계
+    # ---------------------------------------------------------
+    def stage_list(self) -> int:
+        video_ids = self.list_videos()
+        added = 0
+        for position, video_id in enumerate(video_ids, 1):
+            # 파일명 번호(=즉문즉설 N강)는 처음 본 재생목록 순번으로 고정
+            added += self.manifest.add(video_id, f"{position:03d}_{video_id}.txt")
+        print(f"📋 [list] 재생목록 {len(video_ids)}개 중 새 영상 {added}개")
+        return added
+
+    def _fetch_one(self, video_id):
+        entry = self.manifest.videos[video_id]
+        path = self.transcript_dir / entry["file"]
+        if not path.exists():  # 예전에 받아 둔 자막은 그대로 사용
+            self.fetch_bucket.acquire()
+            text = self.fetch_transcript(video_id)
+            if not text.strip():
+                raise ValueError("빈 자막")
+            self._write(path, text)
+        self.manifest.update(video_id, stage="fetched", attempts=0, error=None)
+
+    def stage_fetch(self) -> int:
+        return self._run_stage("fetch", self.manifest.at_stage("listed"), self.fetch_workers, self._fetch_one)
+
+    def _summarize_one(self, video_id):
+        entry = self.manifest.videos[video_id]
+        path = self.summary_dir / entry["file"]
+        if not path.exists():  # 이미 요약한 파일은 다시 요약하지 않음
+            transcript = (self.transcript_dir / entry["file"]).read_text(encoding="utf-8")
+            self.summarize_bucket.acquire()
+            self._write(path, self.summarize(transcript))
+        self.manifest.update(video_id, stage="summarized", attempts=0, error=None)
+
+    def stage_summarize(self) -> int:
+        return self._run_stage(
+            "summarize", self.manifest.at_stage("fetched"), self.summarize_workers, self._summarize_one
+        )
+
+    def stage_index(self) -> int:
+        # 색인(ingest)은 증분 동기화라 요약 폴더 전체를 넘겨도 새 청크만 임베딩
+        video_ids = self.manifest.at_stage("summarized")
+        if not video_ids or self.index is None:
+            print("⏭️ [index] 새로 색인할 요약 없음")
+            return 0
+        self.index()
+        for video_id in video_ids:
+            self.manifest.update(video_id, stage="indexed")
+        return len(video_ids)
+
+    def run(self) -> dict:
+        started_at = time.time()
+        result = {
+            "listed": self.stage_list(),
+            "fetched": self.stage_fetch(),
+            "summarized": self.stage_summarize(),
+            "indexed": self.stage_index(),
+        }
+        print(f"🏁 파이프라인 완료 ({time.time() - started_at:.1f}초) 이번 실행: {result} / 전체: {self.manifest.counts()}")
+        return result
@@ -0,0 +1,246 @@
+import re
+import sys
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from langchain_core.documents import Document
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from utils.tokens import count_tokens, count_tokens_many  # noqa: E402
+
+# 청크 크기는 글자 수가 아니라 임베딩 모델 기준 토큰 수로 맞춤
+TOKEN_MODEL = "text-embedding-3-small"
+DEFAULT_MAX_TOKENS = 1500
+DEFAULT_OVERLAP_TOKENS = 100
+
+# 청크를 자를 위치 (문단 > 줄/문장 > 공백 순으로 찾음)
+SENTENCE_MARKS = ("\n", ". ", "? ", "! ", "… ")
+# 니체 문단(Aphorism) 번호 "1. ..." (process_niche.load_nietzsche_txt 에서도 사용)
+APHORISM_PATTERN = re.compile(r"(?m)^(\d+)\.\s+")
+# 즉문즉설 요약 "Q: ... A: ..."
+QUESTION_PATTERN = re.compile(r"(?m)^\s*Q\s*[:：]\s*")
+ANSWER_PATTERN = re.compile(r"(?m)^\s*A\s*[:：]\s*")
+
+
+def _tokens(text: str) -> int:
+    return count_tokens(text, TOKEN_MODEL)
+
+
+def _estimate(text: str) -> int:
+    """토크나이저 없이 UTF-8 바이트 / 3 으로 추정 (utils.tokens 의 오프라인 근사와 같음)"""
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+# ==========================================
+# 기본: 토큰 예산 분할 (문단/문장 경계에서 자름)
+# ==========================================
+def _sentence_end(text: str, pos: int, mark: str) -> bool:
+    # "3. " 같은 번호 뒤에서는 자르지 않음
+    return mark != ". " or pos == 0 or not text[pos - 1].isdigit()
+
+
+def _last_break(text: str, start: int, limit: int) -> int:
+    """
+    [start, limit) 안에서 가장 뒤의 자를 위치 (문단 > 줄/문장 > 공백, 없으면 limit).
+    청크가 너무 작아지지 않도록 뒤쪽 절반 안에서만 찾음
+    """
+    lower = start + (limit - start) // 2
+    cut = text.rfind("\n\n", lower, limit)
+    if cut != -1:
+        return cut
+
+    best = -1
+    for mark in SENTENCE_MARKS:
+        pos = text.rfind(mark, lower, limit)
+        while pos != -1 and not _sentence_end(text, pos, mark):
+            pos = text.rfind(mark, lower, pos)
+        best = max(best, pos)
+    if best != -1:
+        return best + 1  # 문장부호는 앞 청크에 포함
+
+    pos = text.rfind(" ", lower, limit)
+    return pos + 1 if pos != -1 else limit
+
+
+def _overlap_start(text: str, start: int, cut: int, overlap_chars: int) -> int:
+    """다음 청크 시작: 앞 청크 끝 overlap_chars 글자 안에서 가장 앞의 문장 시작 (없으면 겹침 없이 cut)"""
+    lower = max(start + 1, cut - overlap_chars)
+    found = cut
+    for mark in SENTENCE_MARKS:
+        pos = text.find(mark, lower, cut - 1)
+        while pos != -1 and not _sentence_end(text, pos, mark):
+            pos = text.find(mark, pos + 1, cut - 1)
+        if pos != -1:
+            found = min(found, pos + 1)
+    return found
+
+
+def split_text(
+    text: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+) -> Iterator[str]:
+    """
+    원문을 max_tokens 안에서 최대한 길게, 문단(없으면 문장/공백) 경계에서 잘라 청크로 만들고,
+    다음 청크는 앞 청크 끝 문장들(overlap_tokens 정도)로 시작합니다.
+
+    문장마다 세지 않고 바이트/3 추정으로 자를 위치를 정한 뒤, 실제 토크나이저는 잘라 낸 청크에만 한 번 돌립니다.
+    센 값으로 글자당 토큰 비율을 보정해서 다음 청크 길이를 정하고, 예산을 넘었으면 그 청크만 줄여서 다시 셈.
+    """
+    text = text.strip()
+    if not text:
+        return
+
+    # 첫 청크 길이만 앞부분 추정으로 정하고, 이후로는 실제로 센 값으로 보정
+    sample = text[: max_tokens * 3]
+    tokens_per_char = _estimate(sample) / len(sample)
+    start = 0
+    while start < len(text):
+        limit = start + max(1, int(max_tokens / tokens_per_char))
+        cut = len(text) if limit >= len(text) else _last_break(text, start, limit)
+        chunk = text[start:cut].strip()
+        actual = _tokens(chunk)
+
+        # 추정이 모자랐으면 (실제 토큰이 더 많으면) 이 청크만 줄임
+        while actual > max_tokens and cut - start > 1:
+            limit = start + max(1, int((cut - start) * max_tokens / actual))
+            cut = _last_break(text, start, limit)
+            chunk = text[start:cut].strip()
+            actual = _tokens(chunk)
+
+        if chunk:
+            tokens_per_char = max(actual, 1) / len(chunk)
+            yield chunk
+        if cut >= len(text):
+            break
+        start = _overlap_start(text, start, cut, int(overlap_tokens / tokens_per_char)) if overlap_tokens else cut
+
+
+def chunk_documents(
+    documents: Iterable[Document],
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+) -> Iterator[Document]:
+    """설교 본문 등 일반 문서 (RecursiveCharacterTextSplitter 대체)"""
+    for doc in documents:
+        for text in split_text(doc.page_content, max_tokens, overlap_tokens):
+            yield Document(page_content=text, metadata=dict(doc.metadata))
+
+
+# ==========================================
+# 니체: 문단(Aphorism) 경계 유지
+# ==========================================
+def chunk_aphorisms(documents: Iterable[Document], max_tokens: int = DEFAULT_MAX_TOKENS) -> Iterator[Document]:
+    """
+    load_nietzsche_txt 가 만든 문단 Document 를 받아서
+    - 같은 챕터의 짧은 문단은 예산 안에서 이어 붙이고 (문단 중간에서 자르지 않음)
+    - 예산보다 긴 문단만 문장 단위로 나눔
+    """
+    def flush(group):
+        first, last = group[0], group[-1]
+        metadata = dict(first.metadata)
+        if len(group) > 1:
+            metadata["section_end"] = last.metadata["section_num"]
+            metadata["full_ref"] = f"{first.metadata['full_ref']}~§{last.metadata['section_num']}"
+        return Document(page_content="\n\n".join(doc.page_content for doc in group), metadata=metadata)
+
+    for _, chapter_docs in groupby(documents, key=lambda doc: doc.metadata.get("chapter_num")):
+        group: List[Document] = []
+        total = 0
+        for doc in chapter_docs:
+            tokens = _tokens(doc.page_content)
+            if tokens > max_tokens:
+                if group:
+                    yield flush(group)
+                    group, total = [], 0
+                yield from chunk_documents([doc], max_tokens)
+                continue
+
+            if group and total + tokens > max_tokens:
+                yield flush(group)
+                group, total = [], 0
+            group.append(doc)
+            total += tokens
+
+        if group:
+            yield flush(group)
+
+
+# ==========================================
+# 성경: 같은 장 안에서 연속 절 묶기
+# ==========================================
+def chunk_verse_windows(
+    documents: Iterable[Document],
+    window: int = 5,
+    stride: int = 4,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+) -> Iterator[Document]:
+    """
+    절 단위 Document (book_abbr/chapter/verse 메타데이터) 를
+    window 절씩, stride 절 간격으로 겹쳐 묶음 (장을 넘어가지 않음).
+    토큰 예산을 넘으면 그 창은 앞쪽 절까지만.
+    """
+    chapters = groupby(documents, key=lambda doc: (doc.metadata["book_abbr"], doc.metadata["chapter"]))
+    for (book, chapter), verse_docs in chapters:
+        verses = list(verse_docs)
+        token_counts = count_tokens_many([doc.page_content for doc in verses], TOKEN_MODEL)
+
+        start = 0
+        while start < len(verses):
+            end = start + 1
+            total = token_counts[start]
+            while end < min(start + window, len(verses)) and total + token_counts[end] <= max_tokens:
+                total += token_counts[end]
+                end += 1
+
+            first, last = verses[start].metadata, verses[end - 1].metadata
+            reference = first["reference"] if end - start == 1 else f"{first['reference']}-{last['verse']}"
+            yield Document(
+                page_content="\n".join(doc.page_content for doc in verses[start:end]),
+                metadata={
+                    "book": book,
+                    "chapter": chapter,
+                    "verse_start": first["verse"],
+                    "verse_end": last["verse"],
+                    "reference": reference,
+                },
+            )
+
+            if end >= len(verses):
+                break
+            start = min(start + stride, end)  # 예산 때문에 짧아진 창 뒤의 절을 건너뛰지 않도록
+
+
+# ==========================================
+# 즉문즉설: 질문/답변 쌍 유지
+# ==========================================
+def chunk_qa_pairs(documents: Iterable[Document], max_tokens: int = DEFAULT_MAX_TOKENS) -> Iterator[Document]:
+    """
+    "Q: ... A: ..." 쌍을 한 청크로. 답변이 예산을 넘으면 답변만 나누고
+    나눈 조각마다 질문을 앞에 붙여서 어떤 고민에 대한 답인지 잃지 않게 함.
+    Q/A 형식이 아니면 일반 분할.
+    """
+    for doc in documents:
+        preamble, *pairs = QUESTION_PATTERN.split(doc.page_content)
+        if preamble.strip():
+            yield from chunk_documents(
+                [Document(page_content=preamble, metadata=doc.metadata)], max_tokens
+            )
+
+        for pair in pairs:
+            parts = ANSWER_PATTERN.split(pair, maxsplit=1)
+            question = parts[0].strip()
+            answer = parts[1].strip() if len(parts) > 1 else ""
+            text = f"Q: {question}\nA: {answer}" if answer else f"Q: {question}"
+
+            if _tokens(text) <= max_tokens or not answer:
+                yield Document(page_content=text, metadata=dict(doc.metadata))
+                continue
+
+            header = f"Q: {question}\nA: "
+            budget = max(1, max_tokens - _tokens(header))
+            for piece in split_text(answer, budget, overlap_tokens=0):
+                yield Document(page_content=header + piece, metadata=dict(doc.metadata))
@@ -1,7 +1,7 @@
 from pathlib import Path
 
 from dotenv import load_dotenv
-from process_bubryune import preprocess_bubryune
+from process_bubryune import preprocess_bubryune, refresh_bubryune
 from process_bible import preprocess_bible
 from process_niche import preprocess_niche
 from process_yujin import preprocess_yujin
@@ -17,8 +17,12 @@ WOONSUNG_PATH = BASE_DIR / "data" / "woonsung"
 BUBRYUNE_PATH = BASE_DIR / "data" / "bubryune"
 VECTOR_DB_PATH = BASE_DIR / "chroma_vector_db"
 
-# preprocess_bible(BIBLE_PATH, VECTOR_DB_PATH)
-# preprocess_niche(NICHE_PATH, VECTOR_DB_PATH)
-# preprocess_yujin(YUJIN_PATH, VECTOR_DB_PATH)
-# preprocess_woonsung(WOONSUNG_PATH, VECTOR_DB_PATH)
-preprocess_bubryune(BUBRYUNE_PATH, VECTOR_DB_PATH)
\ No newline at end of file
+# 추출 단계가 프로세스 풀을 쓰므로 (spawn 방식에서 재실행되지 않도록) main 가드 필요
+if __name__ == "__main__":
+    # preprocess_bible(BIBLE_PATH, VECTOR_DB_PATH)
+    # preprocess_niche(NICHE_PATH, VECTOR_DB_PATH)
+    # preprocess_yujin(YUJIN_PATH, VECTOR_DB_PATH)
+    # preprocess_woonsung(WOONSUNG_PATH, VECTOR_DB_PATH)
+    # 즉문즉설 재생목록 갱신 (새 영상만 자막/요약/색인)
+    # refresh_bubryune(BUBRYUNE_PATH, VECTOR_DB_PATH)
+    preprocess_bubryune(BUBRYUNE_PATH, VECTOR_DB_PATH)
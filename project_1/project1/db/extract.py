@@ -0,0 +1,72 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# 0(기본) 이면 CPU 코어 수만큼
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "0"))
+
+
+def _timed_extract(extract_fn, path):
+    """워커 프로세스에서 파일 하나 추출 -> (path, 결과, 걸린 시간, 에러 문자열)"""
+    started_at = time.perf_counter()
+    try:
+        result = extract_fn(path)
+        return path, result, time.perf_counter() - started_at, None
+    except Exception as e:
+        return path, None, time.perf_counter() - started_at, f"{type(e).__name__}: {e}"
+
+
+# ==========================================
+# 병렬 추출 단계 (PDF/HWP/TXT 공통)
+# ==========================================
+def extract_files(paths, extract_fn, max_workers=None, label="추출"):
+    """
+    파일마다 extract_fn(path) 를 별도 프로세스에서 실행합니다 (PDF/HWP 파싱은 CPU 작업).
+
+    - extract_fn 은 모듈 최상위 함수여야 하고 (metadata, text) 또는 None(스킵)을 반환
+    - 파일별 소요 시간과 실패(예외)를 끝나는 순서대로 출력하고 마지막에 요약
+    - 반환: 성공한 [(path, (metadata, text))] (입력 순서 유지)
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+
+    workers = min(max_workers or EXTRACT_WORKERS or os.cpu_count() or 1, len(paths))
+    print(f"⚙️ [{label}] 파일 {len(paths)}개, 프로세스 {workers}개")
+
+    started_at = time.perf_counter()
+    outcomes = {}
+
+    def report(outcome):
+        path, result, elapsed, error = outcome
+        outcomes[path] = outcome
+        name = Path(path).name
+        if error:
+            print(f"  ❌ [{len(outcomes)}/{len(paths)}] {name} 실패 ({elapsed:.2f}초) - {error}")
+        elif result is None:
+            print(f"  ⚠️ [{len(outcomes)}/{len(paths)}] {name} 스킵 ({elapsed:.2f}초)")
+        else:
+            print(f"  ✅ [{len(outcomes)}/{len(paths)}] {name} ({len(result[1])}자, {elapsed:.2f}초)")
+
+    if workers == 1:
+        # 파일이 하나뿐이거나 워커 1개면 프로세스를 띄우지 않음
+        for path in paths:
+            report(_timed_extract(extract_fn, path))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_timed_extract, extract_fn, path) for path in paths]
+            for future in as_completed(futures):
+                report(future.result())
+
+    wall = time.perf_counter() - started_at
+    busy = sum(elapsed for _, _, elapsed, _ in outcomes.values())
+    failures = [outcome for outcome in outcomes.values() if outcome[3]]
+    results = [(path, outcomes[path][1]) for path in paths if outcomes[path][1] is not None]
+    print(
+        f"⏱️ [{label}] 성공 {len(results)}개 / 스킵 {len(paths) - len(results) - len(failures)}개 / "
+        f"실패 {len(failures)}개, {wall:.1f}초 (파일별 합계 {busy:.1f}초, x{busy / wall if wall else 0:.1f})"
+    )
+    for path, _, elapsed, _ in sorted(outcomes.values(), key=lambda o: o[2], reverse=True)[:3]:
+        print(f"   🐢 {Path(path).name}: {elapsed:.2f}초")
+    return results
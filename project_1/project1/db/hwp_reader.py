@@ -0,0 +1,123 @@
+import re
+import struct
+import zlib
+from typing import BinaryIO, Iterable, Iterator, Tuple
+
+import olefile
+
+# HWP 5.0 레코드 태그 (HWPTAG_BEGIN=0x10 + 51)
+HWPTAG_PARA_TEXT = 67
+# 레코드 헤더의 크기 필드(12비트)가 이 값이면 실제 크기는 뒤따르는 4바이트에 들어 있음
+EXTENDED_SIZE = 0xFFF
+
+READ_CHUNK_SIZE = 64 * 1024
+# 압축 해제 한 번에 만드는 최대 바이트 (압축률이 높은 섹션도 메모리를 조금씩만 사용)
+INFLATE_CHUNK_SIZE = 256 * 1024
+
+_RECORD_HEADER = struct.Struct("<I")
+
+# 문단 텍스트 안의 제어 문자
+# - 확장/인라인 제어(1~9, 11~12, 14~23)는 8 WCHAR(코드 + 부가정보 6 + 코드) 를 차지 -> 통째로 제거
+# - 줄바꿈(10)은 남기고, 나머지 문자 제어(0, 13, 24~31)는 제거
+_EXTENDED_CONTROL = re.compile(r"[\x01-\x09\x0b\x0c\x0e-\x17].{7}", re.S)
+_CHAR_CONTROL = {code: None for code in range(32) if code != 10}
+
+
+# ==========================================
+# 섹션 스트림 -> (압축 해제) 바이트 조각
+# ==========================================
+def iter_section_chunks(stream: BinaryIO, compressed: bool, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """섹션 스트림을 chunk_size 씩 읽어서 (필요하면 점진적으로 압축 해제해서) 내보냄"""
+    inflater = zlib.decompressobj(-15) if compressed else None
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if inflater is None:
+            yield chunk
+            continue
+
+        data = inflater.decompress(chunk, INFLATE_CHUNK_SIZE)
+        while True:
+            if data:
+                yield data
+            if not inflater.unconsumed_tail:
+                break
+            data = inflater.decompress(inflater.unconsumed_tail, INFLATE_CHUNK_SIZE)
+
+    if inflater is not None:
+        tail = inflater.flush()
+        if tail:
+            yield tail
+
+
+# ==========================================
+# 바이트 조각 -> 레코드
+# ==========================================
+def iter_records(chunks: Iterable[bytes]) -> Iterator[Tuple[int, int, memoryview]]:
+    """
+    (tag_id, level, payload) 를 순서대로 내보냄.
+
+    payload 는 내부 버퍼를 가리키는 memoryview 라서 복사가 없지만,
+    다음 레코드를 요청하기 전까지만 유효합니다 (필요하면 bytes(payload) 로 복사).
+    레코드 헤더 = tag_id(10비트) | level(10비트) | size(12비트),
+    size 가 0xFFF 면 바로 뒤 4바이트가 실제 크기.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        with memoryview(buffer) as view:
+            end_of_data = len(view)
+            while end_of_data - pos >= 4:
+                header = _RECORD_HEADER.unpack_from(view, pos)[0]
+                tag_id = header & 0x3FF
+                level = (header >> 10) & 0x3FF
+                size = header >> 20
+                start = pos + 4
+                if size == EXTENDED_SIZE:
+                    if end_of_data - start < 4:
+                        break
+                    size = _RECORD_HEADER.unpack_from(view, start)[0]
+                    start += 4
+                if start + size > end_of_data:
+                    break  # 레코드가 다음 조각까지 이어짐
+
+                payload = view[start:start + size]
+                yield tag_id, level, payload
+                payload.release()
+                pos = start + size
+
+        # 처리한 앞부분만 버리고 잘린 레코드는 다음 조각과 이어 붙임
+        del buffer[:pos]
+
+
+# ==========================================
+# 레코드 -> 문단 텍스트
+# ==========================================
+def decode_para_text(payload) -> str:
+    text = str(payload, "utf-16-le", errors="replace")
+    return _EXTENDED_CONTROL.sub("", text).translate(_CHAR_CONTROL)
+
+
+def iter_section_paragraphs(stream: BinaryIO, compressed: bool) -> Iterator[str]:
+    """섹션 스트림 하나의 문단 텍스트를 하나씩 (지연) 생성"""
+    for tag_id, _, payload in iter_records(iter_section_chunks(stream, compressed)):
+        if tag_id == HWPTAG_PARA_TEXT:
+            yield decode_para_text(payload)
+
+
+def iter_hwp_paragraphs(filename) -> Iterator[str]:
+    """HWP 파일 본문(BodyText/Section0..N)의 문단을 순서대로 생성, 섹션 사이에는 빈 문단"""
+    with olefile.OleFileIO(str(filename)) as f:
+        dirs = f.listdir()
+        if ["FileHeader"] not in dirs or ["\x05HwpSummaryInformation"] not in dirs:
+            raise Exception("Not Valid HWP.")
+
+        header_data = f.openstream("FileHeader").read()
+        is_compressed = (header_data[36] & 1) == 1
+
+        nums = sorted(int(d[1][len("Section"):]) for d in dirs if d[0] == "BodyText")
+        for num in nums:
+            yield from iter_section_paragraphs(f.openstream(f"BodyText/Section{num}"), is_compressed)
+            yield ""
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import chromadb
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_openai import OpenAIEmbeddings
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from utils.bm25 import bm25_index_path, build_bm25_from_collection  # noqa: E402
+from utils.embedding_cache import CachedEmbeddings  # noqa: E402
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+# 질문 경로(backend/chat_service.py)와 같은 캐시 파일을 공유
+EMBEDDING_CACHE_PATH = BASE_DIR / "cache" / "embeddings.db"
+
+
+# --- 1. 임베딩 백엔드 선택 ---
+def get_embeddings(backend=None):
+    """
+    EMBEDDING_BACKEND=openai (기본) : OpenAI 임베딩 (검색 때와 동일한 모델!, 디스크 캐시 사용)
+    EMBEDDING_BACKEND=fake          : 네트워크 없이 같은 입력에 같은 벡터를 주는 로컬 임베딩 (테스트용)
+    """
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "openai")
+    if backend == "fake":
+        return DeterministicFakeEmbedding(size=EMBEDDING_DIM)
+    return CachedEmbeddings(
+        OpenAIEmbeddings(model=EMBEDDING_MODEL),
+        model_name=EMBEDDING_MODEL,
+        db_path=EMBEDDING_CACHE_PATH,
+    )
+
+
+# --- 2. 결정적 청크 ID ---
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_chunk_id(source, offset, text):
+    """(원본 파일, 파일 내 청크 순번, 내용 해시) 로 항상 같은 ID 를 만듦"""
+    raw = f"{source}|{offset}|{content_hash(text)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def assign_chunk_ids(documents, default_source):
+    """
+    청크마다 결정적 ID 를 붙이고 메타데이터에 추적 정보를 기록.
+    반환: [(chunk_id, Document)] (같은 ID 는 한 번만)
+    """
+    offsets = {}
+    assigned = {}
+    for doc in documents:
+        source = str(doc.metadata.get("source") or default_source)
+        offset = offsets.get(source, 0)
+        offsets[source] = offset + 1
+
+        chunk_id = make_chunk_id(source, offset, doc.page_content)
+        doc.metadata = {
+            **doc.metadata,
+            "chunk_source": source,
+            "chunk_offset": offset,
+            "content_hash": content_hash(doc.page_content),
+        }
+        assigned.setdefault(chunk_id, doc)
+    return list(assigned.items())
+
+
+# --- 3. 증분 배치 병렬 적재 엔진 ---
+class IngestionEngine:
+    """
+    컬렉션에 이미 있는 청크는 건너뛰고, 새로 생기거나 바뀐 청크만 임베딩합니다.
+
+    - 새 청크는 batch_size 단위로 최대 max_concurrency 개의 배치를 동시에 임베딩
+    - 임베딩 실패(레이트 리밋 등)는 지수 백오프로 max_retries 번까지 재시도
+    - 배치가 끝날 때마다 바로 저장하므로, 중간에 죽어도 다시 실행하면
+      이미 저장된 청크(같은 ID)는 건너뛰고 이어서 진행
+    - 이번 코퍼스에 없는 청크(내용이 바뀌었거나 파일이 사라진 청크)는 마지막에 삭제
+    - 동기화가 끝나면 같은 청크로 BM25 인덱스(persist_directory/bm25/)를 다시 만듦
+    """
+
+    def __init__(
+        self,
+        persist_directory,
+        collection_name,
+        embeddings=None,
+        batch_size=100,
+        max_concurrency=4,
+        max_retries=5,
+        base_delay=1.0,
+    ):
+        self.persist_directory = persist_directory
+        self.collection_name = collection_name
+        self.embeddings = embeddings or get_embeddings()
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+        self.client = chromadb.PersistentClient(path=str(persist_directory))
+        self.collection = self.client.get_or_create_collection(collection_name)
+
+    def _existing_ids(self, page_size=5000):
+        ids = set()
+        offset = 0
+        while True:
+            rows = self.collection.get(include=[], limit=page_size, offset=offset)
+            ids.update(rows["ids"])
+            if len(rows["ids"]) < page_size:
+                return ids
+            offset += page_size
+
+    def _embed_with_retry(self, texts):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embeddings.embed_documents(texts)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.base_delay * (2 ** attempt) + random.uniform(0, self.base_delay)
+                print(f"⏳ 임베딩 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}초 후) - {e}")
+                time.sleep(delay)
+
+    def _embed_and_store(self, chunks):
+        batches = [
+            chunks[start:start + self.batch_size]
+            for start in range(0, len(chunks), self.batch_size)
+        ]
+        print(
+            f"💾 [{self.collection_name}] 배치 {len(batches)}개 처리 "
+            f"(batch_size={self.batch_size}, 동시 요청={self.max_concurrency})"
+        )
+
+        stored = 0
+        finished_batches = 0
+        started_at = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            in_flight = {}
+
+            def drain():
+                nonlocal stored, finished_batches
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch = in_flight.pop(future)
+                    vectors = future.result()
+                    self.collection.upsert(
+                        ids=[chunk_id for chunk_id, _ in batch],
+                        embeddings=vectors,
+                        documents=[doc.page_content for _, doc in batch],
+                        metadatas=[doc.metadata for _, doc in batch],
+                    )
+                    stored += len(batch)
+                    finished_batches += 1
+                    print(
+                        f"  ✅ {finished_batches}/{len(batches)} 배치 완료 "
+                        f"({stored}개 청크, {time.time() - started_at:.1f}초)"
+                    )
+
+            for batch in batches:
+                # 동시에 떠 있는 요청 수를 max_concurrency 로 제한
+                while len(in_flight) >= self.max_concurrency:
+                    drain()
+                texts = [doc.page_content for _, doc in batch]
+                in_flight[pool.submit(self._embed_with_retry, texts)] = batch
+
+            while in_flight:
+                drain()
+
+        return stored
+
+    def build_sparse_index(self):
+        """컬렉션 전체로 BM25 인덱스를 만들어 저장 (키워드/장절 검색은 임베딩 없이 처리)"""
+        started_at = time.time()
+        index = build_bm25_from_collection(self.collection)
+        path = bm25_index_path(self.persist_directory, self.collection_name)
+        index.save(path)
+        print(
+            f"🔤 [{self.collection_name}] BM25 인덱스 저장 "
+            f"({len(index)}개 청크, 용어 {len(index.postings)}개, {time.time() - started_at:.1f}초) -> {path}"
+        )
+        return index
+
+    def ingest(self, documents, prune=True):
+        """
+        documents(List[Document]) 를 컬렉션과 동기화하고, 새로 임베딩한 청크 수를 반환.
+        prune=True 면 이번 코퍼스에 없는 기존 청크를 삭제.
+        """
+        chunks = assign_chunk_ids(documents, default_source=self.collection_name)
+        existing_ids = self._existing_ids()
+        current_ids = {chunk_id for chunk_id, _ in chunks}
+
+        new_chunks = [(chunk_id, doc) for chunk_id, doc in chunks if chunk_id not in existing_ids]
+        stale_ids = list(existing_ids - current_ids) if prune else []
+        print(
+            f"🔎 [{self.collection_name}] 유지 {len(chunks) - len(new_chunks)}개 / "
+            f"추가 {len(new_chunks)}개 / 삭제 {len(stale_ids)}개"
+        )
+
+        stored = self._embed_and_store(new_chunks) if new_chunks else 0
+
+        # 새 청크 저장이 끝난 뒤에 삭제 (중간 실패 시 기존 내용이 먼저 사라지지 않도록)
+        for start in range(0, len(stale_ids), 5000):
+            self.collection.delete(ids=stale_ids[start:start + 5000])
+
+        print(f"✅ [{self.collection_name}] 동기화 완료! 새로 저장한 청크 {stored}개")
+
+        # 바뀐 게 없고 인덱스도 있으면 다시 만들지 않음
+        index_path = bm25_index_path(self.persist_directory, self.collection_name)
+        if new_chunks or stale_ids or not index_path.exists():
+            self.build_sparse_index()
+
+        if isinstance(self.embeddings, CachedEmbeddings):
+            print(f"📦 임베딩 캐시: {self.embeddings.stats()}")
+        return stored
+
+
+def ingest_documents(documents, persist_directory, collection_name, **kwargs):
+    """preprocess_* 에서 쓰는 간단한 진입점 (Chroma.from_documents 대체, 증분 동기화)"""
+    engine = IngestionEngine(persist_directory, collection_name, **kwargs)
+    return engine.ingest(documents)
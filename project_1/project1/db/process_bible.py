@@ -1,34 +1,46 @@
 from pathlib import Path
 import json
+import os
+import re
+import sys
 from langchain.docstore.document import Document
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from chunking import chunk_verse_windows
+from ingest import ingest_documents
 
-def preprocess_bible(file_path, persist_directory) :
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from utils.bible_refs import bible_refs_path, save_reference_index  # noqa: E402
+
+# "창1:1" -> (창 / 1 / 1)
+REFERENCE_PATTERN = re.compile(r"([ㄱ-ㅎ가-힣]+)(\d+):(\d+)")
+
+
+def preprocess_bible(file_path, persist_directory, mode=None) :
+    """
+    mode (기본: 환경변수 BIBLE_INDEX_MODE, 없으면 "window")
+    - "window": 같은 장 안의 연속된 절을 묶어서 저장 (벡터 수가 몇 분의 1로 줄고, 검색 결과마다 앞뒤 문맥 포함)
+    - "verse" : 기존처럼 절 하나당 문서 하나
+    어느 모드든 "창1:1" 정확 조회용 장절 색인(bible_refs.json)을 함께 저장합니다.
+    """
+    mode = mode or os.getenv("BIBLE_INDEX_MODE", "window")
     documents = (load_bible_json(file_path))
 
-    text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1500, 
-    chunk_overlap=200,
-    separators=["\n\n", "\n", " ", ""] # 문단 단위로 먼저 자르도록 유도
-    )
+    refs_path = bible_refs_path(persist_directory)
+    save_reference_index({doc.metadata["reference"]: doc.page_content for doc in documents}, refs_path)
+    print(f"📇 장절 색인 저장: {len(documents)}절 -> {refs_path}")
 
-    split_docs = text_splitter.split_documents(documents)
-    print(f"\n✂️ 총 {len(documents)}개의 말씀을 {len(split_docs)}개의 청크(조각)로 분할했습니다.")
+    if mode == "verse":
+        # 절 하나짜리 문서는 분할할 게 없음
+        split_docs = documents
+    else:
+        split_docs = list(chunk_verse_windows(documents))
+    print(f"\n✂️ [{mode}] 총 {len(documents)}개의 말씀을 {len(split_docs)}개의 청크(조각)로 분할했습니다.")
 
     if split_docs:
         print("💾 ChromaDB에 저장 중...")
 
-        # 임베딩 모델 명시 (검색 때와 동일하게!)
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-
-        vectorstore = Chroma.from_documents(
-            documents=split_docs,
-            embedding=embeddings,
-            persist_directory=persist_directory,
-            collection_name="bible" # "pastor_sermons"
-        )
+        ingest_documents(split_docs, persist_directory, collection_name="bible")
         print("✅ 저장 완료! DB가 업데이트되었습니다.")
     else:
         print("❌ 저장할 문서가 없습니다.")
@@ -42,8 +54,7 @@ def load_bible_json(file_path):
     
     for ref, content in bible_data.items():
         # 1. 정규표현식으로 "창1:1" 분리 (창 / 1 / 1)
-        import re
-        match = re.match(r"([ㄱ-ㅎ가-힣]+)(\d+):(\d+)", ref)
+        match = REFERENCE_PATTERN.match(ref)
         
         if match:
             book_abbr = match.group(1) # 창
@@ -1,21 +1,14 @@
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.document_loaders import DirectoryLoader, TextLoader
 from langchain_core.documents import Document
 from openai import OpenAI
 from youtube_transcript_api import YouTubeTranscriptApi
 import yt_dlp
-import time
-import random
-
-
-def polite_sleep(min_sec=2.0, max_sec=4.0):
-    delay = random.uniform(min_sec, max_sec)
-    print(f"😴 {delay:.2f}초 대기")
-    time.sleep(delay)
+from bubryune_pipeline import BubryunePipeline
+from chunking import chunk_qa_pairs
+from extract import extract_files
+from ingest import ingest_documents
 
 
 load_dotenv()
@@ -29,6 +22,8 @@ playlist_url = (
 )
 
 jukmun_dir = Path("jeukmun_transcripts")
+jukmun_summary_dir = Path("jeukmun_summaries")
+manifest_path = Path("jeukmun_manifest.json")
 
 
 def get_video_ids():
@@ -51,43 +46,12 @@ def get_video_ids():
     return video_ids
 
 
-def saving_txts(video_ids):
-    jukmun_dir.mkdir(exist_ok=True)
-
-    for idx, video_id in enumerate(video_ids, 1):
-        print(f"\n▶ [{idx}/{len(video_ids)}] {video_id}")
-        ytt_api = YouTubeTranscriptApi()
-
-        try:
-            transcript = ytt_api.fetch(video_id, languages=["ko"])
-
-            text = "\n".join(snippet.text for snippet in transcript)
-
-            file_path = jukmun_dir / f"{idx:03d}_{video_id}.txt"
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(text)
-
-            print(f"✅ 저장 완료: {file_path}")
-
-        except Exception as e:
-            print(f"❌ 실패: {video_id} / {e}")
-
-            # ❗ 실패 시 더 긴 대기
-            polite_sleep(5, 8)
-            continue
+def fetch_transcript(video_id):
+    transcript = YouTubeTranscriptApi().fetch(video_id, languages=["ko"])
+    return "\n".join(snippet.text for snippet in transcript)
 
-        # ✅ 정상 처리 후 기본 대기
-        polite_sleep(2, 4)
 
-        # ✅ 20개마다 쿨다운
-        if idx % 20 == 0:
-            print("🧊 쿨다운 타임 (15초)")
-            time.sleep(15)
-
-
-# 법륜스님 유튜브 데이터 크롤링
-# video_ids = get_video_ids()
-# saving_txts(video_ids)
+# 법륜스님 유튜브 데이터 크롤링 + 요약 (db.py 의 refresh_bubryune 참고)
 
 SYSTEM_PROMPT = """
 너는 법륜스님의 즉문즉설 대화를 정리하는 조력자이다.
@@ -130,84 +94,67 @@ def summarize_jeukmun(transcript: str) -> str:
     return response.choices[0].message.content
 
 
-def summarize_bubryune_data():
-    input_dir = Path("jeukmun_transcripts")
-    output_dir = Path("jeukmun_summaries")
-    output_dir.mkdir(exist_ok=True)
-
-    for txt_file in input_dir.glob("*.txt"):
-        raw_text = txt_file.read_text(encoding="utf-8")
+def refresh_bubryune(bub_dir=jukmun_summary_dir, persist_directory=None, **pipeline_options):
+    """
+    재생목록 -> 자막 -> 요약 -> (persist_directory 가 있으면) 색인.
+    jeukmun_manifest.json 에 영상별 진행 단계를 남기므로 다시 실행하면 새 영상/실패한 영상만 처리.
+    속도 제한/동시 실행 수는 pipeline_options (fetch_rate, summarize_rate, fetch_workers, ...) 로 조절.
+    """
+    def index():
+        preprocess_bubryune(bub_dir, persist_directory)
+
+    pipeline = BubryunePipeline(
+        manifest_path,
+        jukmun_dir,
+        bub_dir,
+        list_videos=get_video_ids,
+        fetch_transcript=fetch_transcript,
+        summarize=summarize_jeukmun,
+        index=index if persist_directory is not None else None,
+        **pipeline_options,
+    )
+    return pipeline.run()
 
-        summary = summarize_jeukmun(raw_text)
-        time.sleep(10)
 
-        output_file = output_dir / txt_file.name
-        output_file.write_text(summary, encoding="utf-8")
+def extract_bubryune_file(file_path):
+    """워커 프로세스용: 즉문즉설 요약 txt 하나 -> (metadata, 본문)"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
 
-        print(f"✅ 요약 완료: {output_file.name}")
+    # 파일명(확장자 제외)을 제목으로 사용
+    title = file_path.stem 
+    metadata = {
+        "source": "즉문즉설"+file_path.name[:3]+"강",      # 파일명 (예: sermon_01.txt)
+        "title": title,                # 제목 (예: sermon_01)
+        "author": "법륜스님",           # 작성자 고정
+        "category": "sermon"  # 카테고리 구분용
+    }
+    return metadata, content
 
 
-def preprocess_bubryune(bub_dir, persist_directory):
+def preprocess_bubryune(bub_dir, persist_directory, max_workers=None):
     print(f"📂 '{bub_dir}' 폴더에서 법륜스님 설교 데이터를 로드합니다...")
-    # 문서 로드
-    # documents = DirectoryLoader(
-    #     bub_dir,
-    #     glob="*.txt",
-    #     loader_cls=TextLoader,
-    #     loader_kwargs={"encoding": "utf-8"}, 
-    # ).load()
-    # print(documents)
-    documents = [] 
-    files = list(Path(bub_dir).glob("*.txt"))
-
-    # if not documents:
+    files = sorted(Path(bub_dir).glob("*.txt"))
+
     if not files :
         print("❌ 처리할 문서가 없습니다.")
         return
-    
-    for file_path in files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # 파일명(확장자 제외)을 제목으로 사용
-            title = file_path.stem 
-            print("즉문즉설 "+file_path.name[:3]+"강")
-            doc = Document(
-                page_content=content,
-                metadata={
-                    "source": "즉문즉설"+file_path.name[:3]+"강",      # 파일명 (예: sermon_01.txt)
-                    "title": title,                # 제목 (예: sermon_01)
-                    "author": "법륜스님",           # 작성자 고정
-                    "category": "sermon"  # 카테고리 구분용
-                }
-            )
-            documents.append(doc)
-            
-        except Exception as e:
-            print(f"⚠️ 파일 로드 실패 ({file_path.name}): {e}")
+
+    extracted = extract_files(files, extract_bubryune_file, max_workers=max_workers, label="법륜스님 TXT")
+    documents = [
+        Document(page_content=content, metadata=metadata) for _, (metadata, content) in extracted
+    ]
     
     print(f"✅ 총 {len(documents)}개의 설교 문서를 로드했습니다.")
 
-    # 텍스트 분할
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1500,
-        chunk_overlap=200,
-        separators=["\n\n", "\n", " ", ""]
-    )
-    split_docs = text_splitter.split_documents(documents)
+    # 텍스트 분할 (Q/A 쌍 단위)
+    split_docs = list(chunk_qa_pairs(documents))
     print(f"\n✂️ 총 {len(documents)}개의 설교를 {len(split_docs)}개의 청크로 분할했습니다.")
 
     # 벡터 DB 저장
     if split_docs:
         print("💾 ChromaDB에 저장 중...")
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        vectorstore = Chroma.from_documents(
-            documents=split_docs,
-            embedding=embeddings,
-            persist_directory=persist_directory,
-            collection_name="bubryune_works"
-        )
+        ingest_documents(split_docs, persist_directory, collection_name="bubryune_works")
         print("✅ 저장 완료! DB가 업데이트되었습니다.")
     else:
         print("❌ 저장할 청크가 없습니다.")
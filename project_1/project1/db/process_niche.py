@@ -1,34 +1,20 @@
 
 import re
 from langchain.docstore.document import Document
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from chunking import APHORISM_PATTERN, chunk_aphorisms
+from ingest import ingest_documents
 
 def preprocess_niche(file_path, persist_directory) :
     documents = load_nietzsche_txt(file_path)
 
-    text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1500, 
-    chunk_overlap=200,
-    separators=["\n\n", "\n", " ", ""] # 문단 단위로 먼저 자르도록 유도
-    )
-
-    split_docs = text_splitter.split_documents(documents)
+    # 문단(Aphorism) 중간에서 자르지 않고, 같은 챕터의 짧은 문단은 토큰 예산 안에서 묶음
+    split_docs = list(chunk_aphorisms(documents))
     print(f"\n✂️ 총 {len(documents)}개의 어록을 {len(split_docs)}개의 청크(조각)로 분할했습니다.")
 
     if split_docs:
         print("💾 ChromaDB에 저장 중...")
 
-        # 임베딩 모델 명시 (검색 때와 동일하게!)
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-
-        vectorstore = Chroma.from_documents(
-            documents=split_docs,
-            embedding=embeddings,
-            persist_directory=persist_directory,
-            collection_name="nietzsche_works" # "pastor_sermons"
-        )
+        ingest_documents(split_docs, persist_directory, collection_name="nietzsche_works")
         print("✅ 저장 완료! DB가 업데이트되었습니다.")
     else:
         print("❌ 저장할 문서가 없습니다.")
@@ -70,11 +56,11 @@ def load_nietzsche_txt(file_path):
         # 2. 챕터 내부에서 문단(Aphorism) 번호로 2차 분리하기
         # 니체 책은 보통 "1. 내용", "2. 내용" 형식이므로 숫자로 시작하는 문단을 찾습니다.
         # (?m)^\d+\. -> 멀티라인 모드에서 줄 첫머리에 숫자가 오고 점(.)이 찍힌 패턴
-        aphorism_pattern = r"(?m)^(\d+)\.\s+"
+        # (chunking.APHORISM_PATTERN 과 같은 패턴을 청크 분할에서도 사용)
         
         # 문단 번호를 기준으로 텍스트를 쪼갭니다.
         # 결과: [서론(번호없는앞부분), 번호1, 내용1, 번호2, 내용2...]
-        sections = re.split(aphorism_pattern, chapter_content)
+        sections = APHORISM_PATTERN.split(chapter_content)
         
         # sections[0]은 1번 문단 나오기 전의 서문일 수 있습니다. (내용 있으면 추가)
         if sections[0].strip():
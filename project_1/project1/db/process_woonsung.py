@@ -1,12 +1,10 @@
-import struct
-import zlib
-import olefile
 from pathlib import Path
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.docstore.document import Document
 from dotenv import load_dotenv
+from chunking import chunk_documents
+from extract import extract_files
+from hwp_reader import iter_hwp_paragraphs
+from ingest import ingest_documents
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 CONFIG_PATH = BASE_DIR / "config" / ".env"
@@ -16,61 +14,17 @@ load_dotenv(CONFIG_PATH)
 
 # --- 1. [핵심] HWP 텍스트 추출 함수 ---
 def get_hwp_text(filename):
-    f = olefile.OleFileIO(filename)
-    dirs = f.listdir()
-
-    if ["FileHeader"] not in dirs or \
-            ["\x05HwpSummaryInformation"] not in dirs:
-        raise Exception("Not Valid HWP.")
-
-    header = f.openstream("FileHeader")
-    header_data = header.read()
-    is_compressed = (header_data[36] & 1) == 1
-
-    nums = []
-    for d in dirs:
-        if d[0] == "BodyText":
-            nums.append(int(d[1][len("Section"):]))
-    sections = ["BodyText/Section" + str(x) for x in sorted(nums)]
-
-    text = ""
-    for section in sections:
-        bodytext = f.openstream(section)
-        data = bodytext.read()
-        if is_compressed:
-            unpacked_data = zlib.decompress(data, -15)
-        else:
-            unpacked_data = data
-
-        section_text = ""
-        i = 0
-        size = len(unpacked_data)
-        while i < size:
-            header = struct.unpack_from("<I", unpacked_data, i)[0]
-            rec_type = header & 0x3ff
-            rec_len = (header >> 20) & 0xfff
-
-            if rec_type in [67]:
-                rec_data = unpacked_data[i + 4:i + 4 + rec_len]
-                section_text += rec_data.decode('utf-16')
-                section_text += "\n"
-
-            i += 4 + rec_len
-
-        text += section_text
-        text += "\n"
-
-    return text
+    """
+    본문 문단을 스트리밍으로 읽어서 한 번에 합침 (hwp_reader 참고).
+    섹션을 통째로 메모리에 올리거나 문자열을 계속 이어 붙이지 않습니다.
+    """
+    return "\n".join(iter_hwp_paragraphs(filename))
 
 
 # --- 2. 설교 본문 정제 (제목, 서론~축도) ---
 def extract_core_sermon(hwp_path):
-    
-    try:
-        full_text = get_hwp_text(hwp_path)
-    except Exception as e:
-        print(f"❌ 파일 읽기 에러: {hwp_path.name} - {e}")
-        return None, None
+    # 읽기 에러는 그대로 올려서 추출 단계(extract_files)에서 실패로 집계
+    full_text = get_hwp_text(hwp_path)
 
     if not full_text:
         return None, None
@@ -79,69 +33,56 @@ def extract_core_sermon(hwp_path):
 
     return title, full_text.strip()
 
+
+def extract_woonsung_file(hwp_path):
+    """워커 프로세스용: HWP 하나 -> (metadata, 본문), 너무 짧으면 None"""
+    title, content = extract_core_sermon(hwp_path)
+    if not content or len(content) <= 50: # 너무 짧은 내용은 스킵
+        return None
+    metadata = {
+        "source": hwp_path.name,
+        "title": title,         
+        "author": "정운성 목사", 
+        "category": "sermon",
+    }
+    return metadata, content
+
     
 # --- 3. 문서 로드 및 객체 생성 ---
-def load_woonsung_hwp(hwf_dir): 
+def load_woonsung_hwp(hwf_dir, max_workers=None): 
     print(f"📂 HWP 폴더 읽기: {hwf_dir}")
     documents = [] 
     
     if hwf_dir.exists():
-        for hwp_path in hwf_dir.glob("*.hwp"): # .hwp 확장자 확인
-            
-            title, content = extract_core_sermon(hwp_path)
-
-            if content and len(content) > 50: # 너무 짧은 내용은 스킵
-                print(f" - [{title}] 로드 완료 ({len(content)}자)")
-                print(f" 🔍 메타데이터 추출 중: {hwp_path.name}")
-
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "source": hwp_path.name,
-                        "title": title,         
-                        "author": "정운성 목사", 
-                        "category": "sermon",
-                    }
-                )
-                documents.append(doc)
-            else:
-                print(f" ⚠️ 스킵: {hwp_path.name} (내용 없음 또는 패턴 불일치)")
+        extracted = extract_files(
+            sorted(hwf_dir.glob("*.hwp")), extract_woonsung_file, max_workers=max_workers, label="정운성 HWP"
+        )
+        for hwp_path, (metadata, content) in extracted:
+            print(f" - [{metadata['title']}] 로드 완료 ({len(content)}자)")
+            documents.append(Document(page_content=content, metadata=metadata))
     else:
         print("❌ 경로가 존재하지 않습니다.")
 
     return documents
 
 # --- 4. 메인 전처리 함수 ---
-def preprocess_woonsung(hwf_dir, persist_directory):
+def preprocess_woonsung(hwf_dir, persist_directory, max_workers=None):
     # 문서 로드
-    documents = load_woonsung_hwp(hwf_dir)
+    documents = load_woonsung_hwp(hwf_dir, max_workers=max_workers)
 
     if not documents:
         print("❌ 처리할 문서가 없습니다.")
         return
 
-    # 텍스트 분할
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1500, 
-        chunk_overlap=200,
-        separators=["\n\n", "\n", " ", ""] 
-    )
-
-    split_docs = text_splitter.split_documents(documents)
+    # 텍스트 분할 (문장 단위, 토큰 예산)
+    split_docs = list(chunk_documents(documents))
     print(f"\n✂️ 총 {len(documents)}개의 설교를 {len(split_docs)}개의 청크로 분할했습니다.")
 
     # 벡터 DB 저장
     if split_docs:
         print("💾 ChromaDB에 저장 중...")
 
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-
-        vectorstore = Chroma.from_documents(
-            documents=split_docs,
-            embedding=embeddings,
-            persist_directory=persist_directory,
-            collection_name="woonsung_works" # 컬렉션 이름 구분!
-        )
+        ingest_documents(split_docs, persist_directory, collection_name="woonsung_works")
         print("✅ 저장 완료! DB가 업데이트되었습니다.")
     else:
         print("❌ 저장할 청크가 없습니다.")
\ No newline at end of file
@@ -1,13 +1,12 @@
 import streamlit as st
 import time
 
+from backend.arena import ArenaEngine
 from backend.chat_service import get_chat_service
 from enums.target import AnswerTarget
-from utils.util import stream_data
 import streamlit as st
 from backend.chat_service import get_chat_service
 from enums.target import AnswerTarget
-from utils.util import stream_data
 
 # --- [1] 페이지 설정 및 CSS 스타일링 ---
 st.set_page_config(page_title="사상 토론", page_icon="⚔️", layout="wide")
@@ -28,12 +27,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- [2] 도우미 함수 ---
-def build_context_string(dialogue_history):
-    context_text = ""
-    for turn in dialogue_history:
-        context_text += f"{turn['speaker']}: {turn['content']}\n"
-    return context_text
-
 def reset_conversation():
     # 세션 스테이트의 대화 기록을 비웁니다.
     st.session_state.conversation_log = []
@@ -107,69 +100,38 @@ conversation_rounds = st.sidebar.slider(
 if start_btn:
     # 1. 초기화
     st.session_state.conversation_log = [] # 화면 초기화
-    full_dialogue_context = [] # AI에게 줄 문맥용 리스트 (이름, 내용)
-    
+
     # 서비스 로드
     left_service = get_chat_service(left_player)
     right_service = get_chat_service(right_player)
 
-    # ----------------------------------------------------
-    # [Round 0] Left Player 선공
-    # ----------------------------------------------------
-    with chat_container:
-        # Left Player는 항상 'assistant' 역할 (왼쪽 배치)
-        with st.chat_message("assistant", avatar=left_player.getAvatar()):
-            with st.spinner(f"{player_display_map[left_player]} 발언 준비 중..."):
-                msg_p1 = left_service.talk_arena(initial_topic, "") # 첫 턴이라 문맥 없음
-                st.write_stream(stream_data(msg_p1))
-    
-    # 기록 저장
-    st.session_state.conversation_log.append({"role": "assistant", "content": msg_p1})
-    full_dialogue_context.append({"speaker": left_player.value, "content": msg_p1})
+    # 엔진 생성과 동시에 양쪽 선수의 주제 검색이 백그라운드에서 시작됨 (반박 턴은 BM25 조회만 추가)
+    engine = ArenaEngine(left_service, right_service, initial_topic)
+
+    # 선수별 화면 설정: Left Player 는 'assistant'(좌측), Right Player 는 'user'(우측)
+    seats = {
+        "left": ("assistant", left_player),
+        "right": ("user", right_player),
+    }
 
     # ----------------------------------------------------
-    # [Loop] 티키타카 시작
+    # [Round 0] Left Player 선공 -> [Loop] 티키타카
     # ----------------------------------------------------
-    # 슬라이더로 값 받기
-    
-    for i in range(conversation_rounds):
-        
-        # === Right Player 턴 (우측) ===
-        # Streamlit에서 'user' role을 사용하면 아이콘이 오른쪽에 뜹니다.
-        context_str = build_context_string(full_dialogue_context)
-        last_msg = full_dialogue_context[-1]["content"]
+    for turn_index, (side, answer) in enumerate(engine.turns(conversation_rounds)):
+        role, player = seats[side]
+        if turn_index == 0:
+            spinner_text = f"{player_display_map[player]} 발언 준비 중..."
+        elif side == "right":
+            spinner_text = f"{player_display_map[player]} 반박 준비 중..."
+        else:
+            spinner_text = f"{player_display_map[player]} 재반박 준비 중..."
 
         with chat_container:
-            with st.chat_message("user", avatar=right_player.getAvatar()):
-                with st.spinner(f"{player_display_map[right_player]} 반박 준비 중..."):
-                    
-                    msg_p2 = right_service.talk_arena(
-                        topic_or_last_message=last_msg,
-                        full_dialogue_context=context_str
-                    )
-                    st.write_stream(stream_data(msg_p2))
-        
-        # 기록 저장 ('user' role로 저장)
-        st.session_state.conversation_log.append({"role": "user", "content": msg_p2})
-        full_dialogue_context.append({"speaker": right_player.value, "content": msg_p2})
-
+            with st.chat_message(role, avatar=player.getAvatar()):
+                with st.spinner(spinner_text):
+                    message = st.write_stream(answer)
 
-        # === Left Player 턴 (좌측) ===
-        context_str = build_context_string(full_dialogue_context)
-        last_msg = full_dialogue_context[-1]["content"]
-
-        with chat_container:
-            with st.chat_message("assistant", avatar=left_player.getAvatar()):
-                with st.spinner(f"{player_display_map[left_player]} 재반박 준비 중..."):
-                    
-                    msg_p1 = left_service.talk_arena(
-                        topic_or_last_message=last_msg,
-                        full_dialogue_context=context_str
-                    )
-                    st.write_stream(stream_data(msg_p1))
-        
-        # 기록 저장 ('assistant' role로 저장)
-        st.session_state.conversation_log.append({"role": "assistant", "content": msg_p1})
-        full_dialogue_context.append({"speaker": left_player.value, "content": msg_p1})
+        # 기록 저장
+        st.session_state.conversation_log.append({"role": role, "content": message})
 
-    st.success("토론이 종료되었습니다.")
\ No newline at end of file
+    st.success("토론이 종료되었습니다.")
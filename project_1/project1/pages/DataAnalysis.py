@@ -1,12 +1,11 @@
-import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
 from openai import OpenAI
 import streamlit as st
 import json
 import pandas as pd
-from backend.chat_service import get_chat_service
-from backend.mcp_service import mcp_query_db
+from backend.chat_service import analysis_data_with_all, get_chat_service
+from backend.mcp_service import query_db
 from config.mcp_tool import tools_schema
 from datetime import datetime
 import plotly.express as px
@@ -38,6 +37,30 @@ mentor_map = {mentor.author_name: mentor for mentor in mentors}
 # -------------------------------------------------------------------------
 # 2. Helper 함수: 차트 그리기
 # -------------------------------------------------------------------------
+def draw_columnar_chart(data):
+    """추세/교차표 도구의 컬럼형 JSON({"chart", "columns", x/y/color/z})을 그대로 차트로 출력"""
+    df = pd.DataFrame(data["columns"])
+    if df.empty:
+        st.info("해당 기간에 데이터가 없습니다.")
+        return
+
+    chart = data.get("chart")
+    if chart == "line":
+        st.caption("📈 기간별 추세")
+        fig = px.line(df, x=data["x"], y=data["y"], color=data.get("color"), markers=True)
+    elif chart == "heatmap":
+        st.caption("🧭 감정 x 멘토 교차표")
+        table = df.pivot_table(index=data["y"], columns=data["x"], values=data["z"], fill_value=0)
+        fig = px.imshow(table, text_auto=True, aspect="auto", color_continuous_scale="Blues")
+    else:
+        st.caption("🔑 멘토별 고민 키워드")
+        fig = px.bar(df, x=data["x"], y=data["y"], color=data.get("color"), barmode="group")
+
+    st.plotly_chart(fig, use_container_width=True)
+    with st.expander("상세 데이터 표 보기"):
+        st.dataframe(df)
+
+
 def draw_chart(json_data):
     """JSON 데이터를 받아 Pandas DF로 변환 후 Plotly 차트 출력"""
     if not json_data:
@@ -52,6 +75,11 @@ def draw_chart(json_data):
             st.error(f"서버 에러: {data['error']}")
             return
 
+        # 컬럼형 데이터 (추세 / 교차표 / 멘토별 키워드)
+        if isinstance(data, dict) and "columns" in data:
+            draw_columnar_chart(data)
+            return
+
         # 리스트 형태의 데이터인 경우 차트 생성
         if isinstance(data, list) and len(data) > 0:
             df = pd.DataFrame(data)
@@ -140,11 +168,16 @@ with st.sidebar:
             
             else:
                 with st.spinner("데이터 분석 중..."):
-                    for mentor_name in selected_mentors:
-                        advice, _ = mentor_map[mentor_name].analysis_data(target_data)
+                    # 선택한 멘토에게 동시에 요청 (검색 임베딩 공유), 도착하는 순서대로 출력
+                    selected_targets = [mentor_map[name].target for name in selected_mentors]
+                    for target, result in analysis_data_with_all(target_data, selected_targets):
+                        if isinstance(result, Exception):
+                            st.error(f"{target.value} : 분석 실패 ({result})")
+                            continue
+                        advice, _ = result
     
                         # 토스트 대신 확장형 박스 사용
-                        with st.expander(f"📩 {mentor_name}의 메세지 도착", expanded=True):
+                        with st.expander(f"📩 {target.value}의 메세지 도착", expanded=True):
                             st.write(advice)
                     # for mentor_name in selected_mentors:
                     #     advice, _ = mentor_map[mentor_name].analysis_data(target_data)
@@ -214,7 +247,7 @@ if user_input := st.chat_input("질문하세요 (예: 이번 달 고민 키워
             # 상태 표시
             with st.status(f"데이터 분석 중... ({func_name})", expanded=True) as status:
                 st.write(f"요청 인자: {func_args}")
-                tool_result = asyncio.run(mcp_query_db(func_name, func_args))
+                tool_result = query_db(func_name, func_args)
                 status.write("✅ 데이터 조회 완료!")
                 status.update(label="분석 완료", state="complete", expanded=False)
             
@@ -2,7 +2,6 @@ import streamlit as st
 import time
 import random
 from backend.chat_service import get_chat_service
-from utils.util import stream_data 
 from enums.target import TARGET_CONFIG, AnswerTarget, SermonState
 
 # --- 1. 페이지 설정 및 대상 정의 ---
@@ -69,10 +68,11 @@ if prompt := st.chat_input("심연을 들여다볼 질문을 던지시오..."):
         with st.spinner("니체가 자신의 사상을 펼치고 있습니다...."):
 
             # RAG 로직 호출
-            response_text, (state, source_text) = niche.get_response(prompt, st.session_state[SESSION_KEY])
+            answer = niche.stream_response(prompt, st.session_state[SESSION_KEY], session_key=SESSION_KEY)
             
-            # 3) 스트리밍 출력
-            st.write_stream(stream_data(response_text))
+            # 3) 스트리밍 출력 (모델 토큰을 받는 즉시 출력)
+            response_text = st.write_stream(answer)
+            state, source_text = answer.source_info
             
             # 4) 출처 표시 (즉시 보여주기용)
             if state == SermonState.FOUND:
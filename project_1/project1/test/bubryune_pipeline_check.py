@@ -0,0 +1,130 @@
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR / "db"))
+
+from bubryune_pipeline import BubryunePipeline, TokenBucket  # noqa: E402
+
+# ---------------------------------------------------------
+# 즉문즉설 단계별 파이프라인 확인 (유튜브 자막 API / LLM 대신 로컬 대역 사용)
+# 실행: python test/bubryune_pipeline_check.py
+# ---------------------------------------------------------
+FETCH_RATE = 20.0  # 초당 호출 수 (확인용으로 빠르게)
+SUMMARIZE_RATE = 10.0
+
+
+class FakeYouTube:
+    def __init__(self, video_ids, broken=()):
+        self.video_ids = list(video_ids)
+        self.broken = set(broken)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def list_videos(self):
+        return list(self.video_ids)
+
+    def fetch_transcript(self, video_id):
+        with self._lock:
+            self.calls.append((video_id, time.monotonic()))
+        time.sleep(0.05)  # 네트워크 지연 흉내
+        if video_id in self.broken:
+            raise RuntimeError("자막 없음")
+        return f"{video_id} 질문자: 요즘 불안합니다.\n스님: 지금 여기에 집중하세요."
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def summarize(self, transcript):
+        with self._lock:
+            self.calls.append(time.monotonic())
+        time.sleep(0.1)
+        return f"Q: {transcript.split()[0]} 의 고민\nA: 지금 여기에 집중하라는 답변."
+
+
+def make_pipeline(workdir, youtube, llm, indexed):
+    return BubryunePipeline(
+        workdir / "manifest.json",
+        workdir / "transcripts",
+        workdir / "summaries",
+        list_videos=youtube.list_videos,
+        fetch_transcript=youtube.fetch_transcript,
+        summarize=llm.summarize,
+        index=lambda: indexed.append(len(list((workdir / "summaries").glob("*.txt")))),
+        fetch_rate=FETCH_RATE,
+        summarize_rate=SUMMARIZE_RATE,
+        fetch_workers=4,
+        summarize_workers=4,
+        max_attempts=2,
+    )
+
+
+def max_rate(timestamps, window=1.0):
+    """1초 창 안에 들어간 최대 호출 수"""
+    timestamps = sorted(timestamps)
+    return max(
+        (sum(1 for t in timestamps[i:] if t - start < window) for i, start in enumerate(timestamps)),
+        default=0,
+    )
+
+
+if __name__ == "__main__":
+    # 1) 토큰 버킷: 가짜 시계로 속도 확인
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=1, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+    for _ in range(5):
+        bucket.acquire()
+    assert abs(now[0] - 2.0) < 1e-9, now[0]  # 첫 번째는 즉시, 나머지 4번은 0.5초 간격
+    print("✅ 토큰 버킷: 초당 2회 -> 5회에 2.0초")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        youtube = FakeYouTube([f"vid{i:02d}" for i in range(30)], broken={"vid07"})
+        llm = FakeLLM()
+        indexed = []
+
+        # 2) 첫 실행: 전부 처리 (고장 난 1개 제외), 속도 제한 준수
+        started_at = time.monotonic()
+        result = make_pipeline(workdir, youtube, llm, indexed).run()
+        elapsed = time.monotonic() - started_at
+        assert result == {"listed": 30, "fetched": 29, "summarized": 29, "indexed": 29}, result
+        assert max_rate([t for _, t in youtube.calls]) <= FETCH_RATE + 1
+        assert max_rate(llm.calls) <= SUMMARIZE_RATE + 1
+        print(
+            f"✅ 첫 실행 {elapsed:.1f}초: 자막 {len(youtube.calls)}회, 요약 {len(llm.calls)}회, "
+            f"최대 초당 자막 {max_rate([t for _, t in youtube.calls])}회 / 요약 {max_rate(llm.calls)}회"
+        )
+
+        # 3) 다시 실행: 새 작업 없음 (실패한 영상만 한 번 더 시도)
+        fetch_calls, llm_calls = len(youtube.calls), len(llm.calls)
+        result = make_pipeline(workdir, youtube, llm, indexed).run()
+        assert result == {"listed": 0, "fetched": 0, "summarized": 0, "indexed": 0}, result
+        assert [v for v, _ in youtube.calls[fetch_calls:]] == ["vid07"]
+        assert len(llm.calls) == llm_calls and len(indexed) == 1
+        print("✅ 재실행: 실패 영상 재시도 1회 외에는 호출 없음")
+
+        # 4) 재생목록에 새 영상 3개 추가 -> 그것만 처리
+        youtube.video_ids += ["new1", "new2", "new3"]
+        fetch_calls, llm_calls = len(youtube.calls), len(llm.calls)
+        result = make_pipeline(workdir, youtube, llm, indexed).run()
+        assert result == {"listed": 3, "fetched": 3, "summarized": 3, "indexed": 3}, result
+        assert sorted(v for v, _ in youtube.calls[fetch_calls:]) == ["new1", "new2", "new3"]
+        assert len(llm.calls) - llm_calls == 3
+        assert (workdir / "summaries" / "031_new1.txt").exists()
+        print("✅ 재생목록 갱신: 새 영상 3개만 자막/요약/색인")
+
+        # 5) 예전 방식으로 받아 둔 자막 파일이 있으면 API 호출 없이 채택
+        youtube.video_ids.append("legacy")
+        (workdir / "transcripts" / "034_legacy.txt").write_text("legacy 예전 자막", encoding="utf-8")
+        fetch_calls = len(youtube.calls)
+        make_pipeline(workdir, youtube, llm, indexed).run()
+        assert len(youtube.calls) == fetch_calls
+        print("✅ 기존 자막 파일 채택: 자막 API 호출 없음")
+
+    print("🎉 모든 확인 통과")
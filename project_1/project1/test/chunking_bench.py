@@ -0,0 +1,93 @@
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(BASE_DIR / "db"))
+
+from chunking import chunk_aphorisms, chunk_documents, chunk_qa_pairs, chunk_verse_windows  # noqa: E402
+from utils.tokens import count_tokens  # noqa: E402
+
+# ---------------------------------------------------------
+# 청크 분할 벤치마크: 기존 RecursiveCharacterTextSplitter(1500자/200자) vs chunking 모듈
+# 합성 코퍼스(설교/니체 문단/성경 절/즉문즉설 Q&A)로 속도, 청크 수, 토큰 분포를 비교
+# ---------------------------------------------------------
+random.seed(0)
+WORDS = ["하나님의", "사랑은", "우리", "마음을", "평안하게", "합니다", "고난", "가운데서도", "소망을", "잃지", "않고", "기도하며"]
+
+
+def sentence():
+    return " ".join(random.choice(WORDS) for _ in range(random.randint(5, 20))) + random.choice([".", "!", "?"])
+
+
+def paragraph():
+    return " ".join(sentence() for _ in range(random.randint(2, 8)))
+
+
+def make_corpus():
+    sermons = [
+        Document(page_content="\n\n".join(paragraph() for _ in range(random.randint(20, 60))), metadata={"title": f"설교{i}"})
+        for i in range(300)
+    ]
+    aphorisms = [
+        Document(
+            page_content=f"{n}. " + " ".join(sentence() for _ in range(random.randint(1, 12))),
+            metadata={"chapter_num": f"C{n // 40}", "section_num": n, "full_ref": f"C{n // 40} - §{n}"},
+        )
+        for n in range(1, 300)
+    ]
+    verses = [
+        Document(
+            page_content=f"[창{c}:{v}] {sentence()}",
+            metadata={"book_abbr": "창", "chapter": c, "verse": v, "reference": f"창{c}:{v}"},
+        )
+        for c in range(1, 1001)
+        for v in range(1, 32)
+    ]
+    qa = [
+        Document(page_content=f"Q: {sentence()}\nA: " + " ".join(sentence() for _ in range(5)), metadata={"source": f"{i}강"})
+        for i in range(182)
+    ]
+    return {"설교": sermons, "니체": aphorisms, "성경": verses, "즉문즉설": qa}
+
+
+STRATEGIES = {
+    "설교": chunk_documents,
+    "니체": chunk_aphorisms,
+    "성경": chunk_verse_windows,
+    "즉문즉설": chunk_qa_pairs,
+}
+
+
+def describe(name, chunks, elapsed):
+    tokens = [count_tokens(doc.page_content) for doc in chunks]
+    print(
+        f"  {name:<10} {elapsed:6.2f}초, 청크 {len(chunks):6d}개, 토큰 합 {sum(tokens):9d}, "
+        f"평균 {statistics.mean(tokens):6.0f} / 최소 {min(tokens):5d} / 최대 {max(tokens):5d} / "
+        f"표준편차 {statistics.pstdev(tokens):6.0f}"
+    )
+
+
+if __name__ == "__main__":
+    corpus = make_corpus()
+    baseline = RecursiveCharacterTextSplitter(
+        chunk_size=1500, chunk_overlap=200, separators=["\n\n", "\n", " ", ""]
+    )
+
+    for kind, documents in corpus.items():
+        size = sum(len(doc.page_content) for doc in documents)
+        print(f"📄 {kind}: 문서 {len(documents)}개, {size / 1024 / 1024:.1f}M자")
+
+        started_at = time.perf_counter()
+        chunks = baseline.split_documents(documents)
+        describe("기존", chunks, time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        chunks = list(STRATEGIES[kind](documents))
+        describe("chunking", chunks, time.perf_counter() - started_at)
@@ -0,0 +1,100 @@
+import io
+import struct
+import sys
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR / "db"))
+
+from hwp_reader import HWPTAG_PARA_TEXT, iter_section_paragraphs  # noqa: E402
+
+# ---------------------------------------------------------
+# HWP 본문(BodyText/Section) 파싱 벤치마크: 기존 방식 vs 스트리밍 리더
+# 실제 HWP 대신 같은 레코드 형식의 합성 섹션 스트림(수 MB)을 만들어 비교
+# ---------------------------------------------------------
+HWPTAG_PARA_HEADER = 66
+HWPTAG_PARA_CHAR_SHAPE = 68
+PARAGRAPHS = 20_000
+LONG_EVERY = 50  # 이 간격마다 4095바이트를 넘는 긴 문단 (확장 크기 레코드)
+
+
+def make_record(tag_id, payload, level=0):
+    if len(payload) < 0xFFF:
+        return struct.pack("<I", tag_id | (level << 10) | (len(payload) << 20)) + payload
+    return struct.pack("<II", tag_id | (level << 10) | (0xFFF << 20), len(payload)) + payload
+
+
+def make_section():
+    """(압축된 섹션 바이트, 기대 문단 목록)"""
+    records = []
+    expected = []
+    for i in range(PARAGRAPHS):
+        body = f"{i}번째 문단입니다. 하나님의 말씀은 우리 삶의 등불입니다. "
+        body *= 40 if i % LONG_EVERY == 0 else 3
+        # 구역 정의 같은 확장 제어(8 WCHAR) + 문단 끝(13)
+        control = "\x02dces\x00\x00\x02" if i == 0 else ""
+        text = control + body + "\r"
+        records.append(make_record(HWPTAG_PARA_HEADER, b"\x00" * 22))
+        records.append(make_record(HWPTAG_PARA_TEXT, text.encode("utf-16-le"), level=1))
+        records.append(make_record(HWPTAG_PARA_CHAR_SHAPE, b"\x00" * 8, level=1))
+        expected.append(body)
+
+    raw = b"".join(records)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compressor.compress(raw) + compressor.flush(), expected, len(raw)
+
+
+def legacy_parse(data, is_compressed=True):
+    """기존 get_hwp_text 의 섹션 처리 (한 번에 압축 해제 + 문자열 이어 붙이기)"""
+    unpacked_data = zlib.decompress(data, -15) if is_compressed else data
+    section_text = ""
+    i = 0
+    size = len(unpacked_data)
+    while i < size:
+        header = struct.unpack_from("<I", unpacked_data, i)[0]
+        rec_type = header & 0x3ff
+        rec_len = (header >> 20) & 0xfff
+        if rec_type in [HWPTAG_PARA_TEXT]:
+            rec_data = unpacked_data[i + 4:i + 4 + rec_len]
+            section_text += rec_data.decode("utf-16", errors="replace")
+            section_text += "\n"
+        i += 4 + rec_len
+    return section_text
+
+
+def streaming_parse(data):
+    return "\n".join(iter_section_paragraphs(io.BytesIO(data), compressed=True))
+
+
+def measure(name, fn, data):
+    started_at = time.perf_counter()
+    result = fn(data)
+    elapsed = time.perf_counter() - started_at
+
+    # 메모리는 따로 한 번 더 (tracemalloc 은 실행 시간을 크게 늘림)
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {name:<10} {elapsed:7.3f}초, 최대 메모리 {peak / 1024 / 1024:7.1f}MB")
+    return result
+
+
+if __name__ == "__main__":
+    data, expected, raw_size = make_section()
+    print(
+        f"📄 합성 섹션: 문단 {PARAGRAPHS}개, 압축 {len(data) / 1024 / 1024:.1f}MB "
+        f"/ 해제 {raw_size / 1024 / 1024:.1f}MB"
+    )
+
+    legacy = measure("기존", legacy_parse, data)
+    streamed = measure("스트리밍", streaming_parse, data)
+
+    # 정확도: 확장 크기 레코드(긴 문단)를 제대로 읽었는지
+    paragraphs = streamed.split("\n")
+    legacy_paragraphs = legacy.rstrip("\n").split("\n")
+    print(f"✅ 스트리밍: 문단 {len(paragraphs)}/{len(expected)}개, 일치={paragraphs == expected}")
+    print(f"⚠️ 기존: 문단 {len(legacy_paragraphs)}/{len(expected)}개, 일치={legacy_paragraphs == expected}")
@@ -0,0 +1,97 @@
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from backend.reranker import EmbeddingReranker  # noqa: E402
+from utils.bible_refs import BibleReferenceIndex  # noqa: E402
+from utils.embedding_cache import CachedEmbeddings  # noqa: E402
+
+# ---------------------------------------------------------
+# 임베딩 재순위화 확인 (OpenAI 대신 점수를 정해 둔 가짜 임베딩)
+# - 상대 기준(최고 점수 근처만) / 서비스별 최저 점수
+# - id 없는 성경 구절은 CachedEmbeddings 로 한 번만 임베딩
+# 실행: python test/rerank_check.py
+# ---------------------------------------------------------
+QUERY = [1.0, 0.0, 0.0]
+
+
+def vector_with_score(score, spread):
+    """질문과의 코사인 유사도가 score 인 단위 벡터 (spread 로 문서끼리 방향을 다르게)"""
+    rest = (1 - score * score) ** 0.5
+    return [score, rest * np.cos(spread), rest * np.sin(spread)]
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.document_calls = []
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [self.vectors.get(text, vector_with_score(0.1, 0.0)) for text in texts]
+
+    def embed_query(self, text):
+        return QUERY
+
+
+def docs_with_scores(scores):
+    docs = [Document(page_content=f"문서 {i} ({score})") for i, score in enumerate(scores)]
+    vectors = {doc.page_content: vector_with_score(score, i) for i, (doc, score) in enumerate(zip(docs, scores))}
+    return docs, vectors
+
+
+def picked(reranker, docs):
+    return [doc.page_content for doc in reranker.rerank("질문", docs)]
+
+
+if __name__ == "__main__":
+    # 1) 번역 질의 vs 영어 원문처럼 점수가 전반적으로 낮은 컬렉션
+    docs, vectors = docs_with_scores([0.05, 0.24, 0.12, 0.27])
+    embeddings = FakeEmbeddings(vectors)
+    old = EmbeddingReranker(embeddings, score_threshold=0.3, relative_margin=None)
+    nietzsche = EmbeddingReranker(embeddings, score_threshold=0.2)
+    assert picked(old, docs) == [docs[0].page_content, docs[1].page_content]  # 검색 순서 앞의 2개로 대체
+    assert picked(nietzsche, docs) == [docs[3].page_content, docs[1].page_content]
+    print("✅ 낮은 점수 분포: 고정 0.3 은 검색 순서로 대체, 서비스별 0.2 + 상대 기준은 상위 2개 선택")
+
+    # 2) 한 문서만 확실히 관련 있는 경우: 고정 기준은 애매한 문서까지, 상대 기준은 그 문서만
+    docs, vectors = docs_with_scores([0.41, 0.82, 0.44])
+    embeddings = FakeEmbeddings(vectors)
+    old = EmbeddingReranker(embeddings, score_threshold=0.3, relative_margin=None)
+    relative = EmbeddingReranker(embeddings, score_threshold=0.3)
+    assert len(picked(old, docs)) == 2
+    assert picked(relative, docs) == [docs[1].page_content]
+    print("✅ 높은 점수 분포: 상대 기준은 최고 점수 근처 문서만 선택")
+
+    # 3) 관련 문서가 없으면 (최고 점수 < 최저 점수) 기존처럼 앞의 2개
+    docs, vectors = docs_with_scores([0.1, 0.12, 0.08])
+    assert picked(EmbeddingReranker(FakeEmbeddings(vectors)), docs) == [d.page_content for d in docs[:2]]
+    print("✅ 관련 문서 없음: 검색 순서 앞의 2개로 대체")
+
+    # 4) 장절 직접 조회 문서(id 없음)는 두 번째 질문부터 임베딩 API 를 부르지 않음
+    refs = BibleReferenceIndex({"요3:16": "[요3:16] 하나님이 세상을 이처럼 사랑하사", "요3:17": "[요3:17] 하나님이 그 아들을"})
+    verse_docs = refs.lookup("요3:16-17 말씀이 궁금해요")
+    assert verse_docs and all(getattr(doc, "id", None) is None for doc in verse_docs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        underlying = FakeEmbeddings({doc.page_content: vector_with_score(0.6, i) for i, doc in enumerate(verse_docs)})
+        cached = CachedEmbeddings(underlying, model_name="fake", db_path=Path(tmp) / "embeddings.db")
+        reranker = EmbeddingReranker(cached, vectorstore=None)
+        for _ in range(3):
+            assert len(reranker.rerank("질문", verse_docs)) == 2
+        assert len(underlying.document_calls) == 1, underlying.document_calls
+
+        # 서버를 다시 띄워도 (메모리 캐시가 비어도) 디스크 캐시에서
+        restarted = CachedEmbeddings(underlying, model_name="fake", db_path=Path(tmp) / "embeddings.db")
+        EmbeddingReranker(restarted).rerank("질문", verse_docs)
+        assert len(underlying.document_calls) == 1
+    print("✅ id 없는 성경 구절: 재순위화 3번 + 재시작 후에도 임베딩 API 는 1번만")
+
+    print("🎉 모든 확인 통과")
@@ -0,0 +1,111 @@
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from langchain_chroma import Chroma
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CONFIG_PATH = BASE_DIR / "config" / ".env"
+sys.path.append(str(BASE_DIR))
+
+load_dotenv(CONFIG_PATH)
+
+from backend.reranker import EmbeddingReranker, LLMReranker  # noqa: E402
+
+# ---------------------------------------------------------
+# 오프라인 재순위화 비교: LLM 선택 vs 로컬 임베딩(MMR) 선택
+# LLM 선택 결과를 기준(정답)으로 두고, 로컬 방식이 얼마나 같은 문서를 고르는지 측정
+# 니체(영어 원문 컬렉션)는 서비스처럼 한국어 질문을 번역해서 검색하고,
+# 한국어 질문 / 번역문으로 채점했을 때를 나란히 비교
+# ---------------------------------------------------------
+DB_PATH = BASE_DIR / "chroma_vector_db"
+# (컬렉션, 번역 검색 여부, 서비스별 최저 점수 - chat_service 의 rerank_threshold 와 같게)
+COLLECTIONS = [
+    ("yujin_works", False, 0.3),
+    ("woonsung_works", False, 0.3),
+    ("bubryune_works", False, 0.3),
+    ("nietzsche_works", True, 0.2),
+]
+QUESTIONS = [
+    "요즘 너무 불안해서 잠을 잘 못 자요.",
+    "취업이 계속 안 돼서 자존감이 떨어집니다.",
+    "가족과의 관계가 너무 힘들어요.",
+    "친구가 저를 배신한 것 같아 용서가 안 됩니다.",
+    "열심히 사는데 왜 행복하지 않을까요?",
+]
+
+embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
+
+def translate(question):
+    # NietzscheService._translate 와 같은 프롬프트
+    prompt = f"""
+    영문으로 번역하고 번역한 문장만 출력해줘
+    질문: {question}
+    """
+    return llm.invoke(prompt).content
+
+
+def jaccard(a_docs, b_docs):
+    a = {d.page_content for d in a_docs}
+    b = {d.page_content for d in b_docs}
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def evaluate(collection_name, translated, threshold):
+    vectorstore = Chroma(
+        persist_directory=DB_PATH,
+        embedding_function=embeddings,
+        collection_name=collection_name,
+    )
+    llm_reranker = LLMReranker(llm)
+    # 예전 방식(고정 0.3) vs 지금 방식(서비스별 최저 점수 + 최고 점수 기준 상대 컷)
+    rerankers = {
+        "고정0.3": EmbeddingReranker(embeddings, vectorstore=vectorstore, score_threshold=0.3, relative_margin=None),
+        "상대": EmbeddingReranker(embeddings, vectorstore=vectorstore, score_threshold=threshold),
+    }
+
+    results = {}
+    llm_times = []
+    for question in QUESTIONS:
+        search_query = translate(question) if translated else question
+        candidates = vectorstore.similarity_search(search_query, k=6)
+
+        start = time.perf_counter()
+        llm_docs = llm_reranker.rerank(search_query, candidates)
+        llm_times.append(time.perf_counter() - start)
+
+        print(f"  Q: {question}" + (f" -> {search_query}" if translated else ""))
+        # 번역 검색 컬렉션은 예전처럼 한국어 원문으로 채점했을 때도 같이 봄
+        queries = {"": search_query, "(한국어 채점)": question} if translated else {"": search_query}
+        for suffix, query in queries.items():
+            query_embedding = embeddings.embed_query(query)
+            best = float(rerankers["상대"].score(query, candidates, query_embedding).max())
+            for name, reranker in rerankers.items():
+                key = name + suffix
+                stats = results.setdefault(key, {"overlap": [], "time": [], "fallback": 0})
+                start = time.perf_counter()
+                local_docs = reranker.rerank(query, candidates, query_embedding)
+                stats["time"].append(time.perf_counter() - start)
+                stats["overlap"].append(jaccard(llm_docs, local_docs))
+                stats["fallback"] += best < reranker.score_threshold
+                print(
+                    f"     [{key}] 최고 점수 {best:.2f} / LLM {len(llm_docs)}개 / 로컬 {len(local_docs)}개 / "
+                    f"일치도(Jaccard) {stats['overlap'][-1]:.2f}"
+                )
+
+    print(f"📊 [{collection_name}] LLM 평균 {1000 * sum(llm_times) / len(llm_times):.1f} ms")
+    for key, stats in results.items():
+        print(
+            f"   [{key}] 평균 일치도 {sum(stats['overlap']) / len(stats['overlap']):.2f}, "
+            f"대체(관련 문서 없음) {stats['fallback']}/{len(stats['overlap'])}번, "
+            f"평균 {1000 * sum(stats['time']) / len(stats['time']):.1f} ms"
+        )
+
+
+for name, translated, threshold in COLLECTIONS:
+    print(f"\n──────── {name} ────────")
+    evaluate(name, translated, threshold)
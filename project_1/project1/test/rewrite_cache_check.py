@@ -0,0 +1,107 @@
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from utils.embedding_cache import CachedEmbeddings  # noqa: E402
+from utils.query_rewrite_cache import QueryRewriteCache  # noqa: E402
+
+# ---------------------------------------------------------
+# 질의 재작성 / 질의 임베딩 캐시의 동시 요청 확인 (LLM / OpenAI 대신 느린 가짜 함수)
+# - 두 목회자가 retrieve_for_all 에서 같은 질문을 동시에 재작성해도 LLM 은 1번
+# - 재작성 문장 임베딩도 동시에 요청하면 API 는 1번
+# 실행: python test/rewrite_cache_check.py
+# ---------------------------------------------------------
+
+
+class SlowRewriter:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, question):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        if self.fail:
+            raise TimeoutError("LLM 응답 없음")
+        return f"검색 문장: {question}"
+
+
+class SlowEmbeddings(Embeddings):
+    def __init__(self):
+        self.query_calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        time.sleep(0.2)
+        return [float(len(text)), 1.0, 0.0]
+
+
+def run_together(fn, args_list):
+    with ThreadPoolExecutor(max_workers=len(args_list)) as pool:
+        return list(pool.map(lambda args: fn(*args), args_list))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # 1) 같은 질문(띄어쓰기/물음표만 다른 것 포함)을 동시에 재작성 -> LLM 1번, 결과 공유
+        cache = QueryRewriteCache(tmp / "rewrites.db")
+        rewriter = SlowRewriter()
+        question = "요즘 너무 불안해요"
+        started_at = time.perf_counter()
+        results = run_together(
+            cache.rewrite,
+            [("pastor_search_v1", question, rewriter), ("pastor_search_v1", question + "?", rewriter)],
+        )
+        elapsed = time.perf_counter() - started_at
+        assert rewriter.calls == 1, rewriter.calls
+        assert results == [f"검색 문장: {question}"] * 2, results
+        assert elapsed < 0.35, elapsed
+        print(f"✅ 동시 재작성: 두 멘토 요청에 LLM 1번 ({elapsed:.2f}초)")
+
+        # 끝난 뒤에는 캐시에서
+        assert cache.rewrite("pastor_search_v1", question, rewriter) == results[0]
+        assert rewriter.calls == 1
+
+        # 2) 진행 중이던 변환이 실패하면 기다리던 쪽도 같은 예외, 다음 요청은 다시 시도
+        failing = SlowRewriter(fail=True)
+        outcomes = []
+
+        def attempt():
+            try:
+                outcomes.append(cache.rewrite("nietzsche_en_v1", question, failing))
+            except TimeoutError as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=attempt) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert failing.calls == 1 and all(isinstance(o, TimeoutError) for o in outcomes), outcomes
+        assert cache.rewrite("nietzsche_en_v1", question, SlowRewriter()) == f"검색 문장: {question}"
+        print("✅ 실패 공유: 기다리던 요청도 같은 예외, 다음 요청은 새로 재작성")
+
+        # 3) 재작성 문장 임베딩을 동시에 요청 -> 임베딩 API 1번
+        underlying = SlowEmbeddings()
+        embeddings = CachedEmbeddings(underlying, model_name="fake", db_path=tmp / "embeddings.db")
+        vectors = run_together(embeddings.embed_query, [(results[0],)] * 3)
+        assert underlying.query_calls == 1, underlying.query_calls
+        assert vectors[0] == vectors[1] == vectors[2]
+        print("✅ 동시 임베딩: 같은 문장 3번 요청에 API 1번")
+
+    print("🎉 모든 확인 통과")
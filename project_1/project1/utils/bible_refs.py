@@ -0,0 +1,86 @@
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List, Set
+
+from langchain_core.documents import Document
+
+# "창1:1", "창 1:1", "요3:16-18", "시23:1~3"
+REFERENCE_PATTERN = re.compile(r"([가-힣]+)\s?(\d+)\s?:\s?(\d+)(?:\s?[-~]\s?(\d+))?")
+MAX_RANGE = 20  # 범위 인용은 최대 20절까지만
+
+
+def bible_refs_path(persist_directory) -> Path:
+    return Path(persist_directory) / "bible_refs.json"
+
+
+def save_reference_index(verses: Dict[str, str], path):
+    """{"창1:1": "[창1:1] 태초에 ..."} 를 저장 (db/process_bible.py 에서 적재 때 생성)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(verses, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def _expand_references(text: str) -> Iterator[str]:
+    """text 안의 장절 표기를 절 하나씩 "창1:1" 형태로 (범위는 펼침)"""
+    for book, chapter, verse, verse_end in REFERENCE_PATTERN.findall(unicodedata.normalize("NFKC", text)):
+        start = int(verse)
+        end = min(int(verse_end), start + MAX_RANGE - 1) if verse_end else start
+        for number in range(start, end + 1):
+            yield f"{book}{chapter}:{number}"
+
+
+def reference_keys(text: str) -> Set[str]:
+    """"요3:16-18 말씀" -> {"요3:16", "요3:17", "요3:18"}"""
+    return set(_expand_references(text))
+
+
+def mentions_reference(doc: Document, references: Set[str]) -> bool:
+    """본문이나 reference 메타데이터(절 묶음 "창1:1-5" 포함)에 references 중 하나가 있는지"""
+    text = f"{doc.page_content} {doc.metadata.get('reference', '')}"
+    return not references.isdisjoint(_expand_references(text))
+
+
+# ==========================================
+# 장절 직접 조회
+# ==========================================
+class BibleReferenceIndex:
+    """
+    장절 표기 -> 본문 사전.
+    질문에 "창1:1" 같은 정확한 장절이 있으면 벡터 검색 없이 사전 조회로 바로 본문을 찾습니다.
+    """
+
+    def __init__(self, verses: Dict[str, str] = None):
+        self.verses = verses or {}
+
+    @classmethod
+    def load(cls, path) -> "BibleReferenceIndex":
+        path = Path(path)
+        if not path.exists():
+            print(f"ℹ️ 성경 장절 색인 없음 ({path}), 장절 직접 조회를 건너뜁니다.")
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.verses)
+
+    def lookup(self, text: str) -> List[Document]:
+        """text 에 들어 있는 장절(범위 포함)의 본문 Document 목록 (순서 유지, 중복 제거)"""
+        if not self.verses:
+            return []
+
+        found = {}
+        for reference in _expand_references(text):
+            content = self.verses.get(reference)
+            if content is not None:
+                found.setdefault(reference, content)
+
+        return [
+            Document(page_content=content, metadata={"title": f"성경 {reference}", "reference": reference})
+            for reference, content in found.items()
+        ]
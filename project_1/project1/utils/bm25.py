@@ -0,0 +1,177 @@
+import math
+import pickle
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# 성경 장절 표기 (창1:1, 요한복음 3:16 등)
+REFERENCE_PATTERN = re.compile(r"([가-힣]+)\s?(\d+)\s?:\s?(\d+)")
+WORD_PATTERN = re.compile(r"[가-힣]+|[a-z]+|\d+")
+
+# 자주 붙는 조사/어미 (형태소 분석기 없이 어간을 대략 맞추기 위한 용도)
+JOSA_SUFFIXES = sorted(
+    [
+        "으로서", "으로써", "에게서", "이라고", "이라는", "에서는", "으로는",
+        "에서", "에게", "으로", "처럼", "까지", "부터", "보다", "이다", "라고", "라는", "하고",
+        "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "만", "로", "께",
+    ],
+    key=len,
+    reverse=True,
+)
+
+
+# ==========================================
+# 한국어 토크나이저
+# ==========================================
+def _strip_josa(word: str) -> str:
+    for suffix in JOSA_SUFFIXES:
+        if len(word) > len(suffix) + 1 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize_ko(text: str) -> List[str]:
+    """
+    - 성경 장절(창1:1)은 하나의 토큰으로
+    - 한글 단어는 원형 + 조사 제거형 + 글자 bigram (띄어쓰기/활용 차이 보완)
+    - 영어는 소문자 단어, 숫자는 그대로
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = [f"{book}{chapter}:{verse}" for book, chapter, verse in REFERENCE_PATTERN.findall(text)]
+
+    for word in WORD_PATTERN.findall(text):
+        tokens.append(word)
+        if "가" <= word[0] <= "힣":
+            stem = _strip_josa(word)
+            if stem != word:
+                tokens.append(stem)
+            tokens.extend(f"#{stem[i:i + 2]}" for i in range(len(stem) - 1))
+    return tokens
+
+
+# ==========================================
+# BM25 인덱스
+# ==========================================
+class BM25Index:
+    """
+    컬렉션 하나의 로컬 희소(BM25) 인덱스.
+    Chroma 와 같은 청크 ID / 본문 / 메타데이터를 들고 있어서 검색 결과를 바로 Document 로 돌려줍니다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.idf: Dict[str, float] = {}
+        self.avg_length = 0.0
+
+    def build(self, ids, texts, metadatas=None):
+        self.ids = list(ids)
+        self.texts = list(texts)
+        self.metadatas = list(metadatas or [{} for _ in self.ids])
+
+        postings = defaultdict(list)
+        self.doc_lengths = []
+        for doc_index, text in enumerate(self.texts):
+            counts = Counter(tokenize_ko(text))
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings[term].append((doc_index, tf))
+
+        self.postings = dict(postings)
+        total = len(self.texts)
+        self.avg_length = sum(self.doc_lengths) / total if total else 0.0
+        self.idf = {
+            term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+        return self
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        scores = defaultdict(float)
+        for term in set(tokenize_ko(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_index, tf in self.postings[term]:
+                norm = 1 - self.b + self.b * self.doc_lengths[doc_index] / (self.avg_length or 1)
+                scores[doc_index] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            (
+                Document(page_content=self.texts[i], metadata=self.metadatas[i], id=self.ids[i]),
+                score,
+            )
+            for i, score in top
+        ]
+
+    # ---------------------------------------------------------
+    # 저장 / 불러오기
+    # ---------------------------------------------------------
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)  # 검색 중인 프로세스가 반쯤 쓴 파일을 읽지 않도록
+
+    @classmethod
+    def load(cls, path) -> "BM25Index":
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+def bm25_index_path(persist_directory, collection_name) -> Path:
+    return Path(persist_directory) / "bm25" / f"{collection_name}.pkl"
+
+
+def build_bm25_from_collection(collection, page_size: int = 5000) -> BM25Index:
+    """chromadb 컬렉션 전체(ID/본문/메타데이터)로 인덱스 생성"""
+    ids, texts, metadatas = [], [], []
+    offset = 0
+    while True:
+        rows = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        ids.extend(rows["ids"])
+        texts.extend(rows["documents"])
+        metadatas.extend(rows["metadatas"] or [{} for _ in rows["ids"]])
+        if len(rows["ids"]) < page_size:
+            break
+        offset += page_size
+    return BM25Index().build(ids, texts, metadatas)
+
+
+def load_bm25_index(persist_directory, collection_name) -> Optional[BM25Index]:
+    """적재 때 만들어 둔 인덱스 (없으면 None -> 벡터 검색만 사용)"""
+    path = bm25_index_path(persist_directory, collection_name)
+    if not path.exists():
+        print(f"ℹ️ BM25 인덱스 없음 ({collection_name}), 벡터 검색만 사용합니다.")
+        return None
+    return BM25Index.load(path)
+
+
+# ==========================================
+# 순위 결합 (Reciprocal Rank Fusion)
+# ==========================================
+def reciprocal_rank_fusion(ranked_lists: List[List[Document]], k: int = 60) -> List[Document]:
+    """여러 검색 결과 목록을 순위 기반으로 합침 (같은 본문은 하나로)"""
+    scores = defaultdict(float)
+    docs = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked):
+            key = doc.page_content
+            scores[key] += 1.0 / (k + rank + 1)
+            docs.setdefault(key, doc)
+    return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)]
@@ -0,0 +1,80 @@
+import hashlib
+from array import array
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from utils.persistent_cache import PersistentLRUCache, SingleFlight
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    어떤 LangChain Embeddings 객체든 감싸서 (모델명, 텍스트 해시) 기준으로 결과를 캐시.
+    같은 문장은 질문이든 적재(ingest)든 한 번만 API 를 호출합니다.
+    (embed_query 는 같은 문장을 여러 스레드가 동시에 요청해도 1번)
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        model_name: str,
+        db_path,
+        memory_size: int = 10_000,
+        max_entries: int = 500_000,
+    ):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.cache = PersistentLRUCache(
+            db_path, table="embeddings", memory_size=memory_size, max_entries=max_entries
+        )
+        self._in_flight = SingleFlight()
+
+    def _key(self, text: str) -> str:
+        raw = f"{self.model_name}\0{text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _encode(vector) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> List[float]:
+        values = array("f")
+        values.frombytes(blob)
+        return values.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        # 캐시에 없는 텍스트만 (중복 없이) 실제 임베딩
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            new_items = {key: self._encode(vec) for key, vec in zip(missing, vectors)}
+            self.cache.set_many(new_items)
+            found.update(new_items)
+
+        return [self._decode(found[key]) for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        blob = self.cache.get(key)
+        if blob is None:
+
+            def compute():
+                cached = self.cache.get(key)  # 앞서 진행 중이던 임베딩이 방금 끝났으면 그 결과
+                if cached is not None:
+                    return cached
+                encoded = self._encode(self.underlying.embed_query(text))
+                self.cache.set(key, encoded)
+                return encoded
+
+            blob = self._in_flight.run(key, compute)
+        return self._decode(blob)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+
+class PersistentLRUCache:
+    """
+    SQLite 에 저장되는 key -> bytes 캐시 (앞단에 메모리 LRU).
+
+    - memory_size : 메모리에 들고 있는 최대 항목 수
+    - max_entries : 디스크에 남겨두는 최대 항목 수 (넘으면 가장 오래 안 쓴 것부터 삭제)
+    여러 스레드에서 같이 써도 되도록 내부 락으로 보호합니다.
+    """
+
+    def __init__(self, db_path, table="cache", memory_size=10_000, max_entries=200_000):
+        self.db_path = Path(db_path)
+        self.table = table
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table}(last_access)"
+        )
+        self._conn.commit()
+
+    # ---------------------------------------------------------
+    # 메모리 LRU
+    # ---------------------------------------------------------
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ---------------------------------------------------------
+    # 조회 / 저장
+    # ---------------------------------------------------------
+    def get_many(self, keys):
+        """있는 키만 {key: value} 로 반환"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            now = time.time()
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = value
+                    self._remember(key, value)
+                if rows:
+                    self._conn.executemany(
+                        f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows],
+                    )
+            self._conn.commit()
+
+            hits_on_disk = len(found) - (len(keys) - len(missing))
+            self.disk_hits += hits_on_disk
+            self.misses += len(missing) - hits_on_disk
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, last_access) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()],
+            )
+            self._conn.commit()
+            for key, value in items.items():
+                self._remember(key, value)
+
+            self._writes_since_trim += len(items)
+            if self._writes_since_trim >= 1000:
+                self._trim()
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def _trim(self):
+        """디스크 항목이 max_entries 를 넘으면 가장 오래 안 쓴 것부터 삭제"""
+        self._writes_since_trim = 0
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+            "disk_size": len(self),
+        }
+
+
+class SingleFlight:
+    """
+    같은 키의 계산이 이미 진행 중이면 새로 시작하지 않고 그 결과를 함께 기다림.
+    (두 멘토가 동시에 같은 질문을 재작성/임베딩할 때 캐시가 둘 다 비어 있어도 API 는 1번)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def run(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
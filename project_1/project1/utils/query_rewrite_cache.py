@@ -0,0 +1,61 @@
+import hashlib
+import re
+import unicodedata
+from typing import Callable
+
+from utils.persistent_cache import PersistentLRUCache, SingleFlight
+
+
+def normalize_query(text: str) -> str:
+    """공백/대소문자/전각문자/끝 문장부호 차이를 무시하기 위한 정규화"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip(" .?!~…")
+
+
+class QueryRewriteCache:
+    """
+    질의 변환(검색용 재작성, 번역 등) 결과를 디스크에 저장하는 메모이제이션 계층.
+
+    - temperature=0 변환은 입력이 같으면 결과도 같으므로 LLM 을 다시 부르지 않음
+    - 원문 그대로의 키와 정규화한 키를 함께 저장해서 띄어쓰기/물음표만 다른 질문도 적중
+    - kind 에 변환 종류(+프롬프트 버전)를 넣어서 서로 섞이지 않게 함
+    - 같은 질문의 변환이 이미 진행 중이면 (여러 멘토 동시 검색) LLM 을 또 부르지 않고 그 결과를 기다림
+    """
+
+    def __init__(self, db_path, memory_size: int = 5_000, max_entries: int = 100_000):
+        self.cache = PersistentLRUCache(
+            db_path, table="query_rewrites", memory_size=memory_size, max_entries=max_entries
+        )
+        self._in_flight = SingleFlight()
+
+    @staticmethod
+    def _key(kind: str, text: str) -> str:
+        return hashlib.sha256(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def rewrite(self, kind: str, text: str, transform: Callable[[str], str]) -> str:
+        exact_key = self._key(kind, text)
+        normalized_key = self._key(kind, normalize_query(text))
+
+        found = self.cache.get_many([exact_key, normalized_key])
+        value = found.get(exact_key) or found.get(normalized_key)
+        if value is not None:
+            if exact_key not in found:
+                self.cache.set(exact_key, value)
+            return value.decode("utf-8")
+
+        def compute():
+            # 앞서 진행 중이던 변환이 방금 끝났으면 그 결과
+            value = self.cache.get(normalized_key)
+            if value is not None:
+                return value.decode("utf-8")
+            result = transform(text)
+            if result:
+                encoded = result.encode("utf-8")
+                self.cache.set_many({exact_key: encoded, normalized_key: encoded})
+            return result
+
+        return self._in_flight.run(normalized_key, compute)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
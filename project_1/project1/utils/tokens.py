@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """모델에 맞는 토크나이저 (인코딩 파일을 못 받는 오프라인 환경이면 None)"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠️ tiktoken 인코딩 로드 실패, 근사치로 계산합니다: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    텍스트의 토큰 수.
+    토크나이저를 쓸 수 없으면 UTF-8 바이트 수 / 3 으로 넉넉하게 근사
+    (한글 1글자 ≈ 3바이트 ≈ 1토큰, 영어는 실제보다 조금 크게 잡힘)
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return max(1, len(text.encode("utf-8")) // 3)
+    return len(encoding.encode(text))
+
+
+def count_tokens_many(texts: List[str], model: str = "gpt-4o") -> List[int]:
+    """여러 텍스트의 토큰 수를 한 번에 (tiktoken 배치 인코딩은 내부에서 병렬 처리)"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return [max(1, len(text.encode("utf-8")) // 3) if text else 0 for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]